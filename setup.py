@@ -1,4 +1,4 @@
-from setuptools import setup
+from setuptools import setup, find_packages
 
 setup(
     name    = 'Ypip',
@@ -8,5 +8,6 @@ setup(
     description = 'Recursive pip for VCS-based packages',
     long_description = open('README.rst').read(),
 
+    packages = find_packages(exclude=['ypip.test', 'ypip.test.*']),
     scripts = ['ypip/ypip']
 )
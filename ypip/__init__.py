@@ -0,0 +1,37 @@
+# MIT License
+# Copyright (c) 2016 Genome Research Limited
+import sys
+from importlib import import_module
+from types import ModuleType
+from typing import Dict, List
+
+
+class _LazyModule(ModuleType):
+    # Module-level __getattr__ (PEP 562) needs Python 3.7, whereas
+    # swapping the module's class works from Python 3.5
+    def __getattr__(self, name:str):
+        modules = self.__dict__['_lazy_modules']
+
+        if name not in modules:
+            raise AttributeError('module {} has no attribute {}'.format(self.__name__, name))
+
+        value = getattr(import_module('{}.{}'.format(self.__name__, modules[name])), name)
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self.__dict__['_lazy_modules']))
+
+
+def lazy_exports(package:str, exports:Dict[str, List[str]]):
+    '''
+    Export names from a package's submodules, each of which is imported
+    on first access, rather than when the package is
+
+    @param  package  Package name (i.e., its __name__)
+    @param  exports  Exported names, by the submodule that defines them
+    '''
+    module = sys.modules[package]
+    module._lazy_modules = {name: submodule for submodule, names in exports.items() for name in names}
+    module.__all__ = sorted(module._lazy_modules)
+    module.__class__ = _LazyModule
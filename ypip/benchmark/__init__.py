@@ -0,0 +1,4 @@
+# MIT License
+# Copyright (c) 2016 Genome Research Limited
+from ypip.benchmark.suite import BENCHMARKS, benchmark, compare, run
+from ypip.benchmark.universe import UniverseSource
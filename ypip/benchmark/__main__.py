@@ -0,0 +1,42 @@
+# MIT License
+# Copyright (c) 2016 Genome Research Limited
+import argparse
+import json
+import sys
+
+from ypip.benchmark import BENCHMARKS, compare, run
+
+
+def main(args):
+    parser = argparse.ArgumentParser(prog='python -m ypip.benchmark', description='Run the ypip benchmark suite')
+    parser.add_argument('names', nargs='*', metavar='BENCHMARK', choices=[[]] + list(BENCHMARKS),
+                        help='Benchmarks to run (default: all of them)')
+    parser.add_argument('-s', '--scale', type=float, default=1, help='Problem size factor (default: 1)')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='Timed runs of each benchmark (default: 3)')
+    parser.add_argument('-o', '--output', metavar='FILE', help='Write the results, as JSON, to FILE')
+    parser.add_argument('-c', '--compare', metavar='FILE', help='Compare against earlier results in FILE')
+    options = parser.parse_args(args)
+
+    results = run(options.names, options.scale, options.repeat, lambda name: print('Running {}...'.format(name), file=sys.stderr))
+
+    if options.output:
+        with open(options.output, 'w') as handle:
+            json.dump(results, handle, indent=2)
+            handle.write('\n')
+
+    ratios = {}
+    if options.compare:
+        with open(options.compare) as handle:
+            ratios = compare(json.load(handle), results)
+
+    for name, result in results['results'].items():
+        line = '{:<20} {:>10.4f}s {:>14,.0f} ops/s {:>10,.0f} KiB'.format(name, result['seconds'], result['ops_per_second'] or 0, result['peak_kib'])
+
+        if name in ratios:
+            line += ' {:>+8.1%}'.format(ratios[name] - 1)
+
+        print(line)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,236 @@
+# MIT License
+# Copyright (c) 2016 Genome Research Limited
+import gc
+import platform
+import subprocess
+import time
+import tracemalloc
+from collections import OrderedDict
+from random import Random
+from typing import Callable, Dict, Iterable, List, Optional
+
+from ypip.benchmark import universe as universes
+from ypip.benchmark.universe import UniverseSource, UniverseT
+from ypip.graph import DirectedGraph
+from ypip.resolver import Crawler, Resolver
+from ypip.sources.pep440.specifier import Specifier
+from ypip.sources.pep440.version import Version, _parse
+
+# Benchmarks, in the order they are run: each is a function of the scale
+# that returns a function to time, which returns the number of operations
+# it performed and any extra figures worth recording
+_BenchmarkT = Callable[[float], Callable[[], Dict[str, float]]]
+BENCHMARKS = OrderedDict()
+
+
+def benchmark(function:_BenchmarkT) -> _BenchmarkT:
+    ''' Register a benchmark under its function's name '''
+    BENCHMARKS[function.__name__] = function
+    return function
+
+
+def _version_strings(count:int, seed:int = 0) -> List[str]:
+    random = Random(seed)
+    suffixes = ['', '', '', 'a1', 'b2', 'rc1', '.post1', '.dev3', '+local.1']
+
+    return ['{}.{}.{}{}'.format(random.randint(0, 20), random.randint(0, 50), index, random.choice(suffixes))
+            for index in range(count)]
+
+
+@benchmark
+def version_parse(scale:float):
+    strings = _version_strings(int(20000 * scale))
+
+    def run():
+        # Otherwise this would only measure the parse cache
+        _parse.cache_clear()
+
+        for string in strings:
+            Version(string)
+
+        return {'ops': len(strings)}
+
+    return run
+
+
+@benchmark
+def version_sort(scale:float):
+    versions = [Version(string) for string in _version_strings(int(20000 * scale))]
+
+    def run():
+        sorted(versions)
+        return {'ops': len(versions)}
+
+    return run
+
+
+@benchmark
+def specifier_filter(scale:float):
+    versions = [Version(string) for string in _version_strings(int(20000 * scale))]
+    specifiers = [Specifier(spec) for spec in ['>=1.2, <15', '~=3.4', '!=2.*, >0.5', '==7.*', '<10.3.100']]
+
+    def run():
+        for specifier in specifiers:
+            specifier.filter(versions)
+
+        return {'ops': len(versions) * len(specifiers)}
+
+    return run
+
+
+def _random_graph(nodes:int, degree:int, seed:int = 0) -> DirectedGraph:
+    # Links only go from lower to higher indices, so the graph is acyclic
+    random = Random(seed)
+    graph = DirectedGraph()
+
+    for index in range(nodes):
+        graph.add_node(str(index), index)
+
+    for index in range(nodes - 1):
+        targets = {str(random.randint(index + 1, nodes - 1)) for _ in range(degree)}
+        graph.get_node(str(index)).link_to(*targets)
+
+    return graph
+
+
+@benchmark
+def graph_build(scale:float):
+    nodes = int(20000 * scale)
+
+    def run():
+        _random_graph(nodes, 4)
+        return {'ops': nodes}
+
+    return run
+
+
+@benchmark
+def graph_traverse(scale:float):
+    graph = _random_graph(int(20000 * scale), 4)
+    frozen = graph.freeze()
+
+    def run():
+        for subject in (graph, frozen):
+            subject.topological_sort()
+            subject.reachable('0')
+            subject.find_cycle()
+
+        return {'ops': 2 * len(graph)}
+
+    return run
+
+
+def _resolution(universe:UniverseT) -> Callable[[], Dict[str, float]]:
+    def run():
+        source = UniverseSource(universe)
+        resolver = Resolver(Crawler([source], max_workers=1))
+        graph = resolver.resolve('root')
+
+        return {
+            'ops': len(graph),
+            'backtracks': resolver.backtracks,
+            'fetches': source.fetches
+        }
+
+    return run
+
+
+@benchmark
+def resolve_wide(scale:float):
+    return _resolution(universes.wide(int(1000 * scale), versions=5))
+
+@benchmark
+def resolve_deep(scale:float):
+    return _resolution(universes.deep(int(500 * scale), versions=5))
+
+@benchmark
+def resolve_diamond(scale:float):
+    return _resolution(universes.diamond(int(10 * scale) or 1, 20, versions=5))
+
+@benchmark
+def resolve_conflicting(scale:float):
+    return _resolution(universes.conflicting(int(40 * scale) or 1, versions=10))
+
+
+def _measure(run:Callable[[], Dict[str, float]], repeat:int) -> Dict[str, float]:
+    timings = []
+
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        figures = run()
+        timings.append(time.perf_counter() - start)
+
+    # Memory is measured separately, as tracing slows everything down
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    best = min(timings)
+    result = OrderedDict([
+        ('seconds', best),
+        ('mean_seconds', sum(timings) / len(timings)),
+        ('ops_per_second', figures['ops'] / best if best else None),
+        ('peak_kib', peak / 1024)
+    ])
+    result.update(figures)
+
+    return result
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(names:Optional[Iterable[str]] = None, scale:float = 1, repeat:int = 3, progress:Optional[Callable[[str], None]] = None) -> Dict[str, object]:
+    '''
+    Run benchmarks
+
+    @param   names     Benchmarks to run (defaults to all of them)
+    @param   scale     Factor by which to scale the size of each problem
+    @param   repeat    Number of timed runs of each benchmark
+    @param   progress  Called with each benchmark's name before it's run
+    @return  JSON serialisable results, with the environment they were
+             measured in
+    '''
+    results = OrderedDict()
+
+    for name in names or BENCHMARKS:
+        if progress:
+            progress(name)
+
+        results[name] = _measure(BENCHMARKS[name](scale), max(1, repeat))
+
+    return OrderedDict([
+        ('commit', _commit()),
+        ('python', platform.python_version()),
+        ('platform', platform.platform()),
+        ('timestamp', time.time()),
+        ('scale', scale),
+        ('repeat', repeat),
+        ('results', results)
+    ])
+
+
+def compare(baseline:Dict[str, object], current:Dict[str, object]) -> Dict[str, float]:
+    '''
+    @param   baseline  Results of an earlier run
+    @param   current   Results of this run
+    @return  Ratio of the current time to the baseline time of each
+             benchmark that both ran (less than 1 is an improvement)
+    '''
+    ratios = OrderedDict()
+
+    for name, result in current['results'].items():
+        previous = baseline['results'].get(name)
+        if previous and previous['seconds']:
+            ratios[name] = result['seconds'] / previous['seconds']
+
+    return ratios
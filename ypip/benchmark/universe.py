@@ -0,0 +1,161 @@
+# MIT License
+# Copyright (c) 2016 Genome Research Limited
+import re
+from functools import lru_cache
+from random import Random
+from typing import Dict, List, Optional
+
+from ypip.sources._source import Source
+from ypip.sources.pep440.specifier import Specifier
+from ypip.sources.pep440.version import Version
+
+# universe[name][version] is the list of requirements of that release
+UniverseT = Dict[str, Dict[str, List[str]]]
+
+# Specifiers are memoised, as they are by the real sources
+_specifier = lru_cache(maxsize=1024)(Specifier)
+
+
+def _name(index:int) -> str:
+    return 'p{}'.format(index)
+
+def _versions(count:int) -> List[str]:
+    return ['{}.0'.format(version) for version in range(1, count + 1)]
+
+
+def wide(packages:int, versions:int = 3) -> UniverseT:
+    '''
+    @param   packages  Number of packages, all of which the root requires
+    @param   versions  Number of versions of each
+    @return  One level of independent packages
+    '''
+    universe = {_name(index): {version: [] for version in _versions(versions)} for index in range(packages)}
+    universe['root'] = {'1.0': sorted(universe)}
+    return universe
+
+
+def deep(depth:int, versions:int = 3) -> UniverseT:
+    '''
+    @param   depth     Length of the dependency chain
+    @param   versions  Number of versions of each package
+    @return  A chain, in which every version of each package requires
+             the next package, at the same version or later
+    '''
+    universe = {}
+
+    for index in range(depth):
+        universe[_name(index)] = {
+            version: ['{}>={}'.format(_name(index + 1), version)] if index + 1 < depth else []
+            for version in _versions(versions)
+        }
+
+    universe['root'] = {'1.0': [_name(0)]}
+    return universe
+
+
+def diamond(layers:int, width:int, versions:int = 3, seed:int = 0) -> UniverseT:
+    '''
+    @param   layers    Number of layers
+    @param   width     Number of packages in each layer
+    @param   versions  Number of versions of each package
+    @param   seed      Random seed
+    @return  Layers of packages, each of which requires a random half of
+             the next layer, so most packages are shared by many others
+    '''
+    random = Random(seed)
+    universe = {}
+
+    for layer in range(layers):
+        below = [_name((layer + 1) * width + index) for index in range(width)] if layer + 1 < layers else []
+
+        for index in range(width):
+            universe[_name(layer * width + index)] = {
+                version: sorted(random.sample(below, len(below) // 2))
+                for version in _versions(versions)
+            }
+
+    universe['root'] = {'1.0': [_name(index) for index in range(width)]}
+    return universe
+
+
+def conflicting(packages:int, versions:int = 10, seed:int = 0) -> UniverseT:
+    '''
+    @param   packages  Number of packages
+    @param   versions  Number of versions of each package
+    @param   seed      Random seed
+    @return  Packages whose newer versions make incompatible demands of
+             each other, so that resolution must backtrack; the oldest
+             versions have no requirements, so it is always solvable
+    '''
+    random = Random(seed)
+    universe = {}
+
+    for index in range(packages):
+        releases = {}
+
+        for number, version in enumerate(_versions(versions), 1):
+            requires = []
+
+            if number > 1:
+                for other in random.sample(range(packages), min(3, packages)):
+                    if other == index:
+                        continue
+
+                    bound = random.randint(1, versions)
+                    operator = random.choice(['<', '>='])
+                    requires.append('{}{}{}.0'.format(_name(other), operator, bound))
+
+            releases[version] = requires
+
+        universe[_name(index)] = releases
+
+    universe['root'] = {'1.0': [_name(index) for index in range(packages)]}
+    return universe
+
+
+class UniverseSource(Source):
+    '''
+    In-memory package index of a synthetic universe
+    '''
+    _pattern = re.compile(r'^(\w+)\s*(.*)$')
+
+    def __init__(self, universe:UniverseT):
+        '''
+        @param  universe  Universe of packages
+        '''
+        self.universe = universe
+        self.fetches = 0
+
+    def _split(self, pkg:str):
+        name, spec = self._pattern.match(pkg).groups()
+        return name, _specifier(spec) if spec else None
+
+    def is_package_from_source(self, pkg:str) -> bool:
+        return self._pattern.match(pkg) is not None
+
+    def get_requirements(self, pkg:str) -> List[str]:
+        self.fetches += 1
+
+        name, spec = self._split(pkg)
+        versions = list(map(Version, self.universe[name]))
+        version = spec.best(versions) if spec else max(versions)
+
+        return [pkg] + self.universe[name][str(version)]
+
+    def identify(self, pkg:str) -> Optional[str]:
+        return self._split(pkg)[0]
+
+    def version_conflict(self, pkg1:str, pkg2:str) -> Optional[bool]:
+        _, spec1 = self._split(pkg1)
+        _, spec2 = self._split(pkg2)
+        return spec1 is not None and spec2 is not None and spec1.isdisjoint(spec2)
+
+    def candidates(self, pkgs:List[str]) -> List[str]:
+        name = self.identify(pkgs[0])
+        versions = list(map(Version, self.universe.get(name, {})))
+
+        for _, spec in map(self._split, pkgs):
+            if spec is not None:
+                versions = spec.filter(versions)
+
+        return ['{}=={}'.format(name, version) for version in sorted(versions, reverse=True)]
@@ -1,3 +1,4 @@
 # MIT License
 # Copyright (c) 2016 Genome Research Limited
-from ypip.graph.graph import Node, DirectedGraph, NodeExists, NodeDoesNotExist
+from ypip.graph.graph import Node, DirectedGraph, NodeExists, NodeDoesNotExist, CycleDetected
+from ypip.graph.compact import FrozenNode, FrozenGraph, GraphFrozen
@@ -0,0 +1,203 @@
+# MIT License
+# Copyright (c) 2016 Genome Research Limited
+from array import array
+from collections import deque
+from typing import FrozenSet, Iterator, List, Optional, Set, Tuple
+
+from ypip.graph.graph import Node, DirectedGraph, NodeDoesNotExist, CycleDetected
+
+
+class GraphFrozen(Exception):
+    pass
+
+
+def _csr(adjacency:List[List[int]]) -> Tuple[array, array]:
+    ''' Compressed sparse row form of an adjacency list '''
+    offsets = array('i', [0])
+    targets = array('i')
+
+    for linked in adjacency:
+        targets.extend(sorted(linked))
+        offsets.append(len(targets))
+
+    return offsets, targets
+
+
+class FrozenNode(Node):
+    '''
+    View of a node in a frozen graph; nothing is stored per node, other
+    than in the graph's arrays
+    '''
+    def __init__(self, graph:'FrozenGraph', index:int):
+        self._graph = graph
+        self._index = index
+
+    @property
+    def identity(self) -> str:
+        return self._graph._identities[self._index]
+
+    @property
+    def payload(self) -> Optional[object]:
+        return self._graph._payloads[self._index]
+
+    @payload.setter
+    def payload(self, payload:Optional[object]):
+        self._graph._payloads[self._index] = payload
+
+
+class FrozenGraph(object):
+    '''
+    Immutable, compact form of a DirectedGraph: identities are interned to
+    integer IDs and adjacency, both forward and reverse, is stored in
+    array-backed compressed sparse row (CSR) form. Nodes are views, with
+    the same API as those of a DirectedGraph, except that they can't be
+    linked
+    '''
+    def __init__(self, graph:DirectedGraph):
+        '''
+        @param  graph  Graph to freeze
+        '''
+        self._identities = [node.identity for node in graph]
+        self._payloads = [node.payload for node in graph]
+        self._ids = {identity: index for index, identity in enumerate(self._identities)}
+
+        forward = [[self._ids[linked] for linked in graph.links(identity)] for identity in self._identities]
+        reverse = [[] for _ in self._identities]
+
+        for index, linked in enumerate(forward):
+            for target in linked:
+                reverse[target].append(index)
+
+        self._offsets, self._targets = _csr(forward)
+        self._reverse_offsets, self._reverse_targets = _csr(reverse)
+
+    def __contains__(self, identity:str) -> bool:
+        return identity in self._ids
+
+    def __len__(self) -> int:
+        return len(self._identities)
+
+    def __iter__(self) -> Iterator[FrozenNode]:
+        for index in range(len(self._identities)):
+            yield FrozenNode(self, index)
+
+    def _id(self, identity:str) -> int:
+        try:
+            return self._ids[identity]
+        except KeyError:
+            raise NodeDoesNotExist('No such node <{}>'.format(identity))
+
+    def _links(self, index:int) -> array:
+        return self._targets[self._offsets[index]:self._offsets[index + 1]]
+
+    def _dependents(self, index:int) -> array:
+        return self._reverse_targets[self._reverse_offsets[index]:self._reverse_offsets[index + 1]]
+
+    def add_node(self, identity:str, payload:Optional[object] = None) -> Node:
+        raise GraphFrozen('Cannot add <{}> to a frozen graph'.format(identity))
+
+    def _link(self, source:str, target:str):
+        raise GraphFrozen('Cannot link <{}> to <{}> in a frozen graph'.format(source, target))
+
+    def get_node(self, identity:str) -> FrozenNode:
+        return FrozenNode(self, self._id(identity))
+
+    def links(self, identity:str) -> FrozenSet[str]:
+        '''
+        @param   identity  Node identity
+        @return  Identities of the nodes it links to
+        '''
+        return frozenset(self._identities[target] for target in self._links(self._id(identity)))
+
+    def dependents(self, identity:str) -> FrozenSet[str]:
+        '''
+        @param   identity  Node identity
+        @return  Identities of the nodes that link to it
+        '''
+        return frozenset(self._identities[source] for source in self._dependents(self._id(identity)))
+
+    def reachable(self, *identities:str, reverse:bool = False) -> Set[str]:
+        '''
+        Transitive closure from the given nodes
+
+        @param   identities  Node identities to start from
+        @param   reverse     Follow links backwards
+        @return  Identities of every node reachable from the given nodes,
+                 including the nodes themselves
+        '''
+        offsets, targets = (self._reverse_offsets, self._reverse_targets) if reverse else (self._offsets, self._targets)
+        seen = bytearray(len(self._identities))
+        pending = [self._id(identity) for identity in identities]
+
+        for index in pending:
+            seen[index] = 1
+
+        while pending:
+            index = pending.pop()
+
+            for target in targets[offsets[index]:offsets[index + 1]]:
+                if not seen[target]:
+                    seen[target] = 1
+                    pending.append(target)
+
+        return {self._identities[index] for index, flag in enumerate(seen) if flag}
+
+    def find_cycle(self) -> Optional[List[str]]:
+        '''
+        @return  The path of a cycle, starting and ending with the same
+                 identity, if the graph has any
+        '''
+        # 0 = unvisited, 1 = on the current path, 2 = finished
+        state = bytearray(len(self._identities))
+
+        for start in range(len(self._identities)):
+            if state[start]:
+                continue
+
+            path = [start]
+            stack = [iter(self._links(start))]
+            state[start] = 1
+
+            while stack:
+                for target in stack[-1]:
+                    if state[target] == 1:
+                        cycle = path[path.index(target):] + [target]
+                        return [self._identities[index] for index in cycle]
+
+                    if not state[target]:
+                        state[target] = 1
+                        path.append(target)
+                        stack.append(iter(self._links(target)))
+                        break
+
+                else:
+                    state[path.pop()] = 2
+                    stack.pop()
+
+        return None
+
+    def topological_sort(self) -> List[str]:
+        '''
+        @return  Identities ordered such that every node precedes the nodes
+                 that it links to
+        @note    Will raise CycleDetected if the graph is cyclic
+        '''
+        offsets, targets = self._offsets, self._targets
+        roffsets = self._reverse_offsets
+        in_degree = array('i', (roffsets[index + 1] - roffsets[index] for index in range(len(self._identities))))
+        ready = deque(index for index, degree in enumerate(in_degree) if not degree)
+        output = []
+
+        while ready:
+            index = ready.popleft()
+            output.append(index)
+
+            for target in targets[offsets[index]:offsets[index + 1]]:
+                in_degree[target] -= 1
+                if not in_degree[target]:
+                    ready.append(target)
+
+        if len(output) < len(self._identities):
+            raise CycleDetected(self.find_cycle())
+
+        return [self._identities[index] for index in output]
@@ -1,6 +1,9 @@
 # MIT License
 # Copyright (c) 2016 Genome Research Limited
-from typing import List, Optional, Union
+from collections import deque
+from typing import FrozenSet, Iterator, List, Optional, Set, Union
+
+from ypip import instrumentation
 
 
 class NodeExists(Exception):
@@ -9,6 +12,11 @@ class NodeExists(Exception):
 class NodeDoesNotExist(Exception):
     pass
 
+class CycleDetected(Exception):
+    def __init__(self, cycle:List[str]):
+        super().__init__('Cycle detected: {}'.format(' -> '.join('<{}>'.format(identity) for identity in cycle)))
+        self.cycle = cycle
+
 
 class Node(object):
     def __init__(self, graph:'DirectedGraph', identity:str, payload:Optional[object] = None):
@@ -16,6 +24,14 @@ class Node(object):
         self.identity = identity
         self.payload = payload
 
+    @property
+    def links(self) -> FrozenSet[str]:
+        return self._graph.links(self.identity)
+
+    @property
+    def dependents(self) -> FrozenSet[str]:
+        return self._graph.dependents(self.identity)
+
     def link_to(self, *nodes:Union[str, 'Node']):
         for node in nodes:
             try:
@@ -24,26 +40,51 @@ class Node(object):
                 identity = node
 
             if identity in self._graph:
-                _, links = self._graph[self.identity]
-                links.add(identity)
+                self._graph._link(self.identity, identity)
 
             else:
                 raise NodeDoesNotExist('Cannot link <{}> to <{}> as it doesn\'t exist'.format(self.identity, identity))
 
 
 class DirectedGraph(object):
+    '''
+    Directed graph of nodes, keyed by identity, with both forward and
+    reverse adjacency maintained as links are made. All traversals are
+    iterative, so are not bound by the recursion limit
+    '''
     def __init__(self):
         self._graph = {}
+        self._reverse = {}
+
+    def __contains__(self, identity:str) -> bool:
+        return identity in self._graph
+
+    def __len__(self) -> int:
+        return len(self._graph)
+
+    def __iter__(self) -> Iterator[Node]:
+        for node, _ in self._graph.values():
+            yield node
 
     def add_node(self, identity:str, payload:Optional[object] = None) -> Node:
         if identity not in self._graph:
-            new_node = Node(self._graph, identity, payload)
+            new_node = Node(self, identity, payload)
             self._graph[identity] = new_node, set()
+            self._reverse[identity] = set()
             return new_node
 
         else:
             raise NodeExists('<{}> already exists'.format(identity))
 
+    def freeze(self) -> 'FrozenGraph':
+        '''
+        @return  Immutable, compact copy of the graph
+        '''
+        from ypip.graph.compact import FrozenGraph
+
+        with instrumentation.span('graph.freeze', nodes=len(self)):
+            return FrozenGraph(self)
+
     def get_node(self, identity:str) -> Node:
         if identity in self._graph:
             node, _ = self._graph[identity]
@@ -51,3 +92,114 @@ class DirectedGraph(object):
 
         else:
             raise NodeDoesNotExist('No such node <{}>'.format(identity))
+
+    def _link(self, source:str, target:str):
+        _, links = self._graph[source]
+        links.add(target)
+        self._reverse[target].add(source)
+
+    def links(self, identity:str) -> FrozenSet[str]:
+        '''
+        @param   identity  Node identity
+        @return  Identities of the nodes it links to
+        '''
+        if identity not in self._graph:
+            raise NodeDoesNotExist('No such node <{}>'.format(identity))
+
+        _, links = self._graph[identity]
+        return frozenset(links)
+
+    def dependents(self, identity:str) -> FrozenSet[str]:
+        '''
+        @param   identity  Node identity
+        @return  Identities of the nodes that link to it
+        '''
+        if identity not in self._reverse:
+            raise NodeDoesNotExist('No such node <{}>'.format(identity))
+
+        return frozenset(self._reverse[identity])
+
+    def reachable(self, *identities:str, reverse:bool = False) -> Set[str]:
+        '''
+        Transitive closure from the given nodes
+
+        @param   identities  Node identities to start from
+        @param   reverse     Follow links backwards (i.e., find everything
+                             that transitively depends on the nodes)
+        @return  Identities of every node reachable from the given nodes,
+                 including the nodes themselves
+        '''
+        for identity in identities:
+            if identity not in self._graph:
+                raise NodeDoesNotExist('No such node <{}>'.format(identity))
+
+        seen = set(identities)
+        pending = list(identities)
+
+        while pending:
+            identity = pending.pop()
+            adjacent = self._reverse[identity] if reverse else self._graph[identity][1]
+
+            for linked in adjacent:
+                if linked not in seen:
+                    seen.add(linked)
+                    pending.append(linked)
+
+        return seen
+
+    def find_cycle(self) -> Optional[List[str]]:
+        '''
+        @return  The path of a cycle, starting and ending with the same
+                 identity, if the graph has any
+        '''
+        # Nodes on the current path are True; finished nodes are False
+        state = {}
+
+        for start in self._graph:
+            if start in state:
+                continue
+
+            path = [start]
+            stack = [iter(self._graph[start][1])]
+            state[start] = True
+
+            while stack:
+                for linked in stack[-1]:
+                    if state.get(linked):
+                        return path[path.index(linked):] + [linked]
+
+                    if linked not in state:
+                        state[linked] = True
+                        path.append(linked)
+                        stack.append(iter(self._graph[linked][1]))
+                        break
+
+                else:
+                    state[path.pop()] = False
+                    stack.pop()
+
+        return None
+
+    def topological_sort(self) -> List[str]:
+        '''
+        @return  Identities ordered such that every node precedes the nodes
+                 that it links to
+        @note    Will raise CycleDetected if the graph is cyclic
+        '''
+        in_degree = {identity: len(dependents) for identity, dependents in self._reverse.items()}
+        ready = deque(identity for identity, degree in in_degree.items() if degree == 0)
+        output = []
+
+        while ready:
+            identity = ready.popleft()
+            output.append(identity)
+
+            for linked in self._graph[identity][1]:
+                in_degree[linked] -= 1
+                if in_degree[linked] == 0:
+                    ready.append(linked)
+
+        if len(output) < len(self._graph):
+            raise CycleDetected(self.find_cycle())
+
+        return output
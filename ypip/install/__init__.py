@@ -0,0 +1,13 @@
+# MIT License
+# Copyright (c) 2016 Genome Research Limited
+from ypip import lazy_exports
+
+# Exported names, by the submodule that defines them; these are imported
+# on first access, so that planning an install doesn't import what builds
+# wheels, nor scans what is installed, until needed
+lazy_exports(__name__, {
+    'plan':        ['InstallPlan'],
+    'wheel_cache': ['WheelCache'],
+    'wheelhouse':  ['Wheelhouse'],
+    'installed':   ['InstalledIndex']
+})
@@ -0,0 +1,200 @@
+# MIT License
+# Copyright (c) 2016 Genome Research Limited
+import json
+import os
+import os.path
+import sys
+from tempfile import mkstemp
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from ypip import instrumentation
+from ypip.graph import DirectedGraph
+from ypip.sources.cache import default_cache_dir
+from ypip.sources.pep440.exceptions import ParseError
+from ypip.sources.pep440.specifier import Specifier
+from ypip.sources.pep440.version import Version
+from ypip.sources.pep508.requirement import normalise, parse
+
+_FORMAT_VERSION = 1
+_SUFFIX = '.dist-info'
+
+
+def _metadata(path:str) -> Tuple[Optional[str], Optional[str]]:
+    # Name and version from a dist-info directory's METADATA headers
+    name = version = None
+
+    try:
+        with open(os.path.join(path, 'METADATA'), encoding='utf-8', errors='replace') as handle:
+            for line in handle:
+                if not line.strip():
+                    break
+
+                key, _, value = line.partition(':')
+                if key == 'Name':
+                    name = value.strip()
+                elif key == 'Version':
+                    version = value.strip()
+
+    except OSError:
+        pass
+
+    return name, version
+
+
+def _scan(path:str) -> Dict[str, str]:
+    '''
+    @param   path  Directory of installed distributions (e.g., site-packages)
+    @return  Normalised names of the distributions mapped to their versions
+    '''
+    distributions = {}
+    instrumentation.count('installed.dirs_scanned')
+
+    for entry in os.scandir(path):
+        if not entry.name.endswith(_SUFFIX) or not entry.is_dir():
+            continue
+
+        # Names in dist-info directory names are escaped, so don't contain
+        # hyphens, and neither do normalised versions; other directories
+        # have their metadata read
+        name, _, version = entry.name[:-len(_SUFFIX)].rpartition('-')
+
+        if not name:
+            name, version = _metadata(entry.path)
+
+        if name and version:
+            distributions.setdefault(normalise(name), version)
+
+    return distributions
+
+
+class InstalledIndex(object):
+    '''
+    Index of the distributions installed on the path, by normalised name,
+    built in one pass over their dist-info directories; each directory's
+    distributions are cached by its modification time, which changes
+    whenever a distribution is installed or removed there
+    '''
+    def __init__(self, paths:Optional[Iterable[str]] = None, cache_path:Optional[str] = None):
+        '''
+        @param  paths       Directories of installed distributions, in order
+                            of precedence (defaults to this Python's path)
+        @param  cache_path  Index cache (defaults to ~/.cache/ypip/installed.json)
+        '''
+        self.paths = [path for path in (sys.path if paths is None else paths) if path and os.path.isdir(path)]
+        self.cache_path = cache_path or os.path.join(default_cache_dir(), 'installed.json')
+        self._versions = None
+
+    def _load_cache(self) -> Dict[str, Dict[str, object]]:
+        try:
+            with open(self.cache_path) as handle:
+                stored = json.load(handle)
+
+            if stored['version'] == _FORMAT_VERSION:
+                return stored['paths']
+
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        return {}
+
+    def _dump_cache(self, paths:Dict[str, Dict[str, object]]):
+        directory = os.path.dirname(os.path.abspath(self.cache_path))
+
+        try:
+            os.makedirs(directory, exist_ok=True)
+            handle, temp_path = mkstemp(dir=directory, suffix='.tmp')
+
+        except OSError:
+            return
+
+        try:
+            with os.fdopen(handle, 'w') as temp:
+                json.dump({'version': _FORMAT_VERSION, 'paths': paths}, temp, sort_keys=True)
+
+            os.replace(temp_path, self.cache_path)
+
+        except OSError:
+            os.unlink(temp_path)
+
+    def _index(self) -> Dict[str, Optional[Version]]:
+        if self._versions is not None:
+            return self._versions
+
+        with instrumentation.span('installed.index', paths=len(self.paths)):
+            cached = self._load_cache()
+            updated = False
+            versions = {}
+
+            for path in map(os.path.abspath, self.paths):
+                try:
+                    mtime = os.stat(path).st_mtime_ns
+                except OSError:
+                    continue
+
+                entry = cached.get(path)
+
+                if entry and entry.get('mtime') == mtime:
+                    instrumentation.count('installed.cache_hits')
+
+                else:
+                    try:
+                        entry = cached[path] = {'mtime': mtime, 'distributions': _scan(path)}
+                        updated = True
+                    except OSError:
+                        continue
+
+                # Distributions earlier on the path shadow those later on
+                for name, version in entry['distributions'].items():
+                    if name not in versions:
+                        try:
+                            versions[name] = Version(version)
+                        except ParseError:
+                            versions[name] = None
+
+            if updated:
+                self._dump_cache(cached)
+
+        self._versions = versions
+        return versions
+
+    def __contains__(self, name:str) -> bool:
+        return normalise(name) in self._index()
+
+    def __len__(self) -> int:
+        return len(self._index())
+
+    def get(self, name:str) -> Optional[Version]:
+        '''
+        @param   name  Project name
+        @return  Installed version, if any (or if it isn't PEP440)
+        '''
+        return self._index().get(normalise(name))
+
+    def is_satisfied(self, pkg:str) -> bool:
+        '''
+        @param   pkg  Package string
+        @return  Whether an installed distribution satisfies the package
+        @note    Packages with extras, URLs, or that aren't PEP508 (e.g.,
+                 VCS packages) are never considered satisfied
+        '''
+        requirement = parse(pkg)
+
+        if requirement is None or requirement.url or requirement.extras or requirement.key not in self:
+            return False
+
+        if not requirement.specifier:
+            return True
+
+        version = self.get(requirement.key)
+
+        try:
+            return version is not None and Specifier(requirement.specifier)(version)
+        except ParseError:
+            return False
+
+    def satisfied(self, graph:DirectedGraph) -> Set[str]:
+        '''
+        @param   graph  Resolved dependency graph
+        @return  Identities whose package strings are already satisfied
+        '''
+        return {node.identity for node in graph if self.is_satisfied(node.payload)}
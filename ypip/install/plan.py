@@ -0,0 +1,130 @@
+# MIT License
+# Copyright (c) 2016 Genome Research Limited
+import re
+import subprocess
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from ypip import instrumentation
+from ypip.graph import DirectedGraph
+
+_egg = re.compile(r'#egg=([^&\s]+)')
+
+
+def _pip_args(pkg:str) -> List[str]:
+    # Editable VCS packages are given as a separate option to pip
+    if pkg.startswith('-e'):
+        return ['-e', pkg[2:].strip()]
+
+    return [pkg]
+
+
+def _local_args(pkg:str, names:Dict[str, str]) -> List[str]:
+    # VCS packages are installed from a wheelhouse by name: that of their
+    # built wheel, if known, otherwise their egg's
+    egg = _egg.search(pkg)
+    return [(names.get(pkg) or egg.group(1)) if egg else pkg]
+
+
+class InstallPlan(object):
+    '''
+    Flattened install plan, in layers of packages where each layer only
+    depends on the layers before it
+    '''
+    def __init__(self, layers:List[List[str]]):
+        '''
+        @param  layers  Package strings, grouped by layer
+        '''
+        self.layers = layers
+
+    @classmethod
+    def from_graph(cls, graph:DirectedGraph, exclude:Iterable[str] = ()) -> 'InstallPlan':
+        '''
+        Layer a resolved dependency graph, dependencies first
+
+        @param   graph    Resolved dependency graph
+        @param   exclude  Identities not to install (e.g., requirements
+                          files), whose dependencies are still planned
+        @return  Install plan
+        @note    Dependency cycles, and anything that depends on them,
+                 are planned together in a final layer
+        '''
+        exclude = set(exclude)
+        layers = []
+
+        # Peel off layers from the leaves up, through reverse links
+        remaining = {node.identity: len(node.links - {node.identity}) for node in graph}
+        ready = sorted(identity for identity, links in remaining.items() if not links)
+
+        while ready:
+            for identity in ready:
+                del remaining[identity]
+
+            layer = [graph.get_node(identity).payload for identity in ready if identity not in exclude]
+            if layer:
+                layers.append(layer)
+
+            next_ready = []
+            for identity in ready:
+                for dependent in graph.dependents(identity):
+                    if dependent in remaining:
+                        remaining[dependent] -= 1
+                        if not remaining[dependent]:
+                            next_ready.append(dependent)
+
+            ready = sorted(next_ready)
+
+        # Cycle: pip will have to sort it out itself
+        layer = [graph.get_node(identity).payload for identity in sorted(remaining) if identity not in exclude]
+        if layer:
+            layers.append(layer)
+
+        return cls(layers)
+
+    def __iter__(self) -> Iterator[str]:
+        for layer in self.layers:
+            yield from layer
+
+    def __len__(self) -> int:
+        return sum(map(len, self.layers))
+
+    def commands(self, upgrade:bool = False, layered:bool = False, wheelhouse:Optional[str] = None, names:Optional[Dict[str, str]] = None) -> List[List[str]]:
+        '''
+        @param   upgrade     Upgrade packages to the newest available version
+        @param   layered     Invoke pip once per layer, rather than once
+        @param   wheelhouse  Install only from this directory of wheels
+        @param   names       Distribution names of the wheelhouse's VCS
+                             wheels, by package string (defaults to their
+                             egg names)
+        @return  pip command lines to execute, in order
+        '''
+        pip = [sys.executable, '-m', 'pip', 'install'] + (['--upgrade'] if upgrade else [])
+        pip_args = _pip_args
+
+        if wheelhouse:
+            pip += ['--no-index', '--find-links', wheelhouse]
+            pip_args = lambda pkg: _local_args(pkg, names or {})
+
+        batches = self.layers if layered else [list(self)]
+
+        return [pip + [arg for pkg in batch for arg in pip_args(pkg)] for batch in batches if batch]
+
+    def execute(self, upgrade:bool = False, layered:bool = False, wheelhouse:Optional[str] = None, names:Optional[Dict[str, str]] = None) -> int:
+        '''
+        Run pip over the plan, stopping at the first failure
+
+        @param   upgrade     Upgrade packages to the newest available version
+        @param   layered     Invoke pip once per layer, rather than once
+        @param   wheelhouse  Install only from this directory of wheels
+        @param   names       Distribution names of the wheelhouse's VCS
+                             wheels, by package string
+        @return  pip's exit code
+        '''
+        for command in self.commands(upgrade, layered, wheelhouse, names):
+            with instrumentation.span('pip'):
+                exit_code = subprocess.call(command)
+
+            if exit_code:
+                return exit_code
+
+        return 0
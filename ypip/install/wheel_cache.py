@@ -0,0 +1,149 @@
+# MIT License
+# Copyright (c) 2016 Genome Research Limited
+import hashlib
+import json
+import os
+import os.path
+import shutil
+import sys
+import sysconfig
+from tempfile import mkdtemp
+from typing import List, Optional
+
+from ypip import instrumentation
+from ypip.sources.cache import default_cache_dir
+
+# Default bound on the total size of the cached wheels, in bytes
+DEFAULT_MAX_SIZE = 2 * 1024 ** 3
+
+_KEY_FILE = 'key.json'
+
+
+def _wheels(entry:str) -> List[str]:
+    return [os.path.join(entry, name) for name in sorted(os.listdir(entry)) if name.endswith('.whl')]
+
+
+def _abi() -> str:
+    return '{}-{}'.format(sys.implementation.cache_tag, sysconfig.get_config_var('SOABI') or 'none')
+
+
+class WheelCache(object):
+    '''
+    Content-addressed cache of wheels built from VCS packages, keyed by
+    repository, commit, Python ABI and platform, which evicts the least
+    recently used wheels to stay within its size bound
+    '''
+    def __init__(self, root:Optional[str] = None, max_size:int = DEFAULT_MAX_SIZE, abi:Optional[str] = None, platform:Optional[str] = None):
+        '''
+        @param  root      Cache directory (defaults to ~/.cache/ypip/wheels)
+        @param  max_size  Maximum total size of the cached wheels, in bytes
+        @param  abi       Python ABI (defaults to this interpreter's)
+        @param  platform  Platform (defaults to this interpreter's)
+        '''
+        self.root = root or os.path.join(default_cache_dir(), 'wheels')
+        self.max_size = max_size
+        self.abi = abi or _abi()
+        self.platform = platform or sysconfig.get_platform()
+
+    def _entry(self, repo:str, commit:str) -> str:
+        key = hashlib.sha256('\0'.join([repo, commit.lower(), self.abi, self.platform]).encode()).hexdigest()
+        return os.path.join(self.root, key[:2], key)
+
+    def _entries(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+
+        return [os.path.join(self.root, shard, entry)
+                for shard in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, shard))
+                for entry in os.listdir(os.path.join(self.root, shard)) if not entry.startswith('.')]
+
+    def get(self, repo:str, commit:str) -> List[str]:
+        '''
+        @param   repo    Repository URL
+        @param   commit  Full commit SHA
+        @return  Paths of the wheels built from the commit, if cached
+        '''
+        entry = self._entry(repo, commit)
+
+        try:
+            wheels = _wheels(entry)
+            os.utime(entry)
+        except OSError:
+            wheels = []
+
+        instrumentation.count('wheel_cache.hits' if wheels else 'wheel_cache.misses')
+        return wheels
+
+    def put(self, repo:str, commit:str, wheels:List[str]) -> List[str]:
+        '''
+        Cache the wheels built from a commit, then evict the least recently
+        used entries, should the cache have outgrown its bound
+
+        @param   repo    Repository URL
+        @param   commit  Full commit SHA
+        @param   wheels  Paths of the wheels
+        @return  Paths of the cached wheels
+        @note    Nothing is cached if there are no wheels
+        '''
+        if not wheels:
+            return []
+
+        entry = self._entry(repo, commit)
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+
+        # Entries are populated aside and renamed into place, so they are
+        # never seen half-written; if another process got there first, its
+        # entry is as good as this one
+        staging = mkdtemp(prefix='.', dir=os.path.dirname(entry))
+
+        try:
+            for wheel in wheels:
+                shutil.copy2(wheel, staging)
+
+            with open(os.path.join(staging, _KEY_FILE), 'w') as handle:
+                json.dump({'repo': repo, 'commit': commit, 'abi': self.abi, 'platform': self.platform}, handle)
+
+            # Entries without wheels are never used, so are replaced
+            if os.path.isdir(entry) and not _wheels(entry):
+                shutil.rmtree(entry, ignore_errors=True)
+
+            os.rename(staging, entry)
+
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        self.evict(keep=entry)
+        return self.get(repo, commit)
+
+    def size(self) -> int:
+        '''
+        @return  Total size of the cached wheels, in bytes
+        '''
+        return sum(os.path.getsize(os.path.join(entry, name)) for entry in self._entries() for name in os.listdir(entry))
+
+    def evict(self, keep:Optional[str] = None):
+        '''
+        Remove the least recently used entries until the cache is within
+        its bound
+
+        @param  keep  Entry not to remove (e.g., the one just added)
+        '''
+        entries = []
+
+        for entry in self._entries():
+            try:
+                size = sum(os.path.getsize(os.path.join(entry, name)) for name in os.listdir(entry))
+                entries.append((os.path.getmtime(entry), entry, size))
+            except OSError:
+                continue
+
+        total = sum(size for _, _, size in entries)
+
+        for _, entry, size in sorted(entries):
+            if total <= self.max_size:
+                break
+
+            if entry != keep:
+                shutil.rmtree(entry, ignore_errors=True)
+                total -= size
+                instrumentation.count('wheel_cache.evictions')
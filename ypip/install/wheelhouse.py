@@ -0,0 +1,214 @@
+# MIT License
+# Copyright (c) 2016 Genome Research Limited
+import os
+import os.path
+import re
+import shutil
+import subprocess
+import sys
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from tempfile import TemporaryDirectory
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ypip import instrumentation
+from ypip.graph import DirectedGraph
+from ypip.install.plan import InstallPlan
+from ypip.install.wheel_cache import WheelCache
+from ypip.sources.git_mirror import GitError, ls_remote
+
+_vcs = re.compile(r'^(?:-e\s*)?git\+((?:git|https?|ssh|file)://.+)@([^@#]+?)#egg=([^&\s]+)')
+
+
+def _wheel_args(pkg:str) -> List[str]:
+    # Wheels are built from the VCS URL itself, as they can't be editable
+    if pkg.startswith('-e'):
+        return [pkg[2:].strip()]
+
+    return [pkg]
+
+
+class Wheelhouse(object):
+    '''
+    Local directory of wheels, built (or downloaded) concurrently, from
+    which a plan can then be installed without touching the network
+    '''
+    def __init__(self, path:str, pip:Optional[List[str]] = None, cache:Optional[WheelCache] = None, git:str = 'git'):
+        '''
+        @param  path   Wheelhouse directory
+        @param  pip    pip command line (defaults to this Python's pip)
+        @param  cache  Cache of wheels built from VCS commits, if any
+        @param  git    git executable, for resolving VCS refs to commits
+        '''
+        self.path = path
+        self._pip = pip or [sys.executable, '-m', 'pip']
+        self._cache = cache
+        self._git = git
+        self._built = {}
+
+    def _wheel(self, wheel_dir:str, pkg:str) -> List[str]:
+        # Requirements are resolved, so are each built in their own right
+        return self._pip + ['wheel', '--no-deps', '--wheel-dir', wheel_dir, '--find-links', self.path] + _wheel_args(pkg)
+
+    def command(self, pkg:str) -> List[str]:
+        '''
+        @param   pkg  Package string
+        @return  pip command line that puts the package's wheel, alone, in
+                 the wheelhouse
+        '''
+        return self._wheel(self.path, pkg)
+
+    def fill_command(self, pkgs:Iterable[str]) -> List[str]:
+        '''
+        @param   pkgs  Package strings, whose wheels are in the wheelhouse
+        @return  pip command line that puts the wheels of any of their
+                 requirements that weren't resolved (e.g., those of
+                 packages whose source doesn't know them) in the wheelhouse
+        @note    VCS packages that were built are given by their wheels,
+                 so they aren't built again
+        '''
+        args = [arg for pkg in pkgs for arg in self._built.get(pkg) or _wheel_args(pkg)]
+        return self._pip + ['wheel', '--wheel-dir', self.path, '--find-links', self.path] + args
+
+    def commands(self, graph:DirectedGraph, exclude:Iterable[str] = ()) -> List[List[str]]:
+        '''
+        @param   graph    Resolved dependency graph
+        @param   exclude  Identities not to build (e.g., requirements files)
+        @return  pip command lines to build the wheelhouse, dependencies
+                 first, were they run one at a time, then fill it
+        '''
+        plan = InstallPlan.from_graph(graph, exclude)
+        return [self.command(pkg) for pkg in plan] + ([self.fill_command(plan)] if plan else [])
+
+    @property
+    def names(self) -> Dict[str, str]:
+        '''
+        @return  Distribution names of the wheels built from VCS packages,
+                 by package string, which needn't match their egg names
+        '''
+        return {pkg: os.path.basename(wheels[0]).split('-', 1)[0] for pkg, wheels in self._built.items()}
+
+    def _build(self, pkg:str) -> int:
+        vcs = _vcs.match(pkg)
+
+        if not vcs:
+            with instrumentation.span('pip.wheel', pkg=pkg):
+                return subprocess.call(self.command(pkg))
+
+        url, ref, egg = vcs.groups()
+        commit = None
+
+        if self._cache:
+            try:
+                commit = ls_remote(url, ref, self._git)
+            except GitError:
+                pass
+
+        if not commit:
+            return self._build_aside(pkg, pkg)
+
+        # The commit's wheel is reused from the cache, otherwise built (from
+        # the commit, lest its ref move in the meantime) and cached
+        cached = self._cache.get(url, commit)
+        if cached:
+            return self._deliver(pkg, cached)
+
+        return self._build_aside(pkg, 'git+{}@{}#egg={}'.format(url, commit, egg), (url, commit))
+
+    def _build_aside(self, pkg:str, source:str, commit:Optional[Tuple[str, str]] = None) -> int:
+        # VCS packages are built on their own, so what they build is known
+        with TemporaryDirectory() as build_dir:
+            with instrumentation.span('pip.wheel', pkg=source):
+                exit_code = subprocess.call(self._wheel(build_dir, source))
+
+            if exit_code:
+                return exit_code
+
+            # Built without dependencies, so whatever was built is the
+            # package's own wheel, whatever its name (which needn't be the
+            # egg's); nothing at all is a failure
+            built = [os.path.join(build_dir, name) for name in os.listdir(build_dir) if name.endswith('.whl')]
+            if built and commit:
+                built = self._cache.put(*commit, built)
+
+            return self._deliver(pkg, built)
+
+    def _deliver(self, pkg:str, wheels:List[str]) -> int:
+        if not wheels:
+            return 1
+
+        os.makedirs(self.path, exist_ok=True)
+
+        for wheel in wheels:
+            shutil.copy2(wheel, self.path)
+
+        self._built[pkg] = [os.path.join(self.path, os.path.basename(wheel)) for wheel in wheels]
+        return 0
+
+    def build(self, graph:DirectedGraph, exclude:Iterable[str] = (), jobs:int = 4) -> int:
+        '''
+        Build the wheels of every package in the graph concurrently, each
+        as soon as its dependencies' wheels are built (so they needn't be
+        built again, for its sake), then fill in the wheels of whatever
+        they require that the graph doesn't know of, in one final pass
+
+        @param   graph    Resolved dependency graph
+        @param   exclude  Identities not to build (e.g., requirements
+                          files), whose dependencies are still built
+        @param   jobs     Maximum number of concurrent pip processes
+        @return  pip's first non-zero exit code, otherwise 0
+        @note    Nothing more is started after the first failure; packages
+                 in dependency cycles are all built once nothing else is
+                 left to build
+        '''
+        exclude = set(exclude)
+        waiting = {node.identity: len(node.links - {node.identity}) for node in graph}
+        ready = deque(sorted(identity for identity, links in waiting.items() if not links))
+        running = {}
+        exit_code = 0
+
+        def finished(identity:str):
+            for dependent in sorted(graph.dependents(identity)):
+                if dependent in waiting:
+                    waiting[dependent] -= 1
+                    if not waiting[dependent]:
+                        ready.append(dependent)
+
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            while True:
+                while ready and not exit_code:
+                    identity = ready.popleft()
+                    waiting.pop(identity, None)
+
+                    if identity in exclude:
+                        finished(identity)
+                    else:
+                        running[executor.submit(self._build, graph.get_node(identity).payload)] = identity
+
+                # Cycle: pip will have to sort it out itself
+                if not running and waiting and not exit_code:
+                    ready.extend(sorted(waiting))
+                    waiting.clear()
+                    continue
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    identity = running.pop(future)
+                    result = future.result()
+
+                    if result:
+                        exit_code = exit_code or result
+                    else:
+                        finished(identity)
+
+        pkgs = [node.payload for node in graph if node.identity not in exclude]
+
+        if exit_code or not pkgs:
+            return exit_code
+
+        with instrumentation.span('pip.wheel', pkg='fill'):
+            return subprocess.call(self.fill_command(pkgs))
@@ -0,0 +1,176 @@
+# MIT License
+# Copyright (c) 2016 Genome Research Limited
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, TextIO
+
+# Instrumentation is off unless enabled, in which case spans and counters
+# are recorded until it is disabled again; when off, spans and counters
+# cost a function call and a test of this flag
+_enabled = False
+_lock = threading.Lock()
+_origin = 0.0
+_spans = []
+_counters = {}
+
+
+class _NullSpan(object):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span(object):
+    __slots__ = ('name', 'args', 'start')
+
+    def __init__(self, name:str, args:Dict[str, object]):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        end = time.perf_counter()
+
+        with _lock:
+            _spans.append((self.name, self.start, end - self.start, threading.get_ident(), self.args))
+
+        return False
+
+
+def enable():
+    ''' Start recording, discarding anything previously recorded '''
+    global _enabled, _origin
+
+    with _lock:
+        del _spans[:]
+        _counters.clear()
+        _origin = time.perf_counter()
+        _enabled = True
+
+def disable():
+    ''' Stop recording, keeping what has been recorded '''
+    global _enabled
+    _enabled = False
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def span(name:str, **args:object):
+    '''
+    Time a block of code, as a context manager
+
+    @param   name  Name of the phase being timed (e.g., "http.request")
+    @param   args  Details to record with the span (e.g., its URL)
+    @return  Context manager
+    '''
+    if not _enabled:
+        return _NULL_SPAN
+
+    return _Span(name, args)
+
+def count(name:str, value:float = 1):
+    '''
+    Increment a counter
+
+    @param  name   Name of the counter (e.g., "http.bytes")
+    @param  value  Increment
+    '''
+    if not _enabled:
+        return
+
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def summary() -> Dict[str, Dict]:
+    '''
+    @return  Spans, aggregated by name (with their count, total and
+             longest durations, in seconds), and counters
+    '''
+    spans = {}
+
+    with _lock:
+        for name, _, duration, _, _ in _spans:
+            calls, total, longest = spans.get(name, (0, 0.0, 0.0))
+            spans[name] = calls + 1, total + duration, max(longest, duration)
+
+        counters = dict(_counters)
+
+    return OrderedDict([
+        ('spans', OrderedDict(
+            (name, OrderedDict([('count', calls), ('seconds', total), ('max_seconds', longest)]))
+            for name, (calls, total, longest) in sorted(spans.items(), key=lambda item: -item[1][1])
+        )),
+        ('counters', OrderedDict(sorted(counters.items())))
+    ])
+
+
+def report(stream:TextIO = sys.stderr):
+    '''
+    Print a human readable summary
+
+    @param  stream  Output stream
+    '''
+    aggregated = summary()
+
+    print('{:<32} {:>8} {:>12} {:>12}'.format('Span', 'Count', 'Total (s)', 'Max (s)'), file=stream)
+    for name, figures in aggregated['spans'].items():
+        print('{:<32} {:>8} {:>12.4f} {:>12.4f}'.format(name, figures['count'], figures['seconds'], figures['max_seconds']), file=stream)
+
+    if aggregated['counters']:
+        print('', file=stream)
+        print('{:<32} {:>8}'.format('Counter', 'Value'), file=stream)
+        for name, value in aggregated['counters'].items():
+            print('{:<32} {:>8}'.format(name, value), file=stream)
+
+
+def write_json(path:str):
+    '''
+    Write the summary as JSON
+
+    @param  path  Output file
+    '''
+    with open(path, 'w') as handle:
+        json.dump(summary(), handle, indent=2)
+        handle.write('\n')
+
+
+def write_trace(path:str):
+    '''
+    Write every span, and the final counters, in the Chrome trace event
+    format (for chrome://tracing or Perfetto)
+
+    @param  path  Output file
+    '''
+    pid = os.getpid()
+
+    with _lock:
+        events = [{
+            'name': name,
+            'cat': name.split('.')[0],
+            'ph': 'X',
+            'ts': (start - _origin) * 1e6,
+            'dur': duration * 1e6,
+            'pid': pid,
+            'tid': tid,
+            'args': {key: str(value) for key, value in args.items()}
+        } for name, start, duration, tid, args in _spans]
+
+        end = max([event['ts'] + event['dur'] for event in events] or [0])
+        events += [{'name': name, 'ph': 'C', 'ts': end, 'pid': pid, 'args': {'value': value}}
+                   for name, value in sorted(_counters.items())]
+
+    with open(path, 'w') as handle:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, handle)
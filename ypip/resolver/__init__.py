@@ -0,0 +1,6 @@
+# MIT License
+# Copyright (c) 2016 Genome Research Limited
+from ypip.resolver.crawler import Crawler, NoSuitableSource
+from ypip.resolver.resolver import Resolver, ResolutionImpossible, ResolutionTooDeep
+from ypip.resolver.batch import BatchResolution, resolve_batch
+from ypip.resolver.incremental import changed_identities, resolve_incremental
@@ -0,0 +1,52 @@
+# MIT License
+# Copyright (c) 2016 Genome Research Limited
+from collections import OrderedDict, namedtuple
+from typing import Iterable
+
+import ypip.sources as sources
+from ypip.graph import DirectedGraph
+from ypip.resolver.crawler import Crawler, NoSuitableSource
+from ypip.resolver.resolver import Resolver, ResolutionImpossible, ResolutionTooDeep
+
+# graph is the shared dependency graph of every root; resolutions and
+# failures map each root to its resolved graph or why it couldn't be
+BatchResolution = namedtuple('BatchResolution', ['graph', 'resolutions', 'failures'])
+
+
+def resolve_batch(roots:Iterable[str], crawler:Crawler, max_rounds:int = 100000) -> BatchResolution:
+    '''
+    Resolve many roots with one crawler, so requirements that they share
+    are fetched once, into one graph of all of their dependencies
+
+    @param   roots       Root package strings (e.g., requirements files)
+    @param   crawler     Crawler, shared by every root's resolution
+    @param   max_rounds  Maximum number of pinning attempts per root
+    @return  Shared dependency graph, keyed by identity, with the first
+             package string chosen for each identity as its payload; and
+             each root's resolution or failure
+    @note    Roots are resolved separately, as their constraints differ,
+             so conflicts between different roots, or packages that
+             can't be fetched for one root, are not errors
+    '''
+    graph = DirectedGraph()
+    resolutions = OrderedDict()
+    failures = OrderedDict()
+
+    for root in OrderedDict.fromkeys(roots):
+        try:
+            resolutions[root] = resolution = Resolver(crawler, max_rounds).resolve(root)
+        except (ResolutionImpossible, ResolutionTooDeep, NoSuitableSource, sources.CacheMiss,
+                sources.GitError, sources.HTTPError, OSError) as exception:
+            # Network failures (and offline cache misses) only fail the
+            # root that needed what couldn't be fetched
+            failures[root] = exception
+            continue
+
+        for node in resolution:
+            if node.identity not in graph:
+                graph.add_node(node.identity, node.payload)
+
+        for node in resolution:
+            graph.get_node(node.identity).link_to(*node.links)
+
+    return BatchResolution(graph, resolutions, failures)
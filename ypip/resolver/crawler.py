@@ -0,0 +1,187 @@
+# MIT License
+# Copyright (c) 2016 Genome Research Limited
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List
+
+from ypip import instrumentation
+from ypip.graph import DirectedGraph, NodeDoesNotExist
+from ypip.sources._source import Source
+from ypip.sources.dispatch import Dispatcher
+
+
+class NoSuitableSource(Exception):
+    pass
+
+
+class Crawler(object):
+    '''
+    Breadth-first dependency crawler: each level of the dependency tree
+    has its requirements fetched concurrently, through a bounded pool
+    '''
+    def __init__(self, sources:List[Source], max_workers:int = 8):
+        '''
+        @param  sources      Package sources, ordered by priority
+        @param  max_workers  Maximum number of concurrent fetches
+        '''
+        self._dispatch = Dispatcher(sources)
+        self._max_workers = max(1, max_workers)
+        self._fetched = {}
+        self._identities = {}
+
+    def source_for(self, pkg:str) -> Source:
+        '''
+        @param   pkg  Package string
+        @return  The highest priority source that recognises the package
+        '''
+        source = self._dispatch(pkg)
+
+        if source is None:
+            raise NoSuitableSource('No source recognises <{}>'.format(pkg))
+
+        return source
+
+    def identify(self, pkg:str) -> str:
+        '''
+        @param   pkg  Package string
+        @return  The package's identity, per its source, otherwise the
+                 package string itself (e.g., for requirements files)
+        '''
+        try:
+            return self._identities[pkg]
+
+        except KeyError:
+            identity = self._identities[pkg] = self.source_for(pkg).identify(pkg) or pkg
+            return identity
+
+    def constraints(self, pkg:str) -> List[str]:
+        '''
+        @param   pkg  Package string
+        @return  Package strings that constrain, but don't require, others
+        '''
+        return self.source_for(pkg).constraints(pkg)
+
+    def prefetch(self, pkgs:Iterable[str]):
+        '''
+        Let each source warm its caches for its packages, in bulk
+
+        @param  pkgs  Package strings
+        '''
+        by_source = {}
+
+        for pkg in pkgs:
+            by_source.setdefault(self.source_for(pkg), []).append(pkg)
+
+        for source, source_pkgs in by_source.items():
+            source.prefetch(source_pkgs)
+
+    def _get_requirements(self, pkg:str) -> List[str]:
+        # Markers are only parsed once something is fetched
+        from ypip.sources.pep508.exceptions import ParseError
+        from ypip.sources.pep508.markers import applies, split_marker
+
+        requirements = []
+
+        for line in self.source_for(pkg).get_requirements(pkg):
+            line = line.strip()
+            if not line or line.startswith('#') or line == pkg:
+                continue
+
+            # Requirements whose markers don't hold here are pruned, before
+            # they are ever fetched; pip is left to judge invalid markers
+            requirement, marker = split_marker(line)
+
+            try:
+                if marker and not applies(marker):
+                    continue
+
+                line = requirement
+            except ParseError:
+                pass
+
+            requirements.append(line)
+
+        return requirements
+
+    def seed(self, requirements:Dict[str, List[str]]):
+        '''
+        Memoise requirements that are already known (e.g., from a
+        lockfile), so they needn't be fetched again
+
+        @param  requirements  Dictionary of package strings to their
+                              requirements, per fetch
+        @note   Packages that have already been fetched are unaffected
+        '''
+        for pkg, pkg_requirements in requirements.items():
+            self._fetched.setdefault(pkg, list(pkg_requirements))
+
+    def fetch(self, pkgs:Iterable[str]) -> Dict[str, List[str]]:
+        '''
+        Fetch the requirements of all the given packages concurrently;
+        results are memoised for the lifetime of the crawler
+
+        @param   pkgs  Package strings
+        @return  Dictionary of package strings to their requirements
+                 (excluding the package itself)
+        '''
+        pkgs = list(pkgs)
+        pending = [pkg for pkg in set(pkgs) if pkg not in self._fetched]
+        instrumentation.count('crawler.fetches', len(pending))
+
+        if len(pending) == 1 or self._max_workers == 1:
+            for pkg in pending:
+                with instrumentation.span('crawler.fetch', pkgs=1):
+                    self._fetched[pkg] = self._get_requirements(pkg)
+
+        elif pending:
+            with instrumentation.span('crawler.fetch', pkgs=len(pending)):
+                with ThreadPoolExecutor(max_workers=min(self._max_workers, len(pending))) as executor:
+                    futures = {pkg: executor.submit(self._get_requirements, pkg) for pkg in pending}
+
+            for pkg, future in futures.items():
+                self._fetched[pkg] = future.result()
+
+        return {pkg: self._fetched[pkg] for pkg in pkgs}
+
+    def crawl(self, *roots:str) -> DirectedGraph:
+        '''
+        Walk the dependency tree from the given roots, level by level
+
+        @param   roots  Root package strings (e.g., requirements.txt)
+        @return  Dependency graph, keyed by identity, with the first
+                 package string encountered for each identity as its
+                 payload
+        @note    Conflicting package strings are not reconciled here
+        '''
+        graph = DirectedGraph()
+        frontier = []
+
+        for pkg in roots:
+            identity = self.identify(pkg)
+
+            try:
+                graph.get_node(identity)
+            except NodeDoesNotExist:
+                graph.add_node(identity, pkg)
+                frontier.append((identity, pkg))
+
+        while frontier:
+            requirements = self.fetch(pkg for _, pkg in frontier)
+            next_frontier = []
+
+            for identity, pkg in frontier:
+                node = graph.get_node(identity)
+
+                for dependency in requirements[pkg]:
+                    dependency_identity = self.identify(dependency)
+
+                    try:
+                        graph.get_node(dependency_identity)
+                    except NodeDoesNotExist:
+                        graph.add_node(dependency_identity, dependency)
+                        next_frontier.append((dependency_identity, dependency))
+
+                    node.link_to(dependency_identity)
+
+            frontier = next_frontier
+
+        return graph
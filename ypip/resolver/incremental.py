@@ -0,0 +1,78 @@
+# MIT License
+# Copyright (c) 2016 Genome Research Limited
+from typing import Iterable, Set
+
+from ypip.graph import DirectedGraph
+from ypip.resolver.crawler import Crawler
+from ypip.resolver.lockfile import Lockfile, LockfileError
+from ypip.resolver.resolver import Resolver
+
+
+def _changed(old:Iterable[str], new:Iterable[str], crawler:Crawler) -> Set[str]:
+    # Identities of the package strings that were added or removed
+    return {crawler.identify(pkg) for pkg in set(old) ^ set(new)}
+
+
+def changed_identities(lock:Lockfile, crawler:Crawler) -> Set[str]:
+    '''
+    @param   lock     Lockfile of a previous resolution
+    @param   crawler  Crawler, from which the roots' current requirements
+                      and constraints are read
+    @return  Identities whose requirements or constraints, per the roots,
+             differ from those that were locked
+    @note    Will raise LockfileError if the lockfile doesn't record the
+             roots' requirements
+    '''
+    changed = set()
+    current = crawler.fetch(lock.roots)
+
+    for root in lock.roots:
+        entry = lock.packages.get(crawler.identify(root))
+
+        if entry is None or 'requires' not in entry:
+            raise LockfileError('Lockfile does not record the requirements of {}'.format(root))
+
+        changed |= _changed(entry['requires'], current[root], crawler)
+        changed |= _changed(entry.get('constraints', []), crawler.constraints(root), crawler)
+
+    return changed
+
+
+def resolve_incremental(lock:Lockfile, crawler:Crawler, max_rounds:int = 100000) -> DirectedGraph:
+    '''
+    Re-resolve a lockfile's roots, preferring the locked package string
+    of every identity that isn't reachable from the roots' changed
+    requirements, without fetching anything for them again (unless they
+    have to be backtracked)
+
+    @param   lock        Lockfile of a previous resolution
+    @param   crawler     Crawler, which is seeded with the requirements of
+                         the packages that are kept
+    @param   max_rounds  Maximum number of pinning attempts
+    @return  Dependency graph, keyed by identity, with the chosen package
+             string for each identity as its payload
+    @note    Will raise LockfileError if the lockfile can't be used
+             incrementally, or ResolutionImpossible or ResolutionTooDeep
+             per the Resolver
+    '''
+    changed = changed_identities(lock, crawler)
+    locked = lock.graph()
+
+    # Everything downstream of a change is decided afresh
+    affected = locked.reachable(*(identity for identity in changed if identity in locked))
+
+    kept = {}
+    requires = {}
+
+    for identity, entry in lock.packages.items():
+        if identity not in affected and 'requires' in entry:
+            kept[identity] = entry['requirement']
+            requires[entry['requirement']] = entry['requires']
+
+    # The roots' own requirements are current, so must not be seeded
+    for root in lock.roots:
+        requires.pop(root, None)
+
+    crawler.seed(requires)
+
+    return Resolver(crawler, max_rounds).resolve(*lock.roots, pins=kept)
@@ -0,0 +1,179 @@
+# MIT License
+# Copyright (c) 2016 Genome Research Limited
+import hashlib
+import json
+import os
+import os.path
+import re
+from tempfile import mkstemp
+from typing import Dict, Iterable, List
+
+from ypip.graph import DirectedGraph, FrozenGraph
+from ypip.resolver.crawler import Crawler
+from ypip.sources.requirements_txt import RequirementsFileError, files
+
+
+_vcs = re.compile(r'^(-e\s*)?git\+.+?#egg=(.+)$')
+
+
+class LockfileError(Exception):
+    pass
+
+
+def digest(paths:Iterable[str]) -> str:
+    '''
+    @param   paths  Input files (e.g., requirements.txt)
+    @return  Digest of the files' names and contents
+    '''
+    sha256 = hashlib.sha256()
+
+    for path in paths:
+        with open(path, 'rb') as handle:
+            content = handle.read()
+
+        sha256.update('{}\0{}\0'.format(path, len(content)).encode())
+        sha256.update(content)
+
+    return 'sha256:{}'.format(sha256.hexdigest())
+
+
+def _inputs(roots:Iterable[str]) -> List[str]:
+    # Root requirements files, along with every file they include
+    return [path for root in roots if os.path.isfile(root) for path in files(root)]
+
+
+class Lockfile(object):
+    '''
+    Record of a resolution: the chosen package string for every identity,
+    with its requirements, its dependencies and any source-specific
+    details, along with a digest of the inputs from which it was resolved
+    and the constraints that applied to it
+    '''
+    FORMAT_VERSION = 2
+
+    def __init__(self, roots:List[str], digest:str, packages:Dict[str, Dict[str, object]]):
+        '''
+        @param  roots     Root package strings (e.g., requirements.txt)
+        @param  digest    Digest of the root files and their includes
+        @param  packages  Identities mapped to their lock entries
+        '''
+        self.roots = roots
+        self.digest = digest
+        self.packages = packages
+
+    @classmethod
+    def from_graph(cls, graph:DirectedGraph, roots:List[str], crawler:Crawler) -> 'Lockfile':
+        '''
+        @param   graph    Resolved dependency graph
+        @param   roots    Root package strings it was resolved from
+        @param   crawler  Crawler used for the resolution
+        @return  Lockfile of the resolution
+        '''
+        packages = {}
+
+        requires = crawler.fetch(node.payload for node in graph)
+
+        for node in graph:
+            entry = crawler.source_for(node.payload).lock_metadata(node.payload)
+            entry.update({
+                'requirement': node.payload,
+                'requires': requires[node.payload],
+                'dependencies': sorted(node.links)
+            })
+
+            if node.payload in roots:
+                entry['constraints'] = crawler.constraints(node.payload)
+
+            packages[node.identity] = entry
+
+        return cls(list(roots), digest(_inputs(roots)), packages)
+
+    @classmethod
+    def load(cls, path:str) -> 'Lockfile':
+        '''
+        @param   path  Lockfile path
+        @return  Lockfile
+        @note    Will raise LockfileError if the file can't be understood
+        '''
+        try:
+            with open(path) as handle:
+                stored = json.load(handle)
+
+            if stored['version'] != cls.FORMAT_VERSION:
+                raise LockfileError('{} has unsupported version {}'.format(path, stored['version']))
+
+            return cls(stored['roots'], stored['digest'], stored['packages'])
+
+        except (ValueError, KeyError, TypeError) as exception:
+            raise LockfileError('Could not read {}: {}'.format(path, exception))
+
+    def dump(self, path:str):
+        '''
+        Write the lockfile, atomically and deterministically
+
+        @param  path  Lockfile path
+        '''
+        directory = os.path.dirname(os.path.abspath(path))
+        handle, temp_path = mkstemp(dir=directory, suffix='.tmp')
+
+        try:
+            with os.fdopen(handle, 'w') as temp:
+                json.dump({
+                    'version': self.FORMAT_VERSION,
+                    'roots': self.roots,
+                    'digest': self.digest,
+                    'packages': self.packages
+                }, temp, indent=2, sort_keys=True)
+                temp.write('\n')
+
+            os.replace(temp_path, path)
+
+        except:
+            os.unlink(temp_path)
+            raise
+
+    def is_current(self) -> bool:
+        '''
+        @return  Whether the root files, and the files they include, are
+                 unchanged since locking
+        '''
+        try:
+            return digest(_inputs(self.roots)) == self.digest
+        except (OSError, RequirementsFileError):
+            return False
+
+    def pinned(self, identity:str) -> str:
+        '''
+        @param   identity  Locked identity
+        @return  Its package string, with VCS refs pinned to the commit
+                 that was locked, so moving branches and tags are ignored
+        '''
+        entry = self.packages[identity]
+        requirement = entry['requirement']
+        vcs = _vcs.match(requirement)
+
+        if vcs and entry.get('commit') and entry.get('url'):
+            editable, egg = vcs.groups()
+            return '{}git+{}@{}#egg={}'.format(editable or '', entry['url'], entry['commit'], egg)
+
+        return requirement
+
+    def graph(self) -> FrozenGraph:
+        '''
+        @return  The locked dependency graph, with pinned package strings
+        @note    Will raise LockfileError if the lockfile is inconsistent
+        '''
+        graph = DirectedGraph()
+
+        for identity in sorted(self.packages):
+            graph.add_node(identity, self.pinned(identity))
+
+        for identity in sorted(self.packages):
+            dependencies = self.packages[identity]['dependencies']
+
+            if not all(dependency in graph for dependency in dependencies):
+                raise LockfileError('<{}> depends on packages that are not locked'.format(identity))
+
+            graph.get_node(identity).link_to(*dependencies)
+
+        return graph.freeze()
@@ -0,0 +1,466 @@
+# MIT License
+# Copyright (c) 2016 Genome Research Limited
+import heapq
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from ypip import instrumentation
+from ypip.graph import DirectedGraph, NodeDoesNotExist
+from ypip.resolver.crawler import Crawler
+
+
+class ResolutionImpossible(Exception):
+    pass
+
+class ResolutionTooDeep(Exception):
+    pass
+
+
+# Criteria are the requirements on each identity, with the identity of
+# the package that demands them (None for the roots); pins are the
+# package strings chosen for each identity
+_CriteriaT = Dict[str, Tuple[Tuple[Optional[str], str], ...]]
+_PinsT = Dict[str, str]
+
+# Undo log entries: the mapping, key and value that key had beforehand
+_UndoT = List[Tuple[Dict, str, object]]
+_MISSING = object()
+
+
+class _Decision(object):
+    '''
+    Backtracking point: an identity to pin, with the candidates that are
+    yet to be tried, the pins that have been found to rule out those that
+    have been tried, and the changes made by pinning the current candidate
+    (so they can be undone, rather than the whole state being copied)
+    '''
+    def __init__(self, identity:str, candidates:Iterator[str]):
+        self.identity = identity
+        self.candidates = candidates
+        self.candidate = None
+        self.undo = []
+        self.reasons = set()
+        self.conflict = None
+
+
+class Resolver(object):
+    '''
+    Backtracking resolver that picks one package string per identity,
+    such that every requirement on that identity is satisfied
+
+    Conflicts are learnt as "nogoods": sets of (identity, candidate) pins
+    that cannot coexist. These are used to prune candidates before they
+    are explored again and to backjump directly to the most recent
+    decision implicated in a conflict, rather than unwinding one decision
+    at a time
+    '''
+    def __init__(self, crawler:Crawler, max_rounds:int = 100000):
+        '''
+        @param  crawler     Crawler, used to identify packages and to
+                            (pre)fetch their requirements
+        @param  max_rounds  Maximum number of pinning attempts
+        '''
+        self._crawler = crawler
+        self._max_rounds = max_rounds
+
+        self._order = {}
+        self._candidates_cache = {}
+
+        self._pins = {}
+        self._criteria = {}
+        self._constraints = {}
+        self._preferred = {}
+        self._nogoods = {}
+        self._invalidations = set()
+        self._worklist = []
+        self._fresh = []
+
+        self.backtracks = 0
+
+    def _identify(self, pkg:str) -> str:
+        identity = self._crawler.identify(pkg)
+
+        # Identities are decided in the order they are first seen
+        if identity not in self._order:
+            self._order[identity] = len(self._order)
+
+        return identity
+
+    def _requirements(self, identity:str) -> Tuple[Tuple[Optional[str], str], ...]:
+        # Constraints only apply to identities that are otherwise required
+        return self._criteria[identity] + self._constraints.get(identity, ())
+
+    def _dependencies(self, candidate:str) -> List[str]:
+        return self._crawler.fetch([candidate])[candidate]
+
+    def _candidates(self, requirements:Tuple[Tuple[Optional[str], str], ...]) -> List[str]:
+        pkgs = tuple(sorted({pkg for _, pkg in requirements}))
+
+        if pkgs not in self._candidates_cache:
+            source = self._crawler.source_for(pkgs[0])
+            self._candidates_cache[pkgs] = source.candidates(list(pkgs))
+
+        return self._candidates_cache[pkgs]
+
+    def _is_satisfied(self, pin:Optional[str], requirements:Tuple[Tuple[Optional[str], str], ...]) -> bool:
+        if pin is None:
+            return False
+
+        source = self._crawler.source_for(pin)
+        return all(source.is_satisfied_by(pkg, pin) for _, pkg in requirements)
+
+    def _preference(self, identity:str) -> Optional[str]:
+        # Preferred pins are only tried where they satisfy the requirements
+        preferred = self._preferred.get(identity)
+
+        if preferred is not None and self._is_satisfied(preferred, self._requirements(identity)):
+            return preferred
+
+        return None
+
+    def _preferring(self, preferred:str, requirements:Tuple[Tuple[Optional[str], str], ...]) -> Iterator[str]:
+        # The alternatives are only enumerated should the preference fail
+        yield preferred
+
+        for candidate in self._candidates(requirements):
+            if candidate != preferred:
+                yield candidate
+
+    def _push(self, identity:str):
+        heapq.heappush(self._worklist, (self._order[identity], identity))
+
+    def _next(self) -> Optional[str]:
+        '''
+        @return  The earliest seen identity that is required, but not
+                 pinned, if any
+        @note    The worklist may hold identities that have since been
+                 pinned, or are no longer required, which are skipped
+        '''
+        while self._worklist:
+            _, identity = self._worklist[0]
+
+            if identity in self._criteria and identity not in self._pins:
+                return identity
+
+            heapq.heappop(self._worklist)
+
+        return None
+
+    def _prefetch(self):
+        # Fetch the requirements of the preferred candidate of every newly
+        # required identity at once, rather than one at a time
+        fresh = [identity for identity in self._fresh if identity in self._criteria and identity not in self._pins]
+        self._fresh = []
+
+        preferred = []
+        unpreferred = []
+
+        for identity in fresh:
+            pin = self._preference(identity)
+
+            if pin is None:
+                unpreferred.append(identity)
+            else:
+                preferred.append(pin)
+
+        self._crawler.prefetch(pkg for identity in unpreferred for _, pkg in self._criteria[identity])
+
+        for identity in unpreferred:
+            candidates = self._candidates(self._requirements(identity))
+            if candidates:
+                preferred.append(candidates[0])
+
+        self._crawler.fetch(preferred)
+
+    def _assign(self, undo:_UndoT, mapping:Dict, key:str, value:object):
+        undo.append((mapping, key, mapping.get(key, _MISSING)))
+        mapping[key] = value
+
+    def _remove(self, undo:_UndoT, mapping:Dict, key:str):
+        undo.append((mapping, key, mapping.pop(key)))
+
+    def _undo(self, decision:_Decision):
+        for mapping, key, value in reversed(decision.undo):
+            if value is _MISSING:
+                del mapping[key]
+            else:
+                mapping[key] = value
+
+            # Identities may need deciding again
+            self._push(key)
+
+        decision.undo = []
+        decision.candidate = None
+
+    def _learn(self, nogood:Set[Tuple[str, str]]):
+        nogood = frozenset(nogood)
+
+        for pin in nogood:
+            self._nogoods.setdefault(pin, set()).add(nogood)
+
+    def _excluded(self, identity:str, candidate:str) -> Optional[Set[Tuple[str, str]]]:
+        '''
+        @return  The other pins of a learnt nogood that would be completed
+                 by pinning the candidate, if any
+        '''
+        for nogood in self._nogoods.get((identity, candidate), ()):
+            if all(self._pins.get(other) == pin for other, pin in nogood if other != identity):
+                return set(nogood) - {(identity, candidate)}
+
+        return None
+
+    def _conflict(self, decision:_Decision, candidate:str, dependencies:List[Tuple[str, str]]) -> Optional[Set[Tuple[str, str]]]:
+        '''
+        @return  The pins that rule out the candidate, as its requirements
+                 can't be reconciled with those already made, if any
+        '''
+        for dependency_identity, dependency in dependencies:
+            if dependency_identity == decision.identity:
+                continue
+
+            source = self._crawler.source_for(dependency)
+
+            for parent, pkg in self._criteria.get(dependency_identity, ()):
+                if source.version_conflict(pkg, dependency):
+                    conflict = {(decision.identity, candidate)}
+                    if parent is not None:
+                        conflict.add((parent, self._pins[parent]))
+
+                    decision.conflict = dependency_identity, (pkg, dependency)
+                    return conflict
+
+        return None
+
+    def _retract(self, identity:str, undo:_UndoT):
+        '''
+        Remove an identity's pin and the requirements that its candidate
+        contributed, cascading to pins that are no longer required
+        '''
+        pending = [identity]
+
+        while pending:
+            parent = pending.pop()
+            candidate = self._pins[parent]
+            self._remove(undo, self._pins, parent)
+            self._push(parent)
+
+            for dependency in self._dependencies(candidate):
+                dependency_identity = self._identify(dependency)
+                existing = self._criteria.get(dependency_identity, ())
+                remaining = tuple(c for c in existing if c[0] != parent)
+
+                if len(remaining) == len(existing):
+                    continue
+
+                if remaining:
+                    self._assign(undo, self._criteria, dependency_identity, remaining)
+
+                else:
+                    self._remove(undo, self._criteria, dependency_identity)
+                    if dependency_identity in self._pins:
+                        pending.append(dependency_identity)
+
+    def _pin(self, decision:_Decision) -> bool:
+        '''
+        Try the decision's remaining candidates in turn, pinning the first
+        viable one and merging its requirements into the criteria
+
+        @return  Whether a candidate was pinned
+        @note    Pins that the candidate's requirements rule out are
+                 retracted, to be decided again
+        '''
+        identity = decision.identity
+
+        for candidate in decision.candidates:
+            reason = self._excluded(identity, candidate)
+            if reason is not None:
+                decision.reasons |= reason
+                continue
+
+            dependencies = [(self._identify(dependency), dependency) for dependency in self._dependencies(candidate)]
+            conflict = self._conflict(decision, candidate, dependencies)
+
+            if conflict:
+                self._learn(conflict)
+                decision.reasons |= conflict - {(identity, candidate)}
+                continue
+
+            decision.candidate = candidate
+            undo = decision.undo
+            invalidated = []
+
+            self._assign(undo, self._pins, identity, candidate)
+
+            if candidate == self._preferred.get(identity):
+                instrumentation.count('resolver.pins_kept')
+
+            for dependency_identity, dependency in dependencies:
+                if dependency_identity == identity:
+                    continue
+
+                existing = self._criteria.get(dependency_identity, ())
+                self._assign(undo, self._criteria, dependency_identity, existing + ((identity, dependency),))
+                pin = self._pins.get(dependency_identity)
+
+                if pin is None:
+                    self._push(dependency_identity)
+                    if not existing:
+                        self._fresh.append(dependency_identity)
+
+                elif not self._crawler.source_for(dependency).is_satisfied_by(dependency, pin):
+                    invalidated.append((dependency_identity, pin))
+
+            for dependency_identity, pin in invalidated:
+                # Re-pinning is usually the better move, but pins that keep
+                # invalidating each other would do so forever, so the pair
+                # is learnt as a nogood should it happen again before the
+                # next backtrack (each of which learns something new)
+                invalidation = frozenset({(identity, candidate), (dependency_identity, pin)})
+
+                if invalidation in self._invalidations:
+                    self._learn(invalidation)
+                else:
+                    self._invalidations.add(invalidation)
+
+                instrumentation.count('resolver.invalidations')
+
+                if self._pins.get(dependency_identity) == pin:
+                    self._retract(dependency_identity, undo)
+
+            return True
+
+        return False
+
+    def _backjump(self, stack:List[_Decision], nogood:Set[Tuple[str, str]]) -> Optional[_Decision]:
+        '''
+        Unwind to the most recent decision whose pin is implicated in the
+        nogood, undoing every decision on the way
+
+        @return  That decision, primed to try its next candidate, if any
+        '''
+        while stack:
+            decision = stack.pop()
+            pin = decision.identity, decision.candidate
+            self._undo(decision)
+
+            if pin in nogood:
+                decision.reasons |= nogood - {pin}
+                return decision
+
+        return None
+
+    def _build_graph(self, roots:List[str]) -> DirectedGraph:
+        graph = DirectedGraph()
+        frontier = []
+
+        for pkg in roots:
+            identity = self._identify(pkg)
+
+            try:
+                graph.get_node(identity)
+            except NodeDoesNotExist:
+                graph.add_node(identity, self._pins[identity])
+                frontier.append(identity)
+
+        while frontier:
+            identity = frontier.pop(0)
+            node = graph.get_node(identity)
+
+            for dependency in self._dependencies(self._pins[identity]):
+                dependency_identity = self._identify(dependency)
+
+                try:
+                    graph.get_node(dependency_identity)
+                except NodeDoesNotExist:
+                    graph.add_node(dependency_identity, self._pins[dependency_identity])
+                    frontier.append(dependency_identity)
+
+                node.link_to(dependency_identity)
+
+        return graph
+
+    def resolve(self, *roots:str, pins:Optional[_PinsT] = None) -> DirectedGraph:
+        '''
+        Resolve the dependency tree from the given roots
+
+        @param   roots  Root package strings (e.g., requirements.txt)
+        @param   pins   Package strings to prefer for identities (e.g.,
+                        those of a previous resolution), which are tried
+                        before any others, without enumerating the others
+                        unless they fail
+        @return  Dependency graph, keyed by identity, with the chosen
+                 package string for each identity as its payload
+        @note    Will raise ResolutionImpossible if the requirements can't
+                 be reconciled, or ResolutionTooDeep if max_rounds is hit
+        '''
+        with instrumentation.span('resolver.resolve', roots=len(roots)):
+            return self._resolve(roots, pins or {})
+
+    def _resolve(self, roots:Tuple[str, ...], preferred:_PinsT) -> DirectedGraph:
+        self._pins = {}
+        self._criteria = {}
+        self._constraints = {}
+        self._preferred = dict(preferred)
+        self._nogoods = {}
+        self._invalidations = set()
+        self._worklist = []
+        self._fresh = []
+        stack = []
+
+        for pkg in roots:
+            identity = self._identify(pkg)
+
+            if identity not in self._criteria:
+                self._fresh.append(identity)
+                self._push(identity)
+
+            self._criteria[identity] = self._criteria.get(identity, ()) + ((None, pkg),)
+
+            for constraint in self._crawler.constraints(pkg):
+                constrained = self._crawler.identify(constraint)
+                self._constraints[constrained] = self._constraints.get(constrained, ()) + ((None, constraint),)
+
+        for _ in range(self._max_rounds):
+            instrumentation.count('resolver.rounds')
+
+            if self._fresh:
+                self._prefetch()
+
+            identity = self._next()
+
+            if identity is None:
+                return self._build_graph(list(roots))
+
+            requirements = self._requirements(identity)
+            preferred = self._preference(identity)
+            candidates = self._preferring(preferred, requirements) if preferred else iter(self._candidates(requirements))
+
+            decision = _Decision(identity, candidates)
+            failure = None
+
+            while True:
+                if self._pin(decision):
+                    stack.append(decision)
+                    break
+
+                if failure is None:
+                    failure = decision.conflict or (identity, [pkg for _, pkg in requirements])
+
+                # Every candidate is ruled out by the requirements' parents
+                # and the pins that excluded each candidate in turn
+                nogood = set(decision.reasons)
+                nogood.update((parent, self._pins[parent])
+                              for parent, _ in self._criteria[decision.identity]
+                              if parent is not None)
+
+                if nogood:
+                    self._learn(nogood)
+
+                decision = self._backjump(stack, nogood)
+                self._invalidations.clear()
+                self.backtracks += 1
+                instrumentation.count('resolver.backtracks')
+
+                if decision is None:
+                    raise ResolutionImpossible('Cannot satisfy <{}>: {}'.format(failure[0], ', '.join(failure[1])))
+
+        raise ResolutionTooDeep('Could not resolve within {} rounds'.format(self._max_rounds))
@@ -1,5 +1,17 @@
 # MIT License
 # Copyright (c) 2016 Genome Research Limited
-from ypip.sources.requirements_txt import RequirementsTxt
-from ypip.sources.git_github import GitOnGitHub
-from ypip.sources.pip_fallback import PipFallback
+from ypip import lazy_exports
+
+# Exported names, by the submodule that defines them; these are imported
+# on first access, so that importing the package doesn't import the
+# network stack, nor compile every source's patterns, until needed
+lazy_exports(__name__, {
+    'requirements_txt': ['RequirementsTxt', 'RequirementsFileError'],
+    'git_github':       ['GitOnGitHub'],
+    'pip_fallback':     ['PipFallback'],
+    'pypi':             ['PyPI'],
+    'cache':            ['RequirementsCache', 'CacheMiss'],
+    'http':             ['HTTPClient', 'HTTPError'],
+    'git_mirror':       ['GitMirror', 'GitError', 'ls_remote'],
+    'dispatch':         ['Dispatcher']
+})
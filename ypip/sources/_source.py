@@ -1,12 +1,29 @@
 # MIT License
 # Copyright (c) 2016 Genome Research Limited
 from abc import ABCMeta, abstractmethod
-from typing import List, Optional
+from functools import lru_cache
+from typing import Callable, Dict, List, Match, Optional, Pattern
+
+# Package strings are matched against the same pattern by every method of
+# a source, so each distinct string is only matched once
+MATCH_CACHE_SIZE = 16384
+
+def memoised_match(pattern:Pattern) -> Callable[[str], Optional[Match]]:
+    '''
+    @param   pattern  Compiled regular expression
+    @return  Memoised form of its match method
+    '''
+    return lru_cache(maxsize=MATCH_CACHE_SIZE)(pattern.match)
+
 
 class Source(metaclass=ABCMeta):
     '''
     Interface for understanding how to work with a source's packages
     '''
+    # Prefixes with which all of the source's package strings start, if
+    # there are any, so others needn't be checked (None for any string)
+    prefixes = None
+
     @abstractmethod
     def is_package_from_source(self, pkg:str) -> bool:
         '''
@@ -39,3 +56,49 @@ class Source(metaclass=ABCMeta):
         @param   pkg2  Package string
         @return  Whether the two versions conflict
         '''
+
+    def is_satisfied_by(self, pkg:str, candidate:str) -> bool:
+        '''
+        @param   pkg        Package string (requirement)
+        @param   candidate  Package string chosen for the same identity
+        @return  Whether choosing the candidate satisfies the requirement
+        '''
+        return not self.version_conflict(pkg, candidate)
+
+    def candidates(self, pkgs:List[str]) -> List[str]:
+        '''
+        @param   pkgs  Package strings of the same identity
+        @return  Package strings that satisfy all of them, in order of
+                 preference (empty if they cannot be reconciled)
+        '''
+        output = []
+
+        for candidate in pkgs:
+            if candidate not in output and all(self.is_satisfied_by(pkg, candidate) for pkg in pkgs):
+                output.append(candidate)
+
+        return output
+
+    def prefetch(self, pkgs:List[str]):
+        '''
+        Warm any caches for the given packages (e.g., concurrently, in
+        bulk), ahead of their candidates being enumerated
+
+        @param  pkgs  Package strings from this source
+        '''
+
+    def constraints(self, pkg:str) -> List[str]:
+        '''
+        @param   pkg  Package string
+        @return  Package strings that constrain the versions of packages,
+                 should they be required, without requiring them
+        '''
+        return []
+
+    def lock_metadata(self, pkg:str) -> Dict[str, object]:
+        '''
+        @param   pkg  Package string, as chosen by resolution
+        @return  Additional (JSON serialisable) details to record about the
+                 package in a lockfile (e.g., its URL and exact version)
+        '''
+        return {}
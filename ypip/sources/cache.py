@@ -0,0 +1,105 @@
+# MIT License
+# Copyright (c) 2016 Genome Research Limited
+import json
+import os
+import os.path
+import re
+import time
+from collections import namedtuple
+from tempfile import mkstemp
+from typing import Optional
+from urllib.parse import quote
+
+
+class CacheMiss(Exception):
+    pass
+
+
+CacheEntry = namedtuple('CacheEntry', ['content', 'etag', 'fetched'])
+
+
+def default_cache_dir() -> str:
+    '''
+    @return  The user's cache directory for ypip (respecting
+             $XDG_CACHE_HOME, falling back to ~/.cache)
+    '''
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'ypip')
+
+
+class RequirementsCache(object):
+    '''
+    Persistent on-disk cache of fetched requirements, keyed by
+    (namespace, org, repo, ref). Commit SHAs are immutable, so are cached
+    indefinitely; anything else (branches and tags) lives for the TTL,
+    after which it should be revalidated against its ETag
+    '''
+    _sha_pattern = re.compile('^[0-9a-f]{40}$', re.IGNORECASE)
+
+    def __init__(self, root:Optional[str] = None, ttl:float = 3600, offline:bool = False):
+        '''
+        @param  root     Cache directory (defaults to ~/.cache/ypip)
+        @param  ttl      Time, in seconds, that mutable refs are fresh
+        @param  offline  Never go to the network; serve everything cached
+        '''
+        self.root = root or default_cache_dir()
+        self.ttl = ttl
+        self.offline = offline
+
+    @classmethod
+    def is_immutable(cls, ref:str) -> bool:
+        '''
+        @param   ref  Branch, tag or commit
+        @return  Whether the ref is a full commit SHA
+        '''
+        return True if cls._sha_pattern.match(ref) else False
+
+    def _path(self, namespace:str, org:str, repo:str, ref:str) -> str:
+        return os.path.join(self.root, namespace, quote(org, safe=''), quote(repo, safe=''), '{}.json'.format(quote(ref, safe='')))
+
+    def get(self, namespace:str, org:str, repo:str, ref:str) -> Optional[CacheEntry]:
+        '''
+        @return  The cached entry, regardless of freshness, if it exists
+        '''
+        try:
+            with open(self._path(namespace, org, repo, ref)) as handle:
+                stored = json.load(handle)
+
+            return CacheEntry(stored['content'].encode(), stored.get('etag'), stored['fetched'])
+
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, namespace:str, org:str, repo:str, ref:str, content:bytes, etag:Optional[str] = None) -> CacheEntry:
+        '''
+        Store (or replace) an entry, atomically
+
+        @return  The stored entry
+        '''
+        entry = CacheEntry(content, etag, time.time())
+        path = self._path(namespace, org, repo, ref)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        handle, temp_path = mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'w') as temp:
+                json.dump({'content': content.decode(), 'etag': etag, 'fetched': entry.fetched}, temp)
+
+            os.replace(temp_path, path)
+
+        except:
+            os.unlink(temp_path)
+            raise
+
+        return entry
+
+    def is_fresh(self, entry:CacheEntry, ref:str) -> bool:
+        '''
+        @param   entry  Cache entry
+        @param   ref    The ref from which the entry was fetched
+        @return  Whether the entry can be used without revalidation
+        '''
+        return self.offline \
+            or self.is_immutable(ref) \
+            or time.time() - entry.fetched < self.ttl
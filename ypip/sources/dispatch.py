@@ -0,0 +1,40 @@
+# MIT License
+# Copyright (c) 2016 Genome Research Limited
+from typing import List, Optional
+
+from ypip.sources._source import Source
+
+
+class Dispatcher(object):
+    '''
+    Classifies package strings by source, in priority order, once per
+    package string. Sources that declare prefixes are only consulted for
+    package strings that start with one of them, so most sources are
+    never tried against most package strings
+    '''
+    def __init__(self, sources:List[Source]):
+        '''
+        @param  sources  Package sources, ordered by priority
+        '''
+        self._sources = [(source, source.prefixes) for source in sources]
+        self._dispatched = {}
+
+    def __call__(self, pkg:str) -> Optional[Source]:
+        '''
+        @param   pkg  Package string
+        @return  The highest priority source that recognises the package,
+                 if any
+        '''
+        try:
+            return self._dispatched[pkg]
+
+        except KeyError:
+            found = None
+
+            for source, prefixes in self._sources:
+                if (prefixes is None or pkg.startswith(prefixes)) and source.is_package_from_source(pkg):
+                    found = source
+                    break
+
+            self._dispatched[pkg] = found
+            return found
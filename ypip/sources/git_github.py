@@ -1,21 +1,40 @@
 # MIT License
 # Copyright (c) 2016 Genome Research Limited
 import re
-from urllib.request import urlopen
-from urllib.error import HTTPError
-from typing import List, Optional
-from typing.re import Match
+from typing import Dict, List, Match, Optional
 from warnings import warn
 
-from ypip.sources._source import Source
+from ypip import instrumentation
+from ypip.sources._source import Source, memoised_match
+from ypip.sources.cache import CacheMiss, RequirementsCache
+from ypip.sources.git_mirror import GitError, ls_remote
+from ypip.sources.http import HTTPClient, HTTPError, get_client
+from ypip.sources.requirements_txt import remote_requirements
 
 class GitOnGitHub(Source):
-    def __init__(self):
-        self._pkg_pattern = re.compile('^(?:-e)?git\+(?:git|https|ssh)://github.com/(.+?(?=/))/(.+(?=\.git))\.git@(.+(?=#))#egg=(.+)$')
-        self._req_url = 'https://raw.githubusercontent.com/{org}/{repo}/{branch_tag_or_commit}/requirements.txt'
+    prefixes = ('git+', '-e')
+
+    def __init__(self, timeout:float = 30, cache:Optional[RequirementsCache] = None, client:Optional[HTTPClient] = None, base_url:str = 'https://raw.githubusercontent.com', repo_url:str = 'https://github.com', git:str = 'git'):
+        '''
+        @param  timeout   Timeout, in seconds, for each requirements fetch
+        @param  cache     Optional on-disk cache of fetched requirements
+        @param  client    HTTP client; defaults to the shared client
+        @param  base_url  Root URL from which raw files are served
+        @param  repo_url  Root URL from which repositories are cloned
+        @param  git       git executable, for resolving refs to commits
+        '''
+        self._timeout = timeout
+        self._cache = cache
+        self._client = client
+        self._repo_url = repo_url.rstrip('/') + '/{org}/{repo}.git'
+        self._git = git
+        self._commits = {}
+        self._pkg_pattern = re.compile(r'^(?:-e\s*)?git\+(?:git|https|ssh)://github.com/(.+?(?=/))/(.+(?=\.git))\.git@(.+(?=#))#egg=(.+)$')
+        self._match = memoised_match(self._pkg_pattern)
+        self._req_url = base_url.rstrip('/') + '/{org}/{repo}/{branch_tag_or_commit}/requirements.txt'
 
     def _get_match(self, pkg:str) -> Optional[Match]:
-        return self._pkg_pattern.match(pkg)
+        return self._match(pkg)
 
     def is_package_from_source(self, pkg:str) -> bool:
         return True if self._get_match(pkg) else False
@@ -28,26 +47,62 @@ class GitOnGitHub(Source):
             output.append(pkg)
 
             org, repo, branch_tag_or_commit, _ = match.groups()
-            req_url = self._req_url.format(
-                org                  = org,
-                repo                 = repo,
-                branch_tag_or_commit = branch_tag_or_commit
-            )
+            origin = 'github.com/{}/{}@{}/requirements.txt'.format(org, repo, branch_tag_or_commit)
+            output += remote_requirements(self._fetch(org, repo, branch_tag_or_commit).decode(), origin)
 
-            with urlopen(req_url) as response:
-                try:
-                    raw = response.read()
-                except HTTPError as exception:
-                    if exception.code == 404:
-                        msg = 'requirements.txt not found in {}/{}@{}'.format(org, repo, branch_tag_or_commit)
-                        print("Warning!", msg)
-                        warn(msg, Warning)
-                    else:
-                        raise exception
+        return output
 
-                output += raw.splitlines()
+    def _fetch(self, org:str, repo:str, branch_tag_or_commit:str) -> bytes:
+        cache = self._cache
+        entry = cache.get('github', org, repo, branch_tag_or_commit) if cache else None
 
-        return output
+        if entry and cache.is_fresh(entry, branch_tag_or_commit):
+            instrumentation.count('github.cache_hits')
+            return entry.content
+
+        instrumentation.count('github.cache_misses')
+
+        if cache and cache.offline:
+            raise CacheMiss('{}/{}@{} is not cached and ypip is offline'.format(org, repo, branch_tag_or_commit))
+
+        req_url = self._req_url.format(
+            org                  = org,
+            repo                 = repo,
+            branch_tag_or_commit = branch_tag_or_commit
+        )
+
+        headers = {}
+        if entry and entry.etag:
+            headers['If-None-Match'] = entry.etag
+
+        etag = None
+
+        try:
+            with instrumentation.span('github.fetch', url=req_url):
+                response = (self._client or get_client()).get(req_url, headers, timeout=self._timeout)
+
+            if response.status == 304 and entry:
+                instrumentation.count('github.revalidated')
+                raw = entry.content
+                etag = entry.etag
+
+            else:
+                raw = response.body
+                etag = response.headers.get('ETag')
+
+        except HTTPError as exception:
+            if exception.status == 404:
+                # Not cached, as the file (or repository) may yet appear,
+                # even at a commit that is pushed later
+                warn('requirements.txt not found in {}/{}@{}'.format(org, repo, branch_tag_or_commit), Warning)
+                return b''
+
+            raise exception
+
+        if cache:
+            cache.put('github', org, repo, branch_tag_or_commit, raw, etag)
+
+        return raw
 
     def identify(self, pkg:str) -> Optional[str]:
         match = self._get_match(pkg)
@@ -59,6 +114,47 @@ class GitOnGitHub(Source):
         else:
             return None
 
+    def _resolve(self, url:str, ref:str) -> Optional[str]:
+        '''
+        @param   url  Repository URL
+        @param   ref  Branch, tag or commit
+        @return  Commit SHA of the ref, if it can be resolved (branches and
+                 tags can't be, offline)
+        '''
+        key = (url, ref)
+
+        if key not in self._commits:
+            if self._cache and self._cache.offline and not RequirementsCache.is_immutable(ref):
+                commit = None
+
+            else:
+                try:
+                    commit = ls_remote(url, ref, self._git, self._timeout)
+                except GitError as exception:
+                    warn(str(exception), Warning)
+                    commit = None
+
+            self._commits[key] = commit
+
+        return self._commits[key]
+
+    def lock_metadata(self, pkg:str) -> Dict[str, object]:
+        match = self._get_match(pkg)
+
+        if match:
+            org, repo, branch_tag_or_commit, _ = match.groups()
+            url = self._repo_url.format(org=org, repo=repo)
+            output = {'url': url, 'ref': branch_tag_or_commit}
+
+            commit = self._resolve(url, branch_tag_or_commit)
+            if commit:
+                output['commit'] = commit
+
+            return output
+
+        else:
+            return {}
+
     def version_conflict(self, pkg1:str, pkg2:str) -> Optional[bool]:
         match1 = self._get_match(pkg1)
         match2 = self._get_match(pkg2)
@@ -0,0 +1,298 @@
+# MIT License
+# Copyright (c) 2016 Genome Research Limited
+import ast
+import hashlib
+import os
+import os.path
+import re
+import subprocess
+import threading
+from typing import Dict, List, Match, Optional
+
+from ypip import instrumentation
+from ypip.sources._source import Source, memoised_match
+from ypip.sources.cache import CacheMiss, RequirementsCache, default_cache_dir
+from ypip.sources.requirements_txt import remote_requirements
+
+
+class GitError(Exception):
+    pass
+
+
+def setup_requires(source:str) -> List[str]:
+    '''
+    @param   source  Contents of a setup.py
+    @return  The install_requires passed to setup(), if they are given
+             literally (or by a name bound to a literal at module level)
+    '''
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return []
+
+    literals = {}
+
+    for statement in tree.body:
+        if isinstance(statement, ast.Assign):
+            for target in statement.targets:
+                if isinstance(target, ast.Name):
+                    literals[target.id] = statement.value
+
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call):
+            continue
+
+        function = node.func
+        name = function.attr if isinstance(function, ast.Attribute) else getattr(function, 'id', None)
+        if name != 'setup':
+            continue
+
+        for keyword in node.keywords:
+            if keyword.arg != 'install_requires':
+                continue
+
+            value = keyword.value
+            if isinstance(value, ast.Name):
+                value = literals.get(value.id, value)
+
+            try:
+                requires = ast.literal_eval(value)
+            except ValueError:
+                return []
+
+            if isinstance(requires, str):
+                requires = requires.splitlines()
+
+            return [str(requirement) for requirement in requires]
+
+    return []
+
+
+def ls_remote(url:str, ref:str, git:str = 'git', timeout:float = 30) -> Optional[str]:
+    '''
+    Resolve a ref to the commit it currently points to, without fetching
+
+    @param   url      Repository URL
+    @param   ref      Branch, tag or full commit SHA
+    @param   git      git executable
+    @param   timeout  Timeout, in seconds
+    @return  Commit SHA, or None if the repository has no such ref (an
+             abbreviated SHA, for example)
+    @note    Will raise GitError if the repository can't be reached
+    '''
+    if RequirementsCache.is_immutable(ref):
+        return ref.lower()
+
+    environment = dict(os.environ, GIT_TERMINAL_PROMPT='0')
+
+    try:
+        with instrumentation.span('git.ls-remote', url=url):
+            result = subprocess.run(
+                [git, 'ls-remote', url, ref, 'refs/tags/{}^{{}}'.format(ref)],
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=environment, timeout=timeout)
+
+    except (OSError, subprocess.TimeoutExpired) as exception:
+        raise GitError('git ls-remote {} failed: {}'.format(url, exception))
+
+    if result.returncode:
+        raise GitError('git ls-remote {} failed: {}'.format(url, result.stderr.decode(errors='replace').strip()))
+
+    refs = {}
+    for line in result.stdout.decode().splitlines():
+        commit, name = line.split('\t', 1)
+        refs[name] = commit
+
+    # Annotated tags are peeled to the commit they tag
+    for name in ['refs/tags/{}^{{}}'.format(ref), 'refs/heads/{}'.format(ref), 'refs/tags/{}'.format(ref), ref]:
+        if name in refs:
+            return refs[name]
+
+    return None
+
+
+class GitMirror(Source):
+    '''
+    Packages from any git repository, fetched with git itself into a
+    shared, bare mirror per repository. Only the requested ref is fetched,
+    shallowly and without blobs (where the server supports it), so only
+    the files that are read are ever transferred; commits already in a
+    mirror are never fetched again
+    '''
+    prefixes = ('git+', '-e')
+
+    def __init__(self, root:Optional[str] = None, timeout:float = 30, offline:bool = False, git:str = 'git'):
+        '''
+        @param  root     Mirror directory (defaults to ~/.cache/ypip/git)
+        @param  timeout  Timeout, in seconds, for each git command
+        @param  offline  Never go to the network; only use mirrored refs
+        @param  git      git executable
+        '''
+        self.root = root or os.path.join(default_cache_dir(), 'git')
+        self._timeout = timeout
+        self._offline = offline
+        self._git = git
+        self._pkg_pattern = re.compile(r'^(?:-e\s*)?git\+((?:git|https?|ssh|file)://.+)@([^@]+?)#egg=(.+)$')
+        self._match = memoised_match(self._pkg_pattern)
+
+        self._commits = {}
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    def _get_match(self, pkg:str) -> Optional[Match]:
+        return self._match(pkg)
+
+    def is_package_from_source(self, pkg:str) -> bool:
+        return True if self._get_match(pkg) else False
+
+    def _run(self, mirror:str, *args:str, check:bool = True) -> Optional[bytes]:
+        environment = dict(os.environ, GIT_TERMINAL_PROMPT='0')
+
+        try:
+            with instrumentation.span('git.{}'.format(args[0]), mirror=mirror):
+                result = subprocess.run(
+                    [self._git, '--git-dir', mirror] + list(args),
+                    stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=environment, timeout=self._timeout)
+
+        except (OSError, subprocess.TimeoutExpired) as exception:
+            raise GitError('git {} failed: {}'.format(' '.join(args), exception))
+
+        if result.returncode:
+            if check:
+                raise GitError('git {} failed: {}'.format(' '.join(args), result.stderr.decode(errors='replace').strip()))
+
+            return None
+
+        return result.stdout
+
+    def _lock(self, url:str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(url, threading.Lock())
+
+    def _mirror(self, url:str) -> str:
+        mirror = os.path.join(self.root, '{}.git'.format(hashlib.sha1(url.encode()).hexdigest()))
+
+        if not os.path.isdir(mirror):
+            if self._offline:
+                raise CacheMiss('{} is not mirrored and ypip is offline'.format(url))
+
+            os.makedirs(self.root, exist_ok=True)
+            self._run(mirror, 'init', '--bare', '--quiet')
+
+            # The remote is a promisor, so blobs left out of a filtered fetch
+            # are fetched lazily when they are read
+            self._run(mirror, 'remote', 'add', 'origin', url)
+            self._run(mirror, 'config', 'remote.origin.promisor', 'true')
+            self._run(mirror, 'config', 'remote.origin.partialclonefilter', 'blob:none')
+
+        return mirror
+
+    def _recorded(self, mirror:str) -> List[str]:
+        return self._run(mirror, 'for-each-ref', '--format=%(objectname)', 'refs/ypip/').decode().split()
+
+    def _resolve(self, url:str, ref:str) -> str:
+        '''
+        @param   url  Repository URL
+        @param   ref  Branch, tag or commit
+        @return  Commit SHA of the ref, fetching it into the mirror if need be
+        '''
+        key = (url, ref)
+        if key in self._commits:
+            return self._commits[key]
+
+        with self._lock(url):
+            if key in self._commits:
+                return self._commits[key]
+
+            mirror = self._mirror(url)
+
+            # Refs are recorded under a name that can't clash with git's own
+            local_ref = 'refs/ypip/{}'.format(hashlib.sha1(ref.encode()).hexdigest())
+
+            # Only commits recorded under those names are looked for, as
+            # looking up any other object in a partial clone would go to
+            # the network to find it
+            if RequirementsCache.is_immutable(ref) and ref.lower() in self._recorded(mirror):
+                instrumentation.count('git.mirror_hits')
+                commit = ref.lower()
+
+            elif self._offline:
+                commit = self._run(mirror, 'rev-parse', '--verify', '--quiet', local_ref, check=False)
+                if commit is None:
+                    raise CacheMiss('{}@{} is not mirrored and ypip is offline'.format(url, ref))
+
+                commit = commit.decode().strip()
+
+            else:
+                self._run(mirror, 'fetch', '--quiet', '--no-tags', '--depth=1', '--filter=blob:none', 'origin', ref)
+                commit = self._run(mirror, 'rev-parse', 'FETCH_HEAD^{commit}').decode().strip()
+                self._run(mirror, 'update-ref', local_ref, commit)
+
+            self._commits[key] = commit
+            return commit
+
+    def _read(self, url:str, commit:str, path:str) -> Optional[bytes]:
+        mirror = self._mirror(url)
+
+        # Trees are always fetched, so the listing never goes to the network
+        if not self._run(mirror, 'ls-tree', '--name-only', commit, '--', path):
+            return None
+
+        with self._lock(url):
+            return self._run(mirror, 'cat-file', 'blob', '{}:{}'.format(commit, path))
+
+    def get_requirements(self, pkg:str) -> List[str]:
+        output = []
+        match = self._get_match(pkg)
+
+        if match:
+            output.append(pkg)
+
+            url, ref, _ = match.groups()
+            commit = self._resolve(url, ref)
+
+            requirements_txt = self._read(url, commit, 'requirements.txt')
+            if requirements_txt is not None:
+                output += remote_requirements(requirements_txt.decode(), '{}@{}/requirements.txt'.format(url, ref))
+
+            setup_py = self._read(url, commit, 'setup.py')
+            if setup_py is not None:
+                output += [requirement for requirement in setup_requires(setup_py.decode()) if requirement not in output]
+
+        return output
+
+    def identify(self, pkg:str) -> Optional[str]:
+        match = self._get_match(pkg)
+
+        if match:
+            url, _, egg = match.groups()
+            return '{}:git {}'.format(egg, url)
+
+        else:
+            return None
+
+    def lock_metadata(self, pkg:str) -> Dict[str, object]:
+        match = self._get_match(pkg)
+
+        if match:
+            url, ref, _ = match.groups()
+            return {
+                'url': url,
+                'ref': ref,
+                'commit': self._resolve(url, ref)
+            }
+
+        else:
+            return {}
+
+    def version_conflict(self, pkg1:str, pkg2:str) -> Optional[bool]:
+        match1 = self._get_match(pkg1)
+        match2 = self._get_match(pkg2)
+
+        if match1 and match2:
+            url1, ref1, egg1 = match1.groups()
+            url2, ref2, egg2 = match2.groups()
+
+            return not(egg1 == egg2 and url1 == url2 and ref1 == ref2)
+
+        else:
+            return None
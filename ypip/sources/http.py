@@ -0,0 +1,215 @@
+# MIT License
+# Copyright (c) 2016 Genome Research Limited
+import gzip
+import http.client
+import ssl
+import threading
+import time
+from collections import namedtuple
+from typing import Dict, Optional
+from urllib.parse import urljoin, urlsplit
+
+from ypip import instrumentation
+
+
+class HTTPError(Exception):
+    def __init__(self, url:str, status:int):
+        super().__init__('HTTP {} from {}'.format(status, url))
+        self.url = url
+        self.status = status
+
+
+Response = namedtuple('Response', ['url', 'status', 'headers', 'body'])
+
+# Statuses worth retrying, as the server may recover
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+_REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+# Errors from which a request can be retried on a fresh connection
+_RETRY_ERRORS = (http.client.HTTPException, OSError)
+
+
+class HTTPClient(object):
+    '''
+    Thread-safe HTTP client that keeps connections alive in a pool per
+    host, so handshakes are amortised across requests, with bounded
+    retries (with exponential backoff) and transparent gzip decoding
+    '''
+    def __init__(self, pool_size:int = 8, retries:int = 3, backoff:float = 0.5, timeout:float = 30, max_redirects:int = 5):
+        '''
+        @param  pool_size      Maximum idle connections kept per host
+        @param  retries        Maximum retries of a failed request
+        @param  backoff        Initial delay, in seconds, between retries,
+                               which doubles with each retry
+        @param  timeout        Default timeout, in seconds, of a request
+        @param  max_redirects  Maximum number of redirects to follow
+        '''
+        self._pool_size = pool_size
+        self._retries = retries
+        self._backoff = backoff
+        self._timeout = timeout
+        self._max_redirects = max_redirects
+
+        self._pool = {}
+        self._lock = threading.Lock()
+        self._ssl_context = ssl.create_default_context()
+
+    def _acquire(self, scheme:str, netloc:str, timeout:float) -> Optional[http.client.HTTPConnection]:
+        with self._lock:
+            idle = self._pool.get((scheme, netloc))
+            if not idle:
+                return None
+
+            connection = idle.pop()
+
+        connection.timeout = timeout
+        if connection.sock is not None:
+            connection.sock.settimeout(timeout)
+
+        return connection
+
+    def _connect(self, scheme:str, netloc:str, timeout:float) -> http.client.HTTPConnection:
+        instrumentation.count('http.connections')
+
+        if scheme == 'https':
+            return http.client.HTTPSConnection(netloc, timeout=timeout, context=self._ssl_context)
+
+        return http.client.HTTPConnection(netloc, timeout=timeout)
+
+    def _release(self, scheme:str, netloc:str, connection:http.client.HTTPConnection):
+        with self._lock:
+            idle = self._pool.setdefault((scheme, netloc), [])
+            if len(idle) < self._pool_size:
+                idle.append(connection)
+                return
+
+        connection.close()
+
+    def close(self):
+        ''' Close all idle connections '''
+        with self._lock:
+            pool, self._pool = self._pool, {}
+
+        for idle in pool.values():
+            for connection in idle:
+                connection.close()
+
+    def _request(self, url:str, headers:Dict[str, str], timeout:float) -> Response:
+        split = urlsplit(url)
+        path = split.path or '/'
+        if split.query:
+            path = '{}?{}'.format(path, split.query)
+
+        connection = self._acquire(split.scheme, split.netloc, timeout)
+
+        while True:
+            reused = connection is not None
+            if not reused:
+                connection = self._connect(split.scheme, split.netloc, timeout)
+
+            try:
+                with instrumentation.span('http.request', url=url):
+                    connection.request('GET', path, headers=headers)
+                    response = connection.getresponse()
+                    body = response.read()
+
+                break
+
+            except _RETRY_ERRORS:
+                connection.close()
+                connection = None
+
+                # The server may have closed an idle connection, in which
+                # case a fresh connection is tried straight away
+                if not reused:
+                    raise
+
+            except:
+                connection.close()
+                raise
+
+        if response.will_close:
+            connection.close()
+        else:
+            self._release(split.scheme, split.netloc, connection)
+
+        instrumentation.count('http.requests')
+        instrumentation.count('http.bytes', len(body))
+
+        if response.getheader('Content-Encoding', '').lower() == 'gzip':
+            body = gzip.decompress(body)
+
+        return Response(url, response.status, response.msg, body)
+
+    def get(self, url:str, headers:Optional[Dict[str, str]] = None, timeout:Optional[float] = None) -> Response:
+        '''
+        @param   url      URL to fetch
+        @param   headers  Additional request headers
+        @param   timeout  Timeout, in seconds, overriding the default
+        @return  Response, after following any redirects
+        @note    Will raise HTTPError on failing statuses (other than 304
+                 Not Modified) once retries are exhausted
+        '''
+        request_headers = {'Accept-Encoding': 'gzip', 'Connection': 'keep-alive'}
+        request_headers.update(headers or {})
+        timeout = self._timeout if timeout is None else timeout
+
+        redirects = 0
+        attempt = 0
+
+        while True:
+            try:
+                response = self._request(url, request_headers, timeout)
+
+            except _RETRY_ERRORS:
+                if attempt >= self._retries:
+                    raise
+
+                response = None
+
+            if response is not None:
+                if response.status in _REDIRECT_STATUSES and response.headers.get('Location'):
+                    redirects += 1
+                    if redirects > self._max_redirects:
+                        raise HTTPError(url, response.status)
+
+                    url = urljoin(url, response.headers['Location'])
+                    continue
+
+                if response.status not in _RETRY_STATUSES or attempt >= self._retries:
+                    if response.status >= 400:
+                        raise HTTPError(url, response.status)
+
+                    return response
+
+            instrumentation.count('http.retries')
+            time.sleep(self._backoff * 2 ** attempt)
+            attempt += 1
+
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client() -> HTTPClient:
+    '''
+    @return  The HTTP client shared by all network sources
+    '''
+    global _client
+
+    with _client_lock:
+        if _client is None:
+            _client = HTTPClient()
+
+        return _client
+
+def set_client(client:Optional[HTTPClient]):
+    '''
+    Replace the HTTP client shared by all network sources (e.g., with one
+    pointed at a stand-in server); None reinstates the default
+
+    @param  client  HTTP client
+    '''
+    global _client
+
+    with _client_lock:
+        _client = client
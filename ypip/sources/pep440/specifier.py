@@ -2,7 +2,17 @@
 PEP440 Compliant Version Specifier Object
 =========================================
 Version specifier objects created by parsing input strings, per PEP440
-[1], and providing a predicate interface
+[1], and providing both a predicate interface and batch filtering of
+candidate versions
+
+Each clause of a specifier is compiled into a sorted list of disjoint,
+half-open intervals over Version.sort_key, where the bounds may be
+partial keys (a tuple sorts before every longer tuple that it prefixes).
+The conjunction of clauses is then normalised into a single union of
+intervals, so testing a version is a few tuple comparisons, filtering
+many versions needs only a single sort and a bisection per bound, and
+specifiers can be intersected and checked for emptiness without
+enumerating any versions.
 
 1. https://www.python.org/dev/peps/pep-0440/
 
@@ -15,43 +25,138 @@ MIT License
 Copyright (c) 2016 Genome Research Limited
 """
 import re
-from typing import Callable
-from ypip.sources.pep440.version import Version
+from bisect import bisect_left
+from operator import attrgetter
+from functools import reduce
+from typing import Iterable, List, Optional, Tuple
+from ypip import instrumentation
+from ypip.sources.pep440.version import Version, _trim_release
 from ypip.sources.pep440.exceptions import ParseError
 
 
-_PredicateT = Callable[[Version], bool]
+_IntervalT = Tuple[Tuple, Tuple]
+_IntervalsT = List[_IntervalT]
+_RangesT = List[Tuple[int, int]]
+
+# Extremal bounds of the sort key space
+_MIN = ()
+_MAX = (float('inf'),)
+
+# Sorts after any local version segment of a sort key
+_LOCAL_MAX = (2,)
+
+_sort_key = attrgetter('sort_key')
+
+def _public(rhs:Version) -> Tuple:
+    """ Sort key without the local version """
+    return rhs.sort_key[:5]
+
+def _prefix_interval(epoch:int, prefix:Tuple[int, ...]) -> _IntervalT:
+    """ Interval of all versions whose release starts with the prefix """
+    upper = prefix[:-1] + (prefix[-1] + 1,)
+    return (epoch, _trim_release(prefix)), (epoch, _trim_release(upper))
+
+def _intersect(lhs:_IntervalsT, rhs:_IntervalsT) -> _IntervalsT:
+    """ Intersect two sorted lists of disjoint intervals """
+    output = []
+    i = j = 0
+
+    while i < len(lhs) and j < len(rhs):
+        lower = max(lhs[i][0], rhs[j][0])
+        upper = min(lhs[i][1], rhs[j][1])
+
+        if lower < upper:
+            output.append((lower, upper))
+
+        if lhs[i][1] < rhs[j][1]:
+            i += 1
+        else:
+            j += 1
+
+    return output
+
+def _complement(intervals:_IntervalsT) -> _IntervalsT:
+    """ Complement a sorted list of disjoint intervals """
+    output = []
+    lower = _MIN
+
+    for start, stop in intervals:
+        if lower < start:
+            output.append((lower, start))
+        lower = stop
+
+    if lower < _MAX:
+        output.append((lower, _MAX))
+
+    return output
 
-def _equality_factory(rhs:Version, wildcard:bool) -> _PredicateT:
-    # TODO
-    pass
+def _equality_factory(rhs:Version, wildcard:bool) -> _IntervalsT:
+    if wildcard:
+        if rhs.pre is not None or rhs.post is not None or rhs.dev is not None or rhs.local is not None:
+            raise ParseError('Wildcards are only supported on release segments, not "{}.*"'.format(rhs))
 
-def _inequality_factory(rhs:Version, wildcard:bool) -> _PredicateT:
-    eq = _equality_factory(rhs, wildcard)
-    return lambda lhs: not eq(lhs)
+        return [_prefix_interval(rhs.epoch or 0, rhs.release)]
 
-def _absolute_factory(rhs:Version) -> _PredicateT:
-    return lambda lhs: lhs == rhs
+    if rhs.local is None:
+        # The local version of candidates is ignored when the specified
+        # version is public
+        return [(_public(rhs), _public(rhs) + (_LOCAL_MAX,))]
 
-def _lt_factory(rhs:Version) -> _PredicateT:
-    return lambda lhs: lhs < rhs
+    return _absolute_factory(rhs)
 
-def _lte_factory(rhs:Version) -> _PredicateT:
-    eq = _equality_factory(rhs, False)
-    lt = _lt_factory(rhs)
-    return lambda lhs: eq(lhs) or lt(lhs)
+def _inequality_factory(rhs:Version, wildcard:bool) -> _IntervalsT:
+    return _complement(_equality_factory(rhs, wildcard))
 
-def _gt_factory(rhs:Version) -> _PredicateT:
-    lte = _lte_factory(rhs)
-    return lambda lhs: not lte(lhs)
+def _absolute_factory(rhs:Version) -> _IntervalsT:
+    return [(rhs.sort_key, rhs.sort_key + (0,))]
 
-def _gte_factory(rhs:Version) -> _PredicateT:
-    lt = _lt_factory(rhs)
-    return lambda lhs: not lt(lhs)
+def _lt_factory(rhs:Version) -> _IntervalsT:
+    if rhs.pre is not None or rhs.dev is not None:
+        return [(_MIN, _public(rhs))]
 
-def _compatible_factory(rhs:Version) -> _PredicateT:
-    # TODO
-    pass
+    if rhs.post is not None:
+        # Everything before the postrelease, other than its development
+        # releases (which are its prereleases), so including the
+        # prereleases and development releases of its release
+        return [(_MIN, rhs.sort_key[:4])]
+
+    # Prereleases of the specified version are excluded, unless the
+    # specified version is itself a prerelease
+    epoch, release = rhs.sort_key[:2]
+    return [(_MIN, (epoch, release))]
+
+def _lte_factory(rhs:Version) -> _IntervalsT:
+    return [(_MIN, _public(rhs) + (_LOCAL_MAX,))]
+
+def _gt_factory(rhs:Version) -> _IntervalsT:
+    if rhs.post is None and rhs.dev is None:
+        # Postreleases of the specified version are excluded, unless the
+        # specified version is itself a postrelease
+        return [(rhs.sort_key[:3] + ((2,),), _MAX)]
+
+    return [(_public(rhs) + (_LOCAL_MAX,), _MAX)]
+
+def _gte_factory(rhs:Version) -> _IntervalsT:
+    return [(_public(rhs), _MAX)]
+
+def _compatible_factory(rhs:Version) -> _IntervalsT:
+    if len(rhs.release) < 2:
+        raise ParseError('Compatible release clauses need at least two release segments, not "{}"'.format(rhs))
+
+    # ~= X.Y.Z is equivalent to >= X.Y.Z, == X.Y.*
+    return _intersect(_gte_factory(rhs), [_prefix_interval(rhs.epoch or 0, rhs.release[:-1])])
+
+def _normalise(intervals:_IntervalsT) -> _IntervalsT:
+    """ Merge touching intervals of a sorted list of disjoint intervals """
+    output = []
+
+    for start, stop in intervals:
+        if output and output[-1][1] == start:
+            output[-1] = output[-1][0], stop
+        else:
+            output.append((start, stop))
+
+    return output
 
 
 class Specifier(object):
@@ -68,7 +173,7 @@ class Specifier(object):
 
     wildcard = re.compile(r'\.?\d*\*')
 
-    predicate_factory = {
+    clause_factory = {
         '==':  _equality_factory,
         '!=':  _inequality_factory,
         '===': lambda rhs, _: _absolute_factory(rhs),
@@ -86,8 +191,11 @@ class Specifier(object):
         @param  spec  Input string to parse
         @note   Will raise ParseError if not compliant
         """
+        instrumentation.count('pep440.specifiers_parsed')
+
         specifiers = re.split(r'\s*,\s*', spec.strip())
-        self.comparators = []
+        self.clauses = []
+        clause_intervals = []
 
         if not specifiers:
             raise ParseError('Specifier string is empty')
@@ -108,8 +216,17 @@ class Specifier(object):
 
             version = Version(v)
 
-            # Add comparator predicate to conjunction
-            self.comparators.append(Specifier.predicate_factory[op](version, has_wildcard))
+            # Add clause intervals to conjunction
+            self.clauses.append('{}{}'.format(op, parsed.group('v')))
+            clause_intervals.append(Specifier.clause_factory[op](version, has_wildcard))
+
+        self.intervals = _normalise(reduce(_intersect, clause_intervals, [(_MIN, _MAX)]))
+
+    def __str__(self):
+        return ', '.join(self.clauses)
+
+    def __repr__(self):
+        return '<Specifier {} at {}>'.format(str(self), hex(id(self)))
 
     def __call__(self, version:Version) -> bool:
         """
@@ -118,4 +235,79 @@ class Specifier(object):
         @param   version  Version to check against specification
         @return  Boolean
         """
-        return all(comp(version) for comp in self.comparators)
+        key = version.sort_key
+        return any(lower <= key < upper for lower, upper in self.intervals)
+
+    def intersection(self, other:'Specifier') -> 'Specifier':
+        """
+        Conjunction of two specifications
+
+        @param   other  Specifier to intersect with
+        @return  Specifier satisfied only by versions that satisfy both
+        """
+        output = object.__new__(Specifier)
+        output.clauses = self.clauses + other.clauses
+        output.intervals = _normalise(_intersect(self.intervals, other.intervals))
+        return output
+
+    __and__ = intersection
+
+    def is_empty(self) -> bool:
+        """
+        Check whether the specification can never be satisfied
+
+        @return  Boolean
+        """
+        return not self.intervals
+
+    def isdisjoint(self, other:'Specifier') -> bool:
+        """
+        Check whether no version can satisfy both specifications
+
+        @param   other  Specifier to check against
+        @return  Boolean
+        """
+        return not _intersect(self.intervals, other.intervals)
+
+    def issubset(self, other:'Specifier') -> bool:
+        """
+        Check whether every version satisfying this specification also
+        satisfies the other
+
+        @param   other  Specifier to check against
+        @return  Boolean
+        """
+        return _normalise(_intersect(self.intervals, other.intervals)) == self.intervals
+
+    def _ranges(self, keys:List[Tuple]) -> _RangesT:
+        """ Index ranges of the sorted keys that satisfy the specification """
+        ranges = []
+
+        for lower, upper in self.intervals:
+            start, stop = bisect_left(keys, lower), bisect_left(keys, upper)
+            if start < stop:
+                ranges.append((start, stop))
+
+        return ranges
+
+    def filter(self, versions:Iterable[Version]) -> List[Version]:
+        """
+        Filter candidate versions against the specification
+
+        @param   versions  Candidate versions
+        @return  Satisfying versions, in ascending order
+        """
+        candidates = sorted(versions, key=_sort_key)
+        ranges = self._ranges([v.sort_key for v in candidates])
+        return [v for start, stop in ranges for v in candidates[start:stop]]
+
+    def best(self, versions:Iterable[Version]) -> Optional[Version]:
+        """
+        Find the greatest candidate version satisfying the specification
+
+        @param   versions  Candidate versions
+        @return  Greatest satisfying version, if any
+        """
+        candidates = sorted(versions, key=_sort_key)
+        ranges = self._ranges([v.sort_key for v in candidates])
+        return candidates[ranges[-1][1] - 1] if ranges else None
@@ -11,10 +11,21 @@ MIT License
 Copyright (c) 2016 Genome Research Limited
 """
 import re
-from typing import Any, Optional
-from functools import total_ordering
+from functools import lru_cache
+from typing import Any, Optional, Tuple
+from ypip import instrumentation
 from ypip.sources.pep440.exceptions import ParseError
 
+# Maximum number of distinct version strings to keep parsed
+PARSE_CACHE_SIZE = 4096
+
+_PRE_PHASES = { 'a': 'a', 'alpha': 'a',
+                'b': 'b', 'beta': 'b',
+                'rc': 'rc', 'pre': 'rc', 'preview': 'rc' }
+
+# Fortunately 'rc' > 'b' > 'a', but explicit is better than implicit
+_PRE_ORDER = { 'a': 0, 'b': 1, 'rc': 2 }
+
 def _maybe_int(s:Any) -> Optional[int]:
     """ Cast to integer, if possible, otherwise None """
     try:
@@ -22,10 +33,55 @@ def _maybe_int(s:Any) -> Optional[int]:
     except:
         return None
 
+def _trim_release(release:Tuple[int, ...]) -> Tuple[int, ...]:
+    """ Strip insignificant trailing zeros from a release tuple """
+    end = len(release)
+    while end and release[end - 1] == 0:
+        end -= 1
+
+    return release[:end]
+
+def _sort_key(epoch:Optional[int], release:Tuple[int, ...], pre:Optional[Tuple[str, int]],
+              post:Optional[int], dev:Optional[int], local:Optional[Tuple]) -> Tuple:
+    """
+    Build a single tuple that orders versions per PEP440, such that
+    comparing two versions is one tuple comparison. The components are
+    encoded to be totally ordered (i.e., no None):
+
+    * Missing epochs are zero
+    * Trailing zeros are insignificant in the release (1.0 == 1.0.0)
+    * Development releases of a final release sort before any of its
+      prereleases (1.0.dev0 < 1.0a0), prereleases before the release
+    * Postreleases sort after the release
+    * Development releases sort before the release they develop
+    * Local versions sort after the public version; numeric segments
+      sort after alphanumeric segments, which compare case-insensitively
+    """
+    if pre is not None:
+        pre_key = (1, _PRE_ORDER[pre[0]], pre[1])
+    elif post is None and dev is not None:
+        pre_key = (0,)
+    else:
+        pre_key = (2,)
+
+    post_key = (0,) if post is None else (1, post)
+    dev_key = (1,) if dev is None else (0, dev)
+
+    if local is None:
+        local_key = (0,)
+    else:
+        local_key = (1, tuple((1, x) if isinstance(x, int) else (0, x.lower()) for x in local))
+
+    return (epoch or 0, _trim_release(release), pre_key, post_key, dev_key, local_key)
+
 
-@total_ordering
 class Version(object):
-    """ Parse, normalise and order version strings, a la PEP440 """
+    """
+    Parse, normalise and order version strings, a la PEP440
+
+    NOTE Instances are interned, so must be treated as immutable
+    """
+    __slots__ = ('epoch', 'release', 'pre', 'post', 'dev', 'local', 'sort_key')
 
     # Yikes...
     pattern = re.compile(r'''
@@ -40,44 +96,18 @@ class Version(object):
         $
     ''', re.VERBOSE | re.IGNORECASE)
 
-    def __init__(self, version:str):
+    def __new__(cls, version:str) -> 'Version':
         """
-        Construct Version by parsing input string
+        Construct Version by parsing input string, through an LRU-bounded
+        cache of previously parsed strings
 
         @param  version  Input string to parse
         @note   Will raise ParseError if not compliant
         """
-        parsed = Version.pattern.match(version.strip())
-
-        if not parsed:
-            raise ParseError('Could not parse "{}" in accordance with PEP440'.format(version))
-
-        self.epoch = _maybe_int(parsed.group('epoch'))
-        self.release = tuple(map(int, parsed.group('release').split('.')))
-
-        self.pre = None
-        self.post = None
-        self.dev = None
-        self.local = None
-
-        if parsed.group('pre'):
-            pre_phase = { 'a': 'a', 'alpha': 'a',
-                          'b': 'b', 'beta': 'b',
-                          'rc': 'rc', 'pre': 'rc', 'preview': 'rc' }[parsed.group('pre').lower()]
-            pre_version = _maybe_int(parsed.group('preN')) or 0
-            self.pre = pre_phase, pre_version
+        return _parse(cls, version)
 
-        if parsed.group('post') or parsed.group('postImp'):
-            self.post = _maybe_int(parsed.group('postImpN')) \
-                     or _maybe_int(parsed.group('postN')) \
-                     or 0
-
-        if parsed.group('dev'):
-            self.dev = _maybe_int(parsed.group('devN')) or 0
-
-        if parsed.group('local'):
-            norm_local = re.sub('[-_]', '.', parsed.group('local'))
-            self.local = tuple(map(lambda x: int(x) if x.isdecimal() else x, norm_local.split('.')))
+    def __reduce__(self):
+        return type(self), (str(self),)
 
     def __str__(self):
         output = []
@@ -104,61 +134,81 @@ class Version(object):
     def __repr__(self):
         return '<Version {} at {}>'.format(str(self), hex(id(self)))
 
+    def __hash__(self) -> int:
+        return hash(self.sort_key)
+
     def __eq__(self, other:'Version') -> bool:
-        return self.epoch   == other.epoch \
-           and self.release == other.release \
-           and self.pre     == other.pre \
-           and self.post    == other.post \
-           and self.dev     == other.dev \
-           and self.local   == other.local
+        if not isinstance(other, Version):
+            return NotImplemented
+
+        return self.sort_key == other.sort_key
+
+    def __ne__(self, other:'Version') -> bool:
+        if not isinstance(other, Version):
+            return NotImplemented
+
+        return self.sort_key != other.sort_key
+
+    def __lt__(self, other:'Version') -> bool:
+        if not isinstance(other, Version):
+            return NotImplemented
+
+        return self.sort_key < other.sort_key
+
+    def __le__(self, other:'Version') -> bool:
+        if not isinstance(other, Version):
+            return NotImplemented
+
+        return self.sort_key <= other.sort_key
 
     def __gt__(self, other:'Version') -> bool:
-        if self.epoch != other.epoch:
-            # No epoch => zero epoch
-            return (self.epoch or 0) > (other.epoch or 0)
-
-        if self.release != other.release:
-            return self.release > other.release
-
-        if self.pre != other.pre:
-            # Prerelease < release
-            # Fortunately 'rc' > 'b' > 'a'
-            if self.pre is None:
-                return True
-            elif other.pre is None:
-                return False
-            else:
-                return self.pre > other.pre
-
-        if self.post != other.post:
-            # Postrelease > release
-            if self.post is None:
-                return False
-            elif other.post is None:
-                return True
-            else:
-                return self.post > other.post
-
-        if self.dev != other.dev:
-            # Development release < release
-            if self.dev is None:
-                return True
-            elif other.dev is None:
-                return False
-            else:
-                return self.dev > other.dev
-
-        if self.local != other.local:
-            # Local release > release
-            if self.local is None:
-                return False
-            elif other.local is None:
-                return True
-            else:
-                # This is disingenuous as the local versions could be
-                # completely different, but that's what the PEP says...
-
-                # FIXME Integer components are defined to be greater
-                # than respective string components, but Python will
-                # instead throw a TypeError (unorderable types)
-                return self.local > other.local
+        if not isinstance(other, Version):
+            return NotImplemented
+
+        return self.sort_key > other.sort_key
+
+    def __ge__(self, other:'Version') -> bool:
+        if not isinstance(other, Version):
+            return NotImplemented
+
+        return self.sort_key >= other.sort_key
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse(cls:type, version:str) -> Version:
+    """ Parse input string into a new Version (or subclass) instance """
+    instrumentation.count('pep440.versions_parsed')
+    parsed = Version.pattern.match(version.strip())
+
+    if not parsed:
+        raise ParseError('Could not parse "{}" in accordance with PEP440'.format(version))
+
+    self = object.__new__(cls)
+
+    self.epoch = _maybe_int(parsed.group('epoch'))
+    self.release = tuple(map(int, parsed.group('release').split('.')))
+
+    self.pre = None
+    self.post = None
+    self.dev = None
+    self.local = None
+
+    if parsed.group('pre'):
+        pre_phase = _PRE_PHASES[parsed.group('pre').lower()]
+        pre_version = _maybe_int(parsed.group('preN')) or 0
+        self.pre = pre_phase, pre_version
+
+    if parsed.group('post') or parsed.group('postImp'):
+        self.post = _maybe_int(parsed.group('postImpN')) \
+                 or _maybe_int(parsed.group('postN')) \
+                 or 0
+
+    if parsed.group('dev'):
+        self.dev = _maybe_int(parsed.group('devN')) or 0
+
+    if parsed.group('local'):
+        norm_local = re.sub('[-_]', '.', parsed.group('local'))
+        self.local = tuple(map(lambda x: int(x) if x.isdecimal() else x, norm_local.split('.')))
+
+    self.sort_key = _sort_key(self.epoch, self.release, self.pre, self.post, self.dev, self.local)
+    return self
@@ -0,0 +1,12 @@
+"""
+Exceptions
+==========
+
+License
+-------
+MIT License
+Copyright (c) 2016 Genome Research Limited
+"""
+class ParseError(Exception):
+    """ Parse error """
+    pass
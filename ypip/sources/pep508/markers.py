@@ -0,0 +1,310 @@
+"""
+PEP508 Environment Markers
+==========================
+Environment markers, per PEP508 [1], each of which is compiled once into
+a predicate over the marker environment; the environment of the running
+interpreter is computed once per process, so whether a marker applies
+to it need only be decided once per distinct marker
+
+Comparisons are by PEP440 version where both sides are versions (which,
+for the usual comparison of a variable with a literal, is decided when
+the marker is compiled) and otherwise by string, where the comparison of
+strings by order is always false
+
+1. https://www.python.org/dev/peps/pep-0508/
+
+License
+-------
+MIT License
+Copyright (c) 2016 Genome Research Limited
+"""
+import os
+import platform
+import re
+import sys
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from ypip.sources.pep440.exceptions import ParseError as VersionParseError
+from ypip.sources.pep440.specifier import Specifier
+from ypip.sources.pep440.version import Version
+from ypip.sources.pep508.exceptions import ParseError
+
+# Maximum number of distinct marker strings to keep compiled
+COMPILE_CACHE_SIZE = 1024
+
+_EnvironmentT = Dict[str, str]
+_PredicateT = Callable[[_EnvironmentT], bool]
+
+_VARIABLES = { 'python_version', 'python_full_version', 'os_name', 'sys_platform',
+               'platform_release', 'platform_system', 'platform_version',
+               'platform_machine', 'platform_python_implementation',
+               'implementation_name', 'implementation_version', 'extra' }
+
+# Legacy (PEP345) variable names
+_ALIASES = { 'os.name': 'os_name', 'sys.platform': 'sys_platform',
+             'platform.version': 'platform_version',
+             'platform.machine': 'platform_machine',
+             'platform.python_implementation': 'platform_python_implementation',
+             'python_implementation': 'platform_python_implementation' }
+
+_VERSION_OPERATORS = { '===', '==', '!=', '<=', '>=', '~=', '<', '>' }
+
+_token = re.compile(r"""\s*(?:
+    (?P<string>'[^']*'|"[^"]*")
+  | (?P<operator>===|==|!=|<=|>=|~=|<|>|\(|\))
+  | (?P<word>[A-Za-z_][A-Za-z0-9_.]*)
+)""", re.VERBOSE)
+
+# Markers follow a semicolon, which must be preceded by whitespace after
+# a URL (as URLs may contain semicolons)
+_url_marker = re.compile(r'\s+;\s*')
+_marker = re.compile(r'\s*;\s*')
+
+
+def _format_version(info:Tuple) -> str:
+    """ Format sys.version_info-like tuples, per PEP508 """
+    version = '{0.major}.{0.minor}.{0.micro}'.format(info)
+    if info.releaselevel != 'final':
+        version += info.releaselevel[0] + str(info.serial)
+
+    return version
+
+@lru_cache(maxsize=None)
+def _environment() -> _EnvironmentT:
+    """ Marker environment of the running interpreter """
+    return {
+        'implementation_name': sys.implementation.name,
+        'implementation_version': _format_version(sys.implementation.version),
+        'os_name': os.name,
+        'platform_machine': platform.machine(),
+        'platform_release': platform.release(),
+        'platform_system': platform.system(),
+        'platform_version': platform.version(),
+        'python_full_version': platform.python_version(),
+        'platform_python_implementation': platform.python_implementation(),
+        'python_version': '.'.join(platform.python_version_tuple()[:2]),
+        'sys_platform': sys.platform,
+        'extra': ''
+    }
+
+def default_environment() -> _EnvironmentT:
+    """
+    Marker environment of the running interpreter
+
+    @return  Copy of the environment, with no extra
+    """
+    return dict(_environment())
+
+
+def _compare(operator:str, lhs:str, rhs:str, specifier:Optional[Specifier] = None) -> bool:
+    """ Compare values, by version where possible, otherwise by string """
+    if operator == 'in':
+        return lhs in rhs
+
+    if operator == 'not in':
+        return lhs not in rhs
+
+    if operator != '===':
+        try:
+            return (specifier or Specifier(operator + rhs))(Version(lhs))
+        except VersionParseError:
+            pass
+
+    if operator in ('==', '==='):
+        return lhs == rhs
+
+    if operator == '!=':
+        return lhs != rhs
+
+    return False
+
+
+def _either(lhs:_PredicateT, rhs:_PredicateT) -> _PredicateT:
+    return lambda environment: lhs(environment) or rhs(environment)
+
+def _both(lhs:_PredicateT, rhs:_PredicateT) -> _PredicateT:
+    return lambda environment: lhs(environment) and rhs(environment)
+
+
+class _Parser(object):
+    """ Recursive descent parser that compiles markers into predicates """
+    def __init__(self, marker:str):
+        self.marker = marker
+        self.tokens = []
+
+        position, marker = 0, marker.rstrip()
+        while position < len(marker):
+            match = _token.match(marker, position)
+            if not match:
+                raise ParseError('Could not parse marker "{}" at "{}"'.format(self.marker, marker[position:]))
+
+            self.tokens.append((match.lastgroup, match.group(match.lastgroup)))
+            position = match.end()
+
+        self.tokens.reverse()
+
+    def _error(self) -> ParseError:
+        found = self.tokens[-1][1] if self.tokens else 'end of marker'
+        return ParseError('Could not parse marker "{}" at "{}"'.format(self.marker, found))
+
+    def _accept(self, kind:str, value:str) -> bool:
+        if self.tokens and self.tokens[-1] == (kind, value):
+            self.tokens.pop()
+            return True
+
+        return False
+
+    def parse(self) -> _PredicateT:
+        predicate = self._or()
+        if self.tokens:
+            raise self._error()
+
+        return predicate
+
+    def _or(self) -> _PredicateT:
+        predicate = self._and()
+
+        while self._accept('word', 'or'):
+            predicate = _either(predicate, self._and())
+
+        return predicate
+
+    def _and(self) -> _PredicateT:
+        predicate = self._expression()
+
+        while self._accept('word', 'and'):
+            predicate = _both(predicate, self._expression())
+
+        return predicate
+
+    def _expression(self) -> _PredicateT:
+        if self._accept('operator', '('):
+            predicate = self._or()
+            if not self._accept('operator', ')'):
+                raise self._error()
+
+            return predicate
+
+        lhs, operator, rhs = self._value(), self._operator(), self._value()
+        lhs_variable, lhs_value = lhs
+        rhs_variable, rhs_value = rhs
+
+        # Comparing a variable with a literal version can be compiled
+        specifier = None
+        if not rhs_variable and operator in _VERSION_OPERATORS - {'==='}:
+            try:
+                specifier = Specifier(operator + rhs_value)
+            except VersionParseError:
+                pass
+
+        if lhs_variable and not rhs_variable:
+            return lambda environment: _compare(operator, environment[lhs_value], rhs_value, specifier)
+
+        if rhs_variable and not lhs_variable:
+            return lambda environment: _compare(operator, lhs_value, environment[rhs_value])
+
+        return lambda environment: _compare(operator,
+                                            environment[lhs_value] if lhs_variable else lhs_value,
+                                            environment[rhs_value] if rhs_variable else rhs_value,
+                                            specifier)
+
+    def _value(self) -> Tuple[bool, str]:
+        """ Variable name or string literal, flagged by whether a variable """
+        if not self.tokens:
+            raise self._error()
+
+        kind, value = self.tokens[-1]
+
+        if kind == 'string':
+            self.tokens.pop()
+            return False, value[1:-1]
+
+        if kind == 'word' and (value in _VARIABLES or value in _ALIASES):
+            self.tokens.pop()
+            return True, _ALIASES.get(value, value)
+
+        raise self._error()
+
+    def _operator(self) -> str:
+        if self.tokens and self.tokens[-1][0] == 'operator' and self.tokens[-1][1] in _VERSION_OPERATORS:
+            return self.tokens.pop()[1]
+
+        if self._accept('word', 'in'):
+            return 'in'
+
+        if self._accept('word', 'not') and self._accept('word', 'in'):
+            return 'not in'
+
+        raise self._error()
+
+
+@lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def _compile(marker:str) -> _PredicateT:
+    """ Compile a marker into a predicate over marker environments """
+    return _Parser(marker).parse()
+
+
+class Marker(object):
+    """ Environment marker """
+    def __init__(self, marker:str):
+        """
+        Construct Marker by compiling input string
+
+        @param  marker  Input string to compile
+        @note   Will raise ParseError if not compliant
+        """
+        self.marker = marker.strip()
+        self._predicate = _compile(self.marker)
+
+    def __str__(self):
+        return self.marker
+
+    def __repr__(self):
+        return '<Marker: {}>'.format(self.marker)
+
+    def __eq__(self, other:'Marker') -> bool:
+        return isinstance(other, Marker) and self.marker == other.marker
+
+    def __hash__(self) -> int:
+        return hash(self.marker)
+
+    def evaluate(self, environment:Optional[_EnvironmentT] = None, extras:Iterable[str] = ()) -> bool:
+        """
+        Evaluate the marker
+
+        @param   environment  Variables to override in the environment of
+                              the running interpreter
+        @param   extras       Extras that have been requested
+        @return  Whether the marker holds, with no extra or any one of
+                 the requested extras
+        """
+        environment = dict(_environment(), **environment) if environment else _environment()
+
+        if self._predicate(environment):
+            return True
+
+        return any(self._predicate(dict(environment, extra=extra)) for extra in extras)
+
+
+@lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def applies(marker:Optional[str]) -> bool:
+    """
+    Whether a marker holds in the environment of the running interpreter,
+    with no extras, decided once per distinct marker
+
+    @param   marker  Input string (or None, which always applies)
+    @return  Whether the marker holds
+    @note    Will raise ParseError if not compliant
+    """
+    return marker is None or Marker(marker).evaluate()
+
+
+def split_marker(requirement:str) -> Tuple[str, Optional[str]]:
+    """
+    Separate a requirement from its marker
+
+    @param   requirement  Requirement, possibly followed by a marker
+    @return  Requirement and its marker, if it has one
+    """
+    requirement, *marker = (_url_marker if '://' in requirement else _marker).split(requirement, 1)
+    return requirement.strip(), marker[0].strip() if marker else None
@@ -0,0 +1,131 @@
+"""
+PEP508 Requirement Object
+=========================
+Requirement objects created by parsing dependency specifications, per
+PEP508 [1], of the form:
+
+    name [extras] (version specifiers | @ URL) ; marker
+
+Version specifiers are checked for their form, but not parsed as PEP440
+specifiers, as versions of packages that predate PEP440 may be given
+
+1. https://www.python.org/dev/peps/pep-0508/
+
+License
+-------
+MIT License
+Copyright (c) 2016 Genome Research Limited
+"""
+import re
+from functools import lru_cache
+from typing import Optional
+from ypip.sources.pep508.exceptions import ParseError
+from ypip.sources.pep508.markers import Marker, split_marker
+
+# Maximum number of distinct requirement strings to keep parsed
+PARSE_CACHE_SIZE = 4096
+
+_NAME = r'[A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?'
+_CLAUSE = r'(?:===|==|!=|<=|>=|~=|<|>)\s*[A-Za-z0-9_.*+!-]+'
+
+_requirement = re.compile(r'^({})\s*(?:\[([^\]]*)\])?\s*(.*)$'.format(_NAME))
+_extra = re.compile(r'^{}$'.format(_NAME))
+_specifier = re.compile(r'^(?:{0}(?:\s*,\s*{0})*)?$'.format(_CLAUSE))
+_whitespace = re.compile(r'\s+')
+
+
+def normalise(name:str) -> str:
+    """
+    @param   name  Project name
+    @return  Normalised name, per PEP503
+    """
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+
+class Requirement(object):
+    """ Dependency specification """
+    def __init__(self, requirement:str):
+        """
+        Construct Requirement by parsing input string
+
+        @param  requirement  Input string to parse
+        @note   Will raise ParseError if not compliant
+        """
+        head, marker = split_marker(requirement)
+        parsed = _requirement.match(head)
+
+        if not parsed:
+            raise ParseError('Could not parse "{}" in accordance with PEP508'.format(requirement))
+
+        self.name, extras, rest = parsed.groups()
+        self.extras = ()
+        self.specifier = ''
+        self.url = None
+        self.marker = Marker(marker) if marker else None
+
+        if extras is not None:
+            self.extras = tuple(sorted({extra.strip() for extra in extras.split(',') if extra.strip()}))
+
+            if not all(map(_extra.match, self.extras)):
+                raise ParseError('Could not parse extras of "{}" in accordance with PEP508'.format(requirement))
+
+        if rest.startswith('@'):
+            self.url = rest[1:].strip()
+
+            if not self.url:
+                raise ParseError('Could not parse URL of "{}" in accordance with PEP508'.format(requirement))
+
+        else:
+            if rest.startswith('(') and rest.endswith(')'):
+                rest = rest[1:-1].strip()
+
+            if not _specifier.match(rest):
+                raise ParseError('Could not parse specifiers of "{}" in accordance with PEP508'.format(requirement))
+
+            self.specifier = _whitespace.sub('', rest)
+
+    def __str__(self):
+        output = self.name
+
+        if self.extras:
+            output += '[{}]'.format(','.join(self.extras))
+
+        if self.url:
+            output += ' @ {}'.format(self.url)
+            if self.marker:
+                output += ' '
+
+        output += self.specifier
+
+        if self.marker:
+            output += '; {}'.format(self.marker)
+
+        return output
+
+    def __repr__(self):
+        return '<Requirement: {}>'.format(self)
+
+    def __eq__(self, other:'Requirement') -> bool:
+        return isinstance(other, Requirement) and str(self) == str(other)
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    @property
+    def key(self) -> str:
+        """ Normalised project name """
+        return normalise(self.name)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse(requirement:str) -> Optional[Requirement]:
+    """
+    Parse a requirement, once per distinct string
+
+    @param   requirement  Input string to parse
+    @return  Requirement, or None if not compliant
+    """
+    try:
+        return Requirement(requirement)
+    except ParseError:
+        return None
@@ -1,23 +1,28 @@
 # MIT License
 # Copyright (c) 2016 Genome Research Limited
-import re
+from functools import lru_cache, reduce
 from typing import List, Optional
-from typing.re import Match
 
 from ypip.sources._source import Source
+from ypip.sources.pep440.exceptions import ParseError
+from ypip.sources.pep440.specifier import Specifier
+from ypip.sources.pep508.requirement import Requirement, parse
+
+# Specifiers are immutable, so parse each distinct string only once
+_specifier = lru_cache(maxsize=1024)(Specifier)
 
-class PipFallback(Source):
-    def __init__(self):
-        # FIXME You can have multiple version specifiers
-        # FIXME foo[bar, quux] is a valid specifier
-        # See PEP 440
-        self._pkg_pattern = re.compile('^(\w+)((?:\s*)([~=!<>]=|[<>]|===)(?:\s*)(.+))?$')
 
-    def _get_match(self, pkg:str) -> Optional[Match]:
-        return self._pkg_pattern.match(pkg)
+class PipFallback(Source):
+    '''
+    Any PEP 508 requirement (other than by URL), whose own requirements
+    are left to pip
+    '''
+    def _parse(self, pkg:str) -> Optional[Requirement]:
+        requirement = parse(pkg)
+        return requirement if requirement and not requirement.url else None
 
     def is_package_from_source(self, pkg:str) -> bool:
-        return True if self._get_match(pkg) else False
+        return True if self._parse(pkg) else False
 
     def get_requirements(self, pkg:str) -> List[str]:
         output = []
@@ -27,15 +32,81 @@ class PipFallback(Source):
         return output
 
     def identify(self, pkg:str) -> Optional[str]:
-        match = self._get_match(pkg)
+        requirement = self._parse(pkg)
 
-        if match:
-            return match.group(1)
+        if requirement:
+            return requirement.key
 
         else:
             return None
 
     def version_conflict(self, pkg1:str, pkg2:str) -> Optional[bool]:
-        # TODO group(3) is the operator; group(4) is the version
-        # Can I co-opt pip to do this for me?...
-        return False
+        requirement1 = self._parse(pkg1)
+        requirement2 = self._parse(pkg2)
+
+        if requirement1 and requirement2:
+            spec1 = requirement1.specifier
+            spec2 = requirement2.specifier
+
+            if not (spec1 and spec2):
+                # Unconstrained packages can't conflict
+                return False
+
+            try:
+                return _specifier(spec1).isdisjoint(_specifier(spec2))
+            except ParseError:
+                return None
+
+        else:
+            return None
+
+    def is_satisfied_by(self, pkg:str, candidate:str) -> bool:
+        # The candidate is a merged requirement, rather than a specific
+        # version, so it must be at least as strict as the requirement
+        # (and include its extras)
+        requirement = self._parse(pkg)
+        candidate_requirement = self._parse(candidate)
+
+        if requirement and candidate_requirement:
+            spec = requirement.specifier
+            candidate_spec = candidate_requirement.specifier
+
+            if not set(requirement.extras) <= set(candidate_requirement.extras):
+                return False
+
+            if not spec:
+                return True
+
+            if not candidate_spec:
+                return False
+
+            try:
+                return _specifier(candidate_spec).issubset(_specifier(spec))
+            except ParseError:
+                return requirement.specifier == candidate_requirement.specifier
+
+        else:
+            return False
+
+    def candidates(self, pkgs:List[str]) -> List[str]:
+        requirements = [self._parse(pkg) for pkg in pkgs]
+
+        if not requirements or not all(requirements):
+            return []
+
+        name = requirements[0].name
+        extras = sorted({extra for requirement in requirements for extra in requirement.extras})
+        specs = [requirement.specifier for requirement in requirements if requirement.specifier]
+
+        if extras:
+            name += '[{}]'.format(','.join(extras))
+
+        if not specs:
+            return [name]
+
+        try:
+            merged = reduce(lambda lhs, rhs: lhs & rhs, map(_specifier, specs))
+        except ParseError:
+            return []
+
+        return [] if merged.is_empty() else ['{}{}'.format(name, merged)]
@@ -0,0 +1,307 @@
+# MIT License
+# Copyright (c) 2016 Genome Research Limited
+import json
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+from warnings import warn
+
+from ypip import instrumentation
+from ypip.sources._source import Source
+from ypip.sources.http import HTTPClient, HTTPError, get_client
+from ypip.sources.pep440.exceptions import ParseError
+from ypip.sources.pep440.specifier import Specifier
+from ypip.sources.pep440.version import Version
+from ypip.sources.pep508.requirement import Requirement, normalise, parse as parse_requirement
+from ypip.sources.wheel import requires_dist, wheel_metadata
+
+# Specifiers are immutable, so parse each distinct string only once
+_specifier = lru_cache(maxsize=1024)(Specifier)
+
+
+def _format(name:str, extras:Iterable[str], specifier:str = '') -> str:
+    # Package string, with its extras (if any)
+    extras = sorted(extras)
+    return '{}{}{}'.format(name, '[{}]'.format(','.join(extras)) if extras else '', specifier)
+
+
+class PyPI(Source):
+    '''
+    Packages from a PyPI-compatible index, through its JSON API: the
+    versions that satisfy a package's specifiers are enumerated from its
+    releases and the requirements of each are taken from its metadata
+    '''
+    def __init__(self, index_url:str = 'https://pypi.org/pypi', timeout:float = 30, client:Optional[HTTPClient] = None, max_workers:int = 8):
+        '''
+        @param  index_url    Root URL of the index's JSON API
+        @param  timeout      Timeout, in seconds, for each fetch
+        @param  client       HTTP client; defaults to the shared client
+        @param  max_workers  Maximum number of concurrent prefetches
+        '''
+        self._index_url = index_url.rstrip('/')
+        self._timeout = timeout
+        self._client = client
+        self._max_workers = max(1, max_workers)
+
+        self._releases = {}
+        self._requires = {}
+        self._lock = threading.Lock()
+
+    def _get_match(self, pkg:str) -> Optional[Requirement]:
+        # Named requirements, per PEP508, without URLs or markers
+        requirement = parse_requirement(pkg)
+
+        if requirement is None or requirement.url or requirement.marker:
+            return None
+
+        return requirement
+
+    def is_package_from_source(self, pkg:str) -> bool:
+        return True if self._get_match(pkg) else False
+
+    def _get_json(self, *path:str) -> Optional[Dict]:
+        url = '/'.join((self._index_url,) + path + ('json',))
+
+        try:
+            response = (self._client or get_client()).get(url, {'Accept': 'application/json'}, timeout=self._timeout)
+        except HTTPError as exception:
+            if exception.status == 404:
+                return None
+
+            raise exception
+
+        return json.loads(response.body.decode('utf-8'))
+
+    def releases(self, name:str) -> Dict[Version, List[Dict]]:
+        '''
+        @param   name  Project name
+        @return  Release versions mapped to their files, excluding those
+                 that are yanked or can't be parsed (empty if the project
+                 is not on the index)
+        '''
+        name = normalise(name)
+
+        with self._lock:
+            if name in self._releases:
+                return self._releases[name]
+
+        with instrumentation.span('pypi.releases', package=name):
+            project = self._get_json(name)
+
+        releases = {}
+
+        for version, files in (project or {}).get('releases', {}).items():
+            files = [file for file in files if not file.get('yanked')]
+            if not files:
+                continue
+
+            try:
+                releases[Version(version)] = files
+            except ParseError:
+                continue
+
+        with self._lock:
+            self._releases[name] = releases
+
+        return releases
+
+    def requires(self, name:str, version:Version, extras:Iterable[str] = ()) -> List[str]:
+        '''
+        @param   name     Project name
+        @param   version  Release version
+        @param   extras   Extras of the release that are requested
+        @return  Package strings of the release's requirements, whose
+                 markers (if any) hold here, with the requested extras
+        @note    Requirements that are given by URL are left to pip
+        '''
+        key = (normalise(name), str(version))
+
+        with self._lock:
+            requirements = self._requires.get(key)
+
+        if requirements is None:
+            with instrumentation.span('pypi.requires', package=key[0], version=key[1]):
+                release = self._get_json(*key)
+
+            entries = ((release or {}).get('info') or {}).get('requires_dist')
+
+            # Indices don't always know a release's requirements, in which
+            # case they're read from one of its wheels
+            if entries is None:
+                entries = self._wheel_requires(name, version)
+
+            requirements = [requirement for requirement in map(parse_requirement, entries)
+                            if requirement is not None and not requirement.url]
+
+            with self._lock:
+                self._requires[key] = requirements
+
+        extras = tuple(sorted(set(extras)))
+
+        return [_format(requirement.key, requirement.extras, requirement.specifier)
+                for requirement in requirements
+                if not requirement.marker or requirement.marker.evaluate(extras=extras)]
+
+    def _wheel_requires(self, name:str, version:Version) -> List[str]:
+        # Requires-Dist of one of the release's wheels, if it has any that
+        # can be read; otherwise, its requirements are left to pip
+        wheel = self._wheel(name, version)
+
+        if not wheel:
+            return []
+
+        try:
+            with instrumentation.span('pypi.wheel_metadata', package=normalise(name), version=str(version)):
+                return requires_dist(wheel_metadata(wheel['url'], self._client, self._timeout))
+
+        except zipfile.BadZipFile as exception:
+            warn('{} is not a valid wheel: {}'.format(wheel['url'], exception), Warning)
+
+        except HTTPError as exception:
+            if exception.status >= 500:
+                raise exception
+
+            warn('{} could not be downloaded: {}'.format(wheel['url'], exception), Warning)
+
+        return []
+
+    def _wheel(self, name:str, version:Version) -> Optional[Dict]:
+        wheels = [file for file in self.releases(name).get(version, [])
+                  if file.get('filename', '').endswith('.whl') and file.get('url')]
+
+        # Any wheel will do, but a universal one is the likeliest to have
+        # the same requirements as whatever pip installs
+        wheels.sort(key=lambda file: not file['filename'].endswith('-none-any.whl'))
+        return wheels[0] if wheels else None
+
+    def prefetch(self, pkgs:List[str]):
+        names = {match.key for match in map(self._get_match, pkgs) if match}
+
+        with self._lock:
+            names = [name for name in names if name not in self._releases]
+
+        if len(names) > 1:
+            with ThreadPoolExecutor(max_workers=min(self._max_workers, len(names))) as executor:
+                list(executor.map(self.releases, names))
+
+    def _pinned(self, pkg:str) -> Optional[Version]:
+        match = self._get_match(pkg)
+        spec = match.specifier if match else None
+
+        if spec and spec.startswith('==') and not spec.startswith('===') and '*' not in spec and ',' not in spec:
+            try:
+                return Version(spec[2:].strip())
+            except ParseError:
+                return None
+
+        return None
+
+    def get_requirements(self, pkg:str) -> List[str]:
+        output = []
+        match = self._get_match(pkg)
+
+        if match:
+            output.append(pkg)
+
+            version = self._pinned(pkg)
+            if version is None:
+                candidates = self.candidates([pkg])
+                version = self._pinned(candidates[0]) if candidates else None
+
+            if version is not None:
+                output += self.requires(match.name, version, match.extras)
+
+        return output
+
+    def identify(self, pkg:str) -> Optional[str]:
+        match = self._get_match(pkg)
+
+        if match:
+            return match.key
+
+        else:
+            return None
+
+    def version_conflict(self, pkg1:str, pkg2:str) -> Optional[bool]:
+        match1 = self._get_match(pkg1)
+        match2 = self._get_match(pkg2)
+
+        if match1 and match2:
+            spec1 = match1.specifier
+            spec2 = match2.specifier
+
+            if not (spec1 and spec2):
+                # Unconstrained packages can't conflict
+                return False
+
+            try:
+                return _specifier(spec1).isdisjoint(_specifier(spec2))
+            except ParseError:
+                return None
+
+        else:
+            return None
+
+    def is_satisfied_by(self, pkg:str, candidate:str) -> bool:
+        match = self._get_match(pkg)
+        candidate_match = self._get_match(candidate)
+
+        if match and candidate_match:
+            spec = match.specifier
+            candidate_spec = candidate_match.specifier
+
+            # The candidate must bring along every extra that is required
+            if not set(match.extras) <= set(candidate_match.extras):
+                return False
+
+            if not spec:
+                return True
+
+            if not candidate_spec:
+                return False
+
+            try:
+                return _specifier(candidate_spec).issubset(_specifier(spec))
+            except ParseError:
+                return pkg == candidate
+
+        else:
+            return False
+
+    def candidates(self, pkgs:List[str]) -> List[str]:
+        matches = [self._get_match(pkg) for pkg in pkgs]
+
+        if not matches or not all(matches):
+            return []
+
+        name = matches[0].key
+        extras = {extra for match in matches for extra in match.extras}
+        versions = list(self.releases(name))
+
+        try:
+            for match in matches:
+                if match.specifier:
+                    versions = _specifier(match.specifier).filter(versions)
+        except ParseError:
+            return []
+
+        # Pre-releases are only chosen when nothing else will do
+        finals = [version for version in versions if version.pre is None and version.dev is None]
+
+        return [_format(name, extras, '=={}'.format(version)) for version in reversed(finals or versions)]
+
+    def lock_metadata(self, pkg:str) -> Dict[str, object]:
+        match = self._get_match(pkg)
+        version = self._pinned(pkg)
+
+        if match and version is not None:
+            files = self.releases(match.name).get(version, [])
+            return {
+                'version': str(version),
+                'hashes': sorted('sha256:{}'.format(file['digests']['sha256']) for file in files if 'sha256' in file.get('digests', {}))
+            }
+
+        else:
+            return {}
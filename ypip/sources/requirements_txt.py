@@ -1,17 +1,230 @@
 # MIT License
 # Copyright (c) 2016 Genome Research Limited
+import os
 import os.path
-from typing import List, Optional
+import re
+import threading
+from collections import namedtuple
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+from warnings import warn
 
+from ypip import instrumentation
 from ypip.sources._source import Source
 
+
+class RequirementsFileError(Exception):
+    pass
+
+
+Requirement = namedtuple('Requirement', ['requirement', 'marker', 'constraint', 'path', 'line'])
+
+# Lines of a single file, before any includes are followed, where the
+# kind is one of the below and the value is either a requirement or the
+# path of an included file
+_Line = namedtuple('_Line', ['kind', 'value', 'marker', 'line'])
+_REQUIREMENT, _INCLUDE, _CONSTRAINT = 'requirement', 'include', 'constraint'
+
+_comment = re.compile(r'(^|\s+)#.*$')
+_include = re.compile(r'^(-r|--requirement|-c|--constraint)(?:\s*=\s*|\s+)(.+)$')
+_editable = re.compile(r'^(?:-e|--editable)(?:\s*=\s*|\s+)(.+)$')
+_options = re.compile(r'\s+--?[a-z]')
+
+
+def parse_lines(lines:Iterable[str]) -> Iterator[_Line]:
+    '''
+    Parse the lines of a requirements file, lazily, without following
+    any includes
+
+    @param   lines  Lines of the file
+    @return  Iterator of parsed lines (requirements and includes)
+    @note    Global options (e.g., --index-url) and per-requirement
+             options (e.g., --hash) are ignored
+    '''
+    # Markers are only parsed once a requirements file is read
+    from ypip.sources.pep508.markers import split_marker
+
+    logical = ''
+    start = 0
+
+    for number, line in enumerate(lines, 1):
+        line = line.rstrip('\r\n')
+        if not logical:
+            start = number
+
+        # Comments are stripped before continuations are joined, per pip
+        line = _comment.sub('', line)
+        if line.endswith('\\'):
+            logical += line[:-1]
+            continue
+
+        logical, line = '', (logical + line).strip()
+        if not line:
+            continue
+
+        include = _include.match(line)
+        if include:
+            flag, path = include.groups()
+            yield _Line(_CONSTRAINT if flag in ('-c', '--constraint') else _INCLUDE, path.strip(), None, start)
+            continue
+
+        editable = _editable.match(line)
+        if editable:
+            requirement, marker = editable.group(1).strip(), None
+            requirement = '-e {}'.format(_options.split(requirement, 1)[0])
+
+        elif line.startswith('-'):
+            continue
+
+        else:
+            requirement, marker = split_marker(_options.split(line, 1)[0])
+
+        yield _Line(_REQUIREMENT, requirement, marker, start)
+
+
+_parsed = {}
+_parsed_lock = threading.Lock()
+
+def _parse_file(path:str) -> Iterator[_Line]:
+    '''
+    Parse a single file, memoised by its modification time and size
+    '''
+    try:
+        status = os.stat(path)
+    except OSError as exception:
+        raise RequirementsFileError('Cannot read {}: {}'.format(path, exception))
+
+    key = os.path.realpath(path)
+    stamp = (status.st_mtime_ns, status.st_size)
+
+    with _parsed_lock:
+        cached = _parsed.get(key)
+
+    if cached and cached[0] == stamp:
+        instrumentation.count('requirements.memo_hits')
+        yield from cached[1]
+        return
+
+    instrumentation.count('requirements.files_parsed')
+
+    parsed = []
+
+    with open(path) as handle:
+        for line in parse_lines(handle):
+            parsed.append(line)
+            yield line
+
+    # Only fully consumed files are memoised
+    with _parsed_lock:
+        _parsed[key] = stamp, tuple(parsed)
+
+
+def parse(path:str, constraint:bool = False) -> Iterator[Requirement]:
+    '''
+    Parse a requirements file, lazily, following its -r (requirement) and
+    -c (constraint) includes; each file is followed at most once
+
+    @param   path        Requirements file
+    @param   constraint  Whether the file is a constraints file
+    @return  Iterator of requirements
+    @note    Will raise RequirementsFileError if an include can't be read
+    '''
+    yield from _parse(path, constraint, set())
+
+def _parse(path:str, constraint:bool, seen:Set[Tuple[str, bool]]) -> Iterator[Requirement]:
+    key = (os.path.realpath(path), constraint)
+    if key in seen:
+        return
+
+    seen.add(key)
+
+    for line in _parse_file(path):
+        if line.kind == _REQUIREMENT:
+            yield Requirement(line.value, line.marker, constraint, path, line.line)
+
+        else:
+            # Includes are relative to the including file, unless absolute
+            included = os.path.join(os.path.dirname(path), line.value)
+            yield from _parse(included, constraint or line.kind == _CONSTRAINT, seen)
+
+
+def _applicable(path:str, constraint:bool) -> Iterator[Requirement]:
+    # Requirements whose markers don't hold here are never crawled
+    from ypip.sources.pep508.exceptions import ParseError
+    from ypip.sources.pep508.markers import applies
+
+    for record in parse(path):
+        if record.constraint != constraint:
+            continue
+
+        try:
+            if applies(record.marker):
+                yield record
+
+        except ParseError as exception:
+            raise RequirementsFileError('{}:{}: {}'.format(record.path, record.line, exception))
+
+
+def remote_requirements(content:str, origin:str) -> List[str]:
+    '''
+    Parse the contents of a requirements file fetched from elsewhere (e.g.,
+    a git repository), per the same grammar as local files
+
+    @param   content  Contents of the file
+    @param   origin   Where the file was fetched from, for warnings
+    @return  Requirements, with their markers (if any)
+    @note    Includes (-r and -c) are skipped, with a warning, as they
+             would each have to be fetched too; and the constraints of
+             a dependency don't apply to what depends on it
+    '''
+    output = []
+
+    for line in parse_lines(content.splitlines()):
+        if line.kind != _REQUIREMENT:
+            warn('{}:{}: includes are not followed in remote requirements files'.format(origin, line.line), Warning)
+            continue
+
+        output.append('{} ; {}'.format(line.value, line.marker) if line.marker else line.value)
+
+    return output
+
+
+def files(path:str) -> List[str]:
+    '''
+    @param   path  Requirements file
+    @return  The file and every file it (transitively) includes
+    '''
+    output = [path]
+    seen = {os.path.realpath(path)}
+    pending = [path]
+
+    while pending:
+        current = pending.pop(0)
+
+        for line in _parse_file(current):
+            if line.kind != _REQUIREMENT:
+                included = os.path.join(os.path.dirname(current), line.value)
+
+                if os.path.realpath(included) not in seen:
+                    seen.add(os.path.realpath(included))
+                    output.append(included)
+                    pending.append(included)
+
+    return output
+
+
 class RequirementsTxt(Source):
     def is_package_from_source(self, pkg:str = 'requirements.txt') -> bool:
        return os.path.isfile(pkg)
 
     def get_requirements(self, pkg:str = 'requirements.txt') -> List[str]:
         if self.is_package_from_source(pkg):
-            return open(pkg).read().splitlines()
+            return [record.requirement for record in _applicable(pkg, False)]
+        else:
+            return []
+
+    def constraints(self, pkg:str = 'requirements.txt') -> List[str]:
+        if self.is_package_from_source(pkg):
+            return [record.requirement for record in _applicable(pkg, True)]
         else:
             return []
 
@@ -0,0 +1,159 @@
+# MIT License
+# Copyright (c) 2016 Genome Research Limited
+import io
+import re
+import zipfile
+from email.parser import BytesParser
+from typing import List, Optional, Tuple
+
+from ypip import instrumentation
+from ypip.sources.http import HTTPClient, HTTPError, get_client
+
+# Bytes read from the end of a wheel up front, which will usually cover
+# its whole central directory; and the least that's read thereafter
+TAIL_SIZE = 64 * 1024
+CHUNK_SIZE = 16 * 1024
+
+_content_range = re.compile(r'^bytes\s+(\d+)-(\d+)/(\d+)$')
+_metadata = re.compile(r'^[^/]+\.dist-info/METADATA$')
+
+
+class _RangeReader(io.RawIOBase):
+    '''
+    Seekable, read-only view of a remote file that fetches only the byte
+    ranges that are read, with HTTP Range requests
+    '''
+    def __init__(self, client:HTTPClient, url:str, length:int, timeout:Optional[float] = None):
+        self._client = client
+        self._url = url
+        self._length = length
+        self._timeout = timeout
+        self._position = 0
+        self._blocks = []
+
+        self.requests = 0
+        self.fetched = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset:int, whence:int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: self._length}[whence]
+        self._position = max(0, base + offset)
+        return self._position
+
+    def add(self, start:int, data:bytes):
+        ''' Cache a block of the file's contents '''
+        self._blocks.append((start, data))
+
+    def _fetch(self, start:int, end:int) -> Tuple[int, bytes]:
+        end = min(self._length, max(end, start + CHUNK_SIZE))
+        headers = {'Range': 'bytes={}-{}'.format(start, end - 1), 'Accept-Encoding': 'identity'}
+        response = self._client.get(self._url, headers, timeout=self._timeout)
+
+        if response.status != 206:
+            raise IOError('{} does not support range requests'.format(self._url))
+
+        self.requests += 1
+        self.fetched += len(response.body)
+        instrumentation.count('wheel.range_requests')
+
+        self.add(start, response.body)
+        return start, response.body
+
+    def read(self, size:int = -1) -> bytes:
+        start = self._position
+        end = self._length if size is None or size < 0 else min(self._length, start + size)
+
+        if start >= end:
+            return b''
+
+        for block_start, data in self._blocks:
+            if block_start <= start and end <= block_start + len(data):
+                break
+
+        else:
+            block_start, data = self._fetch(start, end)
+
+        self._position = end
+        return data[start - block_start:end - block_start]
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def _read_metadata(wheel:zipfile.ZipFile) -> bytes:
+    names = [name for name in wheel.namelist() if _metadata.match(name)]
+
+    if len(names) != 1:
+        raise zipfile.BadZipFile('Wheel does not have exactly one dist-info directory')
+
+    return wheel.read(names[0])
+
+
+def wheel_metadata(url:str, client:Optional[HTTPClient] = None, timeout:Optional[float] = None) -> bytes:
+    '''
+    Read the METADATA of a remote wheel, fetching only the end of the
+    archive (where the central directory lies) and the METADATA member,
+    falling back to downloading the whole wheel if the server doesn't
+    support range requests
+
+    @param   url      Wheel URL
+    @param   client   HTTP client; defaults to the shared client
+    @param   timeout  Timeout, in seconds, for each request
+    @return  Contents of the wheel's METADATA file
+    @note    Will raise BadZipFile if the wheel isn't a wheel, or
+             HTTPError if it can't be downloaded
+    '''
+    client = client or get_client()
+
+    try:
+        response = client.get(url, {'Range': 'bytes=-{}'.format(TAIL_SIZE), 'Accept-Encoding': 'identity'}, timeout=timeout)
+    except HTTPError as exception:
+        # e.g., 416, for servers that don't support suffix ranges
+        if exception.status >= 500:
+            raise exception
+
+        response = None
+
+    if response is not None and response.status == 206:
+        content_range = _content_range.match(response.headers.get('Content-Range', ''))
+
+        if content_range:
+            start, _, length = map(int, content_range.groups())
+            reader = _RangeReader(client, url, length, timeout)
+            reader.add(start, response.body)
+
+            try:
+                with zipfile.ZipFile(reader) as wheel:
+                    return _read_metadata(wheel)
+
+            except (IOError, zipfile.BadZipFile):
+                pass
+
+    elif response is not None and response.status == 200:
+        # The range was ignored, so this is the whole wheel
+        with zipfile.ZipFile(io.BytesIO(response.body)) as wheel:
+            return _read_metadata(wheel)
+
+    instrumentation.count('wheel.full_downloads')
+
+    with zipfile.ZipFile(io.BytesIO(client.get(url, timeout=timeout).body)) as wheel:
+        return _read_metadata(wheel)
+
+
+def requires_dist(metadata:bytes) -> List[str]:
+    '''
+    @param   metadata  Contents of a METADATA (or PKG-INFO) file
+    @return  Its Requires-Dist entries
+    '''
+    message = BytesParser().parsebytes(metadata, headersonly=True)
+    return message.get_all('Requires-Dist') or []
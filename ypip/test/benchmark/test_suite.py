@@ -0,0 +1,52 @@
+import json
+import unittest
+
+from ypip.benchmark import compare, run, universe
+from ypip.benchmark.universe import UniverseSource
+from ypip.resolver import Crawler, Resolver
+
+
+class TestUniverses(unittest.TestCase):
+    def resolve(self, packages):
+        graph = Resolver(Crawler([UniverseSource(packages)], max_workers=1)).resolve('root')
+        return {node.identity: node.payload for node in graph}
+
+    def test_wide(self):
+        pins = self.resolve(universe.wide(5, versions=2))
+        self.assertEqual(len(pins), 6)
+        self.assertEqual(pins['p4'], 'p4==2.0')
+
+    def test_deep(self):
+        pins = self.resolve(universe.deep(5, versions=3))
+        self.assertEqual(pins['p4'], 'p4==3.0')
+
+    def test_diamond(self):
+        self.assertEqual(universe.diamond(3, 4, seed=1), universe.diamond(3, 4, seed=1))
+        self.assertIn('p0', self.resolve(universe.diamond(3, 4)))
+
+    def test_conflicting(self):
+        packages = universe.conflicting(8, versions=5)
+        pins = self.resolve(packages)
+        source = UniverseSource(packages)
+
+        # Every requirement of every pin is satisfied
+        for pin in pins.values():
+            for requirement in source.get_requirements(pin)[1:]:
+                self.assertFalse(source.version_conflict(requirement, pins[source.identify(requirement)]))
+
+
+class TestSuite(unittest.TestCase):
+    def test_run(self):
+        results = run(['version_sort', 'resolve_deep'], scale=0.01, repeat=1)
+        results = json.loads(json.dumps(results))
+
+        self.assertEqual(list(results['results']), ['version_sort', 'resolve_deep'])
+        self.assertEqual(results['results']['resolve_deep']['ops'], 6)
+        self.assertGreater(results['results']['version_sort']['seconds'], 0)
+
+        ratios = compare(results, results)
+        self.assertEqual(ratios, {'version_sort': 1.0, 'resolve_deep': 1.0})
+
+
+if __name__ == '__main__':
+    unittest.main()
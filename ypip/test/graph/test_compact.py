@@ -0,0 +1,79 @@
+import random
+import unittest
+
+from ypip.graph import DirectedGraph, FrozenGraph, GraphFrozen, NodeDoesNotExist, CycleDetected
+
+
+class TestFrozenGraph(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+        self.graph = DirectedGraph()
+
+        for i in range(200):
+            self.graph.add_node('n{}'.format(i), i)
+
+        # Acyclic, as links only go to later nodes
+        for i in range(200):
+            for j in random.sample(range(i + 1, 200), min(3, 199 - i)):
+                self.graph.get_node('n{}'.format(i)).link_to('n{}'.format(j))
+
+        self.frozen = self.graph.freeze()
+
+    def test_nodes(self):
+        self.assertIsInstance(self.frozen, FrozenGraph)
+        self.assertEqual(len(self.frozen), 200)
+        self.assertIn('n0', self.frozen)
+        self.assertNotIn('z', self.frozen)
+        self.assertEqual([node.identity for node in self.frozen], [node.identity for node in self.graph])
+        self.assertEqual(self.frozen.get_node('n42').payload, 42)
+
+        node = self.frozen.get_node('n42')
+        node.payload = 'foo'
+        self.assertEqual(self.frozen.get_node('n42').payload, 'foo')
+
+        with self.assertRaises(NodeDoesNotExist):
+            _ = self.frozen.get_node('z')
+
+    def test_immutable(self):
+        with self.assertRaises(GraphFrozen):
+            _ = self.frozen.add_node('z')
+
+        with self.assertRaises(GraphFrozen):
+            self.frozen.get_node('n0').link_to('n1')
+
+    def test_parity(self):
+        for node in self.graph:
+            frozen_node = self.frozen.get_node(node.identity)
+            self.assertEqual(frozen_node.links, node.links)
+            self.assertEqual(frozen_node.dependents, node.dependents)
+
+        for identity in ['n0', 'n100', 'n199']:
+            self.assertEqual(self.frozen.reachable(identity), self.graph.reachable(identity))
+            self.assertEqual(self.frozen.reachable(identity, reverse=True), self.graph.reachable(identity, reverse=True))
+
+    def test_topological_sort(self):
+        order = self.frozen.topological_sort()
+        position = {identity: index for index, identity in enumerate(order)}
+
+        self.assertEqual(len(order), 200)
+        for node in self.frozen:
+            for linked in node.links:
+                self.assertLess(position[node.identity], position[linked])
+
+    def test_cycle(self):
+        self.assertIsNone(self.frozen.find_cycle())
+
+        self.graph.get_node('n199').link_to('n0')
+        frozen = self.graph.freeze()
+        cycle = frozen.find_cycle()
+
+        self.assertEqual(cycle[0], cycle[-1])
+        for identity, linked in zip(cycle, cycle[1:]):
+            self.assertIn(linked, frozen.links(identity))
+
+        with self.assertRaises(CycleDetected):
+            _ = frozen.topological_sort()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+
+from ypip.graph import DirectedGraph, NodeExists, NodeDoesNotExist, CycleDetected
+
+
+class TestDirectedGraph(unittest.TestCase):
+    def setUp(self):
+        # a -> b -> d
+        # a -> c -> d -> e
+        self.graph = DirectedGraph()
+        for identity in 'abcde':
+            self.graph.add_node(identity, identity.upper())
+
+        self.graph.get_node('a').link_to('b', self.graph.get_node('c'))
+        self.graph.get_node('b').link_to('d')
+        self.graph.get_node('c').link_to('d')
+        self.graph.get_node('d').link_to('e')
+
+    def test_nodes(self):
+        self.assertEqual(len(self.graph), 5)
+        self.assertIn('a', self.graph)
+        self.assertNotIn('z', self.graph)
+        self.assertEqual(sorted(node.payload for node in self.graph), list('ABCDE'))
+
+        with self.assertRaises(NodeExists):
+            _ = self.graph.add_node('a')
+
+        with self.assertRaises(NodeDoesNotExist):
+            _ = self.graph.get_node('z')
+
+        with self.assertRaises(NodeDoesNotExist):
+            self.graph.get_node('a').link_to('z')
+
+    def test_links(self):
+        self.assertEqual(self.graph.get_node('a').links, {'b', 'c'})
+        self.assertEqual(self.graph.links('e'), set())
+        self.assertEqual(self.graph.get_node('d').dependents, {'b', 'c'})
+        self.assertEqual(self.graph.dependents('a'), set())
+
+    def test_reachable(self):
+        self.assertEqual(self.graph.reachable('b'), {'b', 'd', 'e'})
+        self.assertEqual(self.graph.reachable('b', 'c'), {'b', 'c', 'd', 'e'})
+        self.assertEqual(self.graph.reachable('d', reverse=True), {'a', 'b', 'c', 'd'})
+
+        with self.assertRaises(NodeDoesNotExist):
+            _ = self.graph.reachable('z')
+
+    def test_topological_sort(self):
+        order = self.graph.topological_sort()
+
+        self.assertEqual(sorted(order), list('abcde'))
+        for node in self.graph:
+            for linked in node.links:
+                self.assertLess(order.index(node.identity), order.index(linked))
+
+    def test_cycle(self):
+        self.assertIsNone(self.graph.find_cycle())
+
+        self.graph.get_node('e').link_to('b')
+        cycle = self.graph.find_cycle()
+
+        self.assertEqual(cycle[0], cycle[-1])
+        self.assertEqual(set(cycle), {'b', 'd', 'e'})
+        for identity, linked in zip(cycle, cycle[1:]):
+            self.assertIn(linked, self.graph.links(identity))
+
+        with self.assertRaises(CycleDetected) as context:
+            _ = self.graph.topological_sort()
+
+        self.assertEqual(set(context.exception.cycle), {'b', 'd', 'e'})
+
+    def test_self_cycle(self):
+        self.graph.get_node('e').link_to('e')
+        self.assertEqual(self.graph.find_cycle(), ['e', 'e'])
+
+    def test_deep(self):
+        # Deeper than the recursion limit
+        graph = DirectedGraph()
+        depth = 20000
+
+        previous = graph.add_node(0)
+        for i in range(1, depth):
+            node = graph.add_node(i)
+            previous.link_to(node)
+            previous = node
+
+        self.assertEqual(graph.topological_sort(), list(range(depth)))
+        self.assertEqual(len(graph.reachable(0)), depth)
+        self.assertIsNone(graph.find_cycle())
+
+        previous.link_to(0)
+        self.assertEqual(len(graph.find_cycle()), depth + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import subprocess
+import sys
+import unittest
+
+import ypip.install as install
+
+
+class TestLazyExports(unittest.TestCase):
+    def test_exports(self):
+        for name in install.__all__:
+            self.assertIn(name, dir(install))
+            self.assertEqual(getattr(install, name).__name__, name)
+
+        with self.assertRaises(AttributeError):
+            install.NoSuchThing
+
+    def test_deferred(self):
+        # In a fresh interpreter, as this one has imported everything
+        check = '; '.join([
+            'import sys',
+            'from ypip.install import InstallPlan',
+            'import ypip.resolver',
+            'assert "ypip.install.wheelhouse" not in sys.modules',
+            'assert "ypip.install.installed" not in sys.modules',
+            'assert "ypip.sources.pep508.markers" not in sys.modules',
+            'from ypip.install import Wheelhouse',
+            'assert "ypip.install.wheelhouse" in sys.modules'
+        ])
+
+        self.assertEqual(subprocess.call([sys.executable, '-c', check]), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
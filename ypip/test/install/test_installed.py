@@ -0,0 +1,101 @@
+import os
+import os.path
+import unittest
+from tempfile import TemporaryDirectory
+
+from ypip.graph import DirectedGraph
+from ypip.install.installed import InstalledIndex
+from ypip.sources.pep440.version import Version
+
+
+class TestInstalledIndex(unittest.TestCase):
+    def setUp(self):
+        self._tmp = TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+
+        self.site = self.directory('site-packages')
+        self.user_site = self.directory('user-site-packages')
+        self.cache_path = os.path.join(self._tmp.name, 'cache', 'installed.json')
+
+        self.install(self.site, 'Foo_Bar-1.2.dist-info')
+        self.install(self.site, 'baz-2.0.dist-info')
+        self.install(self.site, 'legacy.dist-info', 'Name: legacy\nVersion: 1.0-legacy\n')
+        self.install(self.site, 'weird.dist-info', 'Name: Weird.Name\nVersion: 3.1\n\nDescription\n')
+        self.install(self.site, 'ignored.egg-info')
+        self.install(self.user_site, 'baz-1.0.dist-info')
+
+    def directory(self, name:str) -> str:
+        path = os.path.join(self._tmp.name, name)
+        os.mkdir(path)
+        return path
+
+    def install(self, site:str, name:str, metadata:str = ''):
+        os.mkdir(os.path.join(site, name))
+
+        if metadata:
+            with open(os.path.join(site, name, 'METADATA'), 'w') as handle:
+                handle.write(metadata)
+
+    def index(self) -> InstalledIndex:
+        return InstalledIndex([self.site, self.user_site, os.path.join(self._tmp.name, 'missing')], self.cache_path)
+
+    def test_index(self):
+        index = self.index()
+
+        self.assertEqual(len(index), 4)
+        self.assertEqual(index.get('foo-bar'), Version('1.2'))
+        self.assertEqual(index.get('Foo.Bar'), Version('1.2'))
+        self.assertEqual(index.get('weird-name'), Version('3.1'))
+        self.assertIn('legacy', index)
+        self.assertIsNone(index.get('legacy'))
+        self.assertNotIn('ignored', index)
+
+        # Earlier directories shadow later ones
+        self.assertEqual(index.get('baz'), Version('2.0'))
+
+    def test_is_satisfied(self):
+        index = self.index()
+
+        self.assertTrue(index.is_satisfied('foo_bar'))
+        self.assertTrue(index.is_satisfied('foo_bar>=1,<2'))
+        self.assertTrue(index.is_satisfied('baz==2.0'))
+        self.assertFalse(index.is_satisfied('baz>2'))
+        self.assertFalse(index.is_satisfied('quux'))
+        self.assertTrue(index.is_satisfied('legacy'))
+        self.assertFalse(index.is_satisfied('legacy==1.0'))
+
+        # Extras and URLs may need more than what is installed
+        self.assertFalse(index.is_satisfied('baz[extra]'))
+        self.assertFalse(index.is_satisfied('baz @ https://example.com/baz.whl'))
+        self.assertFalse(index.is_satisfied('-egit+https://example.com/baz.git@v1#egg=baz'))
+
+    def test_satisfied(self):
+        graph = DirectedGraph()
+        for identity, payload in [('requirements.txt', 'requirements.txt'), ('foo-bar', 'foo_bar==1.2'), ('baz', 'baz>2')]:
+            graph.add_node(identity, payload)
+
+        self.assertEqual(self.index().satisfied(graph), {'foo-bar'})
+
+    def test_cache(self):
+        self.assertEqual(len(self.index()), 4)
+        self.assertTrue(os.path.isfile(self.cache_path))
+
+        # Directories that haven't changed aren't scanned again
+        stat = os.stat(self.site)
+        self.install(self.site, 'quux-1.0.dist-info')
+        os.utime(self.site, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        self.assertNotIn('quux', self.index())
+
+        os.utime(self.site, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+        self.assertEqual(self.index().get('quux'), Version('1.0'))
+
+        # A corrupt cache is rebuilt
+        with open(self.cache_path, 'w') as handle:
+            handle.write('{')
+
+        self.assertEqual(len(self.index()), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
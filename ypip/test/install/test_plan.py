@@ -0,0 +1,56 @@
+import sys
+import unittest
+
+from ypip.graph import DirectedGraph
+from ypip.install.plan import InstallPlan
+
+
+class TestInstallPlan(unittest.TestCase):
+    def setUp(self):
+        # requirements.txt -> a -> b -> c
+        #                  -> d ------> c
+        self.graph = DirectedGraph()
+        for identity, payload in [('requirements.txt', 'requirements.txt'), ('a', 'a==1'), ('b', '-egit+https://example.com/b.git@v1#egg=b'), ('c', 'c>=2'), ('d', 'd')]:
+            self.graph.add_node(identity, payload)
+
+        self.graph.get_node('requirements.txt').link_to('a', 'd')
+        self.graph.get_node('a').link_to('b')
+        self.graph.get_node('b').link_to('c')
+        self.graph.get_node('d').link_to('c')
+
+    def test_layers(self):
+        plan = InstallPlan.from_graph(self.graph, exclude=['requirements.txt'])
+
+        self.assertEqual(plan.layers, [['c>=2'], ['-egit+https://example.com/b.git@v1#egg=b', 'd'], ['a==1']])
+        self.assertEqual(len(plan), 4)
+
+    def test_cycle(self):
+        self.graph.get_node('c').link_to('a')
+        plan = InstallPlan.from_graph(self.graph, exclude=['requirements.txt'])
+
+        self.assertEqual(plan.layers, [['a==1', '-egit+https://example.com/b.git@v1#egg=b', 'c>=2', 'd']])
+
+    def test_commands(self):
+        plan = InstallPlan.from_graph(self.graph, exclude=['requirements.txt'])
+        pip = [sys.executable, '-m', 'pip', 'install']
+
+        self.assertEqual(plan.commands(), [pip + ['c>=2', '-e', 'git+https://example.com/b.git@v1#egg=b', 'd', 'a==1']])
+        self.assertEqual(len(plan.commands(layered=True)), 3)
+        self.assertEqual(plan.commands(upgrade=True, layered=True)[0], pip + ['--upgrade', 'c>=2'])
+
+        self.assertEqual(InstallPlan([]).commands(), [])
+
+    def test_wheelhouse_commands(self):
+        plan = InstallPlan.from_graph(self.graph, exclude=['requirements.txt'])
+        pip = [sys.executable, '-m', 'pip', 'install', '--no-index', '--find-links', 'wheels']
+
+        # VCS packages are installed by name, from their built wheels
+        self.assertEqual(plan.commands(wheelhouse='wheels'), [pip + ['c>=2', 'b', 'd', 'a==1']])
+
+        # ...by the built wheel's name, where that isn't the egg's
+        names = {'-egit+https://example.com/b.git@v1#egg=b': 'b_lib'}
+        self.assertEqual(plan.commands(wheelhouse='wheels', names=names), [pip + ['c>=2', 'b_lib', 'd', 'a==1']])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import os.path
+import unittest
+from tempfile import TemporaryDirectory
+
+from ypip.install.wheel_cache import WheelCache
+
+_REPO = 'https://example.com/foo.git'
+_COMMIT = 'a' * 40
+
+
+class TestWheelCache(unittest.TestCase):
+    def setUp(self):
+        self._directory = TemporaryDirectory()
+        self.addCleanup(self._directory.cleanup)
+
+        self.root = os.path.join(self._directory.name, 'cache')
+        self.cache = WheelCache(self.root, max_size=2500, abi='cp3x', platform='linux')
+
+    def wheel(self, name:str, size:int = 1000) -> str:
+        path = os.path.join(self._directory.name, name)
+        with open(path, 'wb') as handle:
+            handle.write(b'x' * size)
+
+        return path
+
+    def test_put_get(self):
+        self.assertEqual(self.cache.get(_REPO, _COMMIT), [])
+
+        cached = self.cache.put(_REPO, _COMMIT, [self.wheel('foo-1.0-py3-none-any.whl')])
+        self.assertEqual([os.path.basename(wheel) for wheel in cached], ['foo-1.0-py3-none-any.whl'])
+        self.assertEqual(self.cache.get(_REPO, _COMMIT.upper()), cached)
+        self.assertTrue(cached[0].startswith(self.root))
+
+        # Keyed by repository, commit, ABI and platform
+        self.assertEqual(self.cache.get(_REPO, 'b' * 40), [])
+        self.assertEqual(self.cache.get('https://example.com/bar.git', _COMMIT), [])
+        self.assertEqual(WheelCache(self.root, abi='cp3y', platform='linux').get(_REPO, _COMMIT), [])
+        self.assertEqual(WheelCache(self.root, abi='cp3x', platform='win32').get(_REPO, _COMMIT), [])
+
+        # A second put of the same commit changes nothing
+        self.assertEqual(self.cache.put(_REPO, _COMMIT, [self.wheel('foo-1.0-py3-none-any.whl')]), cached)
+
+    def test_empty(self):
+        # Entries without wheels are never made, and are replaced if found
+        self.assertEqual(self.cache.put(_REPO, _COMMIT, []), [])
+        self.assertFalse(os.path.isdir(self.root))
+
+        entry = self.cache._entry(_REPO, _COMMIT)
+        os.makedirs(entry)
+        open(os.path.join(entry, 'key.json'), 'w').close()
+
+        cached = self.cache.put(_REPO, _COMMIT, [self.wheel('foo-1.0-py3-none-any.whl')])
+        self.assertEqual([os.path.basename(wheel) for wheel in cached], ['foo-1.0-py3-none-any.whl'])
+
+    def test_eviction(self):
+        for age, commit in enumerate(['a', 'b'], 1):
+            self.cache.put(_REPO, commit * 40, [self.wheel('{}-1.0-py3-none-any.whl'.format(commit))])
+            entry = os.path.dirname(self.cache.get(_REPO, commit * 40)[0])
+            os.utime(entry, (1000 * age, 1000 * age))
+
+        # Using "a" makes "b" the least recently used
+        self.cache.get(_REPO, 'a' * 40)
+        self.cache.put(_REPO, 'c' * 40, [self.wheel('c-1.0-py3-none-any.whl')])
+
+        self.assertTrue(self.cache.get(_REPO, 'a' * 40))
+        self.assertFalse(self.cache.get(_REPO, 'b' * 40))
+        self.assertTrue(self.cache.get(_REPO, 'c' * 40))
+        self.assertLessEqual(self.cache.size(), 2500)
+
+    def test_oversized(self):
+        # The newest entry is kept, even if it alone exceeds the bound
+        self.assertTrue(self.cache.put(_REPO, _COMMIT, [self.wheel('foo-1.0-py3-none-any.whl', 10000)]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+import json
+import os
+import os.path
+import subprocess
+import sys
+import unittest
+from tempfile import TemporaryDirectory
+
+from ypip.graph import DirectedGraph
+from ypip.install.wheel_cache import WheelCache
+from ypip.install.wheelhouse import Wheelhouse
+
+# Stands in for pip: logs when each build starts and ends, writes a
+# wheel named after the package (b's distribution is named b_lib), builds
+# nothing for any package named "none" and fails to build any named "bad";
+# the final pass, with dependencies, logs its arguments and writes the
+# wheel of a dependency that was never resolved
+_FAKE_PIP = '''
+import json, os, re, sys, time
+log, pkg = sys.argv[1], sys.argv[-1]
+wheel_dir = sys.argv[sys.argv.index('--wheel-dir') + 1]
+os.makedirs(wheel_dir, exist_ok=True)
+if '--no-deps' not in sys.argv:
+    with open(log, 'a') as handle:
+        handle.write(json.dumps(['fill', sys.argv[sys.argv.index('--find-links') + 2:], time.time()]) + '\\n')
+    open(os.path.join(wheel_dir, 'unresolved-1.0-py3-none-any.whl'), 'w').close()
+    sys.exit(0)
+with open(log, 'a') as handle:
+    handle.write(json.dumps(['start', pkg, time.time()]) + '\\n')
+time.sleep(0.2)
+with open(log, 'a') as handle:
+    handle.write(json.dumps(['end', pkg, time.time()]) + '\\n')
+name = re.split(r'[^\\w]', pkg.split('#egg=')[-1])[0]
+if name != 'none':
+    open(os.path.join(wheel_dir, {'b': 'b_lib'}.get(name, name) + '-1.0-py3-none-any.whl'), 'w').close()
+sys.exit(3 if pkg == 'bad' else 0)
+'''
+
+
+class TestWheelhouse(unittest.TestCase):
+    def setUp(self):
+        # requirements.txt -> a -> c
+        #                  -> b -> c
+        #                       -> d
+        self.graph = DirectedGraph()
+        for identity, payload in [('requirements.txt', 'requirements.txt'), ('a', 'a==1'), ('b', '-egit+https://example.com/b.git@v1#egg=b'), ('c', 'c'), ('d', 'd')]:
+            self.graph.add_node(identity, payload)
+
+        self.graph.get_node('requirements.txt').link_to('a', 'b')
+        self.graph.get_node('a').link_to('c')
+        self.graph.get_node('b').link_to('c', 'd')
+
+        self._directory = TemporaryDirectory()
+        self.addCleanup(self._directory.cleanup)
+
+        script = os.path.join(self._directory.name, 'pip.py')
+        with open(script, 'w') as handle:
+            handle.write(_FAKE_PIP)
+
+        self.log = os.path.join(self._directory.name, 'log')
+        self.pip = [sys.executable, script, self.log]
+        self.wheelhouse = Wheelhouse(os.path.join(self._directory.name, 'wheels'), pip=self.pip)
+
+    def events(self):
+        with open(self.log) as handle:
+            return [json.loads(line) for line in handle]
+
+    def test_commands(self):
+        commands = self.wheelhouse.commands(self.graph, exclude=['requirements.txt'])
+
+        self.assertEqual([command[-1] for command in commands[:-1]], ['c', 'd', 'a==1', 'git+https://example.com/b.git@v1#egg=b'])
+        self.assertEqual(commands[0][3:-1], ['wheel', '--no-deps', '--wheel-dir', self.wheelhouse.path, '--find-links', self.wheelhouse.path])
+        self.assertEqual(commands[-1][3:], ['wheel', '--wheel-dir', self.wheelhouse.path, '--find-links', self.wheelhouse.path,
+                                            'c', 'd', 'a==1', 'git+https://example.com/b.git@v1#egg=b'])
+
+    def test_build(self):
+        self.assertEqual(self.wheelhouse.build(self.graph, exclude=['requirements.txt'], jobs=4), 0)
+
+        events = self.events()
+        times = {(event, pkg): at for event, pkg, at in events if event != 'fill'}
+        self.assertEqual(len(times), 8)
+
+        # Leaves are built together; nothing starts before its dependencies end
+        self.assertLess(times['start', 'd'], times['end', 'c'])
+        self.assertGreaterEqual(times['start', 'a==1'], times['end', 'c'])
+        self.assertGreaterEqual(times['start', 'git+https://example.com/b.git@v1#egg=b'], max(times['end', 'c'], times['end', 'd']))
+
+        # Then one pass, with dependencies, fills in whatever the graph missed
+        self.assertEqual(events[-1][0], 'fill')
+        self.assertGreaterEqual(events[-1][2], max(times.values()))
+        self.assertIn('unresolved-1.0-py3-none-any.whl', os.listdir(self.wheelhouse.path))
+
+    def test_failure(self):
+        self.graph.get_node('c').payload = 'bad'
+
+        self.assertEqual(self.wheelhouse.build(self.graph, exclude=['requirements.txt']), 3)
+        self.assertEqual(sorted(pkg for event, pkg, _ in self.events() if event == 'start'), ['bad', 'd'])
+        self.assertNotIn('fill', [event for event, _, _ in self.events()])
+
+    def test_cycle(self):
+        self.graph.get_node('c').link_to('a')
+
+        self.assertEqual(self.wheelhouse.build(self.graph, exclude=['requirements.txt']), 0)
+        self.assertEqual(len(self.events()), 9)
+
+    def test_cache(self):
+        repo = os.path.join(self._directory.name, 'upstream')
+        subprocess.check_call(['git', 'init', '--quiet', repo])
+        subprocess.check_call(['git', '-C', repo, '-c', 'user.name=ypip', '-c', 'user.email=ypip@example.com',
+                               'commit', '--quiet', '--allow-empty', '-m', 'Commit'])
+        subprocess.check_call(['git', '-C', repo, 'tag', 'v1'])
+        commit = subprocess.check_output(['git', '-C', repo, 'rev-parse', 'HEAD']).decode().strip()
+
+        url = 'file://{}'.format(repo)
+        self.graph.get_node('b').payload = '-e git+{}@v1#egg=b'.format(url)
+
+        cache = WheelCache(os.path.join(self._directory.name, 'cache'))
+        wheelhouse = Wheelhouse(self.wheelhouse.path, self.pip, cache=cache)
+
+        self.assertEqual(wheelhouse.build(self.graph, exclude=['requirements.txt']), 0)
+        self.assertIn('git+{}@{}#egg=b'.format(url, commit), [pkg for _, pkg, _ in self.events()])
+        self.assertTrue(cache.get(url, commit))
+        self.assertIn('b_lib-1.0-py3-none-any.whl', os.listdir(wheelhouse.path))
+
+        # The VCS package is installed by its wheel's name, and filled in from that wheel
+        self.assertEqual(wheelhouse.names, {'-e git+{}@v1#egg=b'.format(url): 'b_lib'})
+        self.assertEqual(sorted(self.events()[-1][1]), sorted(['a==1', 'c', 'd', os.path.join(wheelhouse.path, 'b_lib-1.0-py3-none-any.whl')]))
+
+        # Rebuilding the commit, into a fresh wheelhouse, uses the cache
+        os.remove(self.log)
+        wheelhouse = Wheelhouse(os.path.join(self._directory.name, 'other'), self.pip, cache=cache)
+
+        self.assertEqual(wheelhouse.build(self.graph, exclude=['requirements.txt']), 0)
+        self.assertEqual(sorted(pkg for event, pkg, _ in self.events() if event == 'start'), ['a==1', 'c', 'd'])
+        self.assertIn('b_lib-1.0-py3-none-any.whl', os.listdir(wheelhouse.path))
+
+        # Building no wheel at all is a failure, and nothing is cached
+        self.graph.get_node('b').payload = '-e git+{}@v1#egg=none'.format(url)
+        cache = WheelCache(os.path.join(self._directory.name, 'empty'))
+        wheelhouse = Wheelhouse(self.wheelhouse.path, self.pip, cache=cache)
+
+        self.assertEqual(wheelhouse.build(self.graph, exclude=['requirements.txt']), 1)
+        self.assertEqual(cache.get(url, commit), [])
+        self.assertFalse(os.path.isdir(cache.root))
+
+
+if __name__ == '__main__':
+    unittest.main()
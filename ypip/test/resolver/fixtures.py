@@ -0,0 +1,40 @@
+import os.path
+import unittest
+from tempfile import TemporaryDirectory
+
+from ypip.benchmark.universe import UniverseSource
+
+# a<2 and b share their requirements; c's versions split on leaf's
+UNIVERSE = {
+    'a': {'1.0': ['shared'], '2.0': ['shared>=2']},
+    'b': {'1.0': ['leaf'], '2.0': ['leaf']},
+    'c': {'1.0': ['leaf<2'], '2.0': ['leaf>=2']},
+    'shared': {'1.0': ['leaf'], '2.0': ['leaf']},
+    'leaf': {'1.0': [], '2.0': []}
+}
+
+
+class RecordingSource(UniverseSource):
+    ''' UniverseSource that records every package string it fetches '''
+    def __init__(self, universe):
+        super().__init__(universe)
+        self.fetched = []
+
+    def get_requirements(self, pkg):
+        self.fetched.append(pkg)
+        return super().get_requirements(pkg)
+
+
+class RequirementsTestCase(unittest.TestCase):
+    ''' Test case that writes requirements files to a temporary directory '''
+    def setUp(self):
+        self._directory = TemporaryDirectory()
+        self.addCleanup(self._directory.cleanup)
+        self.directory = self._directory.name
+
+    def requirements(self, *lines:str, name:str = 'requirements.txt') -> str:
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as handle:
+            handle.write('\n'.join(lines) + '\n')
+
+        return path
@@ -0,0 +1,81 @@
+import unittest
+
+from ypip.resolver.batch import resolve_batch
+from ypip.resolver.crawler import Crawler, NoSuitableSource
+from ypip.resolver.resolver import Resolver, ResolutionImpossible
+from ypip.sources.git_mirror import GitError
+from ypip.sources.http import HTTPError
+from ypip.sources.requirements_txt import RequirementsTxt
+from ypip.test.resolver.fixtures import UNIVERSE, RecordingSource, RequirementsTestCase
+
+
+class TestResolveBatch(RequirementsTestCase):
+    def test_batch(self):
+        roots = [
+            self.requirements('a<2', 'b', name='one.txt'),
+            self.requirements('a>=2', name='two.txt'),
+            self.requirements('b', 'a>=3', name='three.txt')
+        ]
+
+        source = RecordingSource(UNIVERSE)
+        batch = resolve_batch(roots, Crawler([RequirementsTxt(), source], max_workers=1))
+
+        # One graph of unique identities, from every resolved root
+        self.assertEqual(sorted(node.identity for node in batch.graph), sorted(roots[:2] + ['a', 'b', 'shared', 'leaf']))
+        self.assertEqual(batch.graph.dependents('leaf'), {'b', 'shared'})
+        self.assertEqual(batch.graph.get_node('a').payload, 'a==1.0')
+
+        # Roots are resolved independently, so they may pin differently
+        one, two = batch.resolutions[roots[0]], batch.resolutions[roots[1]]
+        self.assertEqual(one.get_node('a').payload, 'a==1.0')
+        self.assertEqual(two.get_node('a').payload, 'a==2.0')
+        self.assertEqual(two.get_node('shared').payload, 'shared==2.0')
+        self.assertNotIn('b', two)
+
+        self.assertEqual(list(batch.failures), [roots[2]])
+        self.assertIsInstance(batch.failures[roots[2]], ResolutionImpossible)
+
+        # Shared requirements are fetched once, rather than once per root
+        separate = RecordingSource(UNIVERSE)
+        for root in roots:
+            try:
+                Resolver(Crawler([RequirementsTxt(), separate], max_workers=1)).resolve(root)
+            except ResolutionImpossible:
+                pass
+
+        self.assertEqual(len(source.fetched), len(set(source.fetched)))
+        self.assertEqual(set(source.fetched), set(separate.fetched))
+        self.assertLess(len(source.fetched), len(separate.fetched))
+
+    def test_unrecognised(self):
+        roots = [self.requirements('a', name='one.txt'), self.requirements('-e .', name='two.txt')]
+        batch = resolve_batch(roots, Crawler([RequirementsTxt(), RecordingSource(UNIVERSE)], max_workers=1))
+
+        # Packages that no source recognises only fail their own root
+        self.assertEqual(list(batch.resolutions), [roots[0]])
+        self.assertIsInstance(batch.failures[roots[1]], NoSuitableSource)
+
+    def test_network(self):
+        # c can't be fetched, each time for a different reason
+        class FailingSource(RecordingSource):
+            def __init__(self, universe, exception):
+                super().__init__(universe)
+                self.exception = exception
+
+            def get_requirements(self, pkg):
+                if pkg.startswith('c'):
+                    raise self.exception
+
+                return super().get_requirements(pkg)
+
+        for exception in [GitError('git ls-remote failed'), HTTPError('https://example.com/c', 403), OSError('Name or service not known')]:
+            roots = [self.requirements('a', name='one.txt'), self.requirements('b', 'c', name='two.txt')]
+            batch = resolve_batch(roots, Crawler([RequirementsTxt(), FailingSource(UNIVERSE, exception)], max_workers=1))
+
+            # Network failures only fail their own root
+            self.assertEqual(list(batch.resolutions), [roots[0]])
+            self.assertIs(batch.failures[roots[1]], exception)
+
+
+if __name__ == '__main__':
+    unittest.main()
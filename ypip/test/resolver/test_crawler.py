@@ -0,0 +1,100 @@
+import threading
+import time
+import unittest
+from typing import Dict, List, Optional
+
+from ypip.resolver.crawler import Crawler, NoSuitableSource
+from ypip.sources._source import Source
+
+
+class FakeSource(Source):
+    def __init__(self, universe:Dict[str, List[str]], delay:float = 0):
+        self.universe = universe
+        self.delay = delay
+        self.fetches = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def is_package_from_source(self, pkg:str) -> bool:
+        return pkg in self.universe
+
+    def get_requirements(self, pkg:str) -> List[str]:
+        with self._lock:
+            self.fetches.append(pkg)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        time.sleep(self.delay)
+
+        with self._lock:
+            self.in_flight -= 1
+
+        return [pkg] + self.universe[pkg]
+
+    def identify(self, pkg:str) -> Optional[str]:
+        return pkg.split('@')[0]
+
+    def version_conflict(self, pkg1:str, pkg2:str) -> Optional[bool]:
+        return pkg1 != pkg2
+
+
+class TestCrawler(unittest.TestCase):
+    def test_crawl(self):
+        source = FakeSource({
+            'root':  ['a@1', 'b@1', '', '# Comment'],
+            'a@1':   ['c@1'],
+            'b@1':   ['c@2', 'd@1'],
+            'c@1':   [],
+            'c@2':   [],
+            'd@1':   ['a@1']
+        })
+
+        graph = Crawler([source]).crawl('root')
+
+        for identity, payload in [('root', 'root'), ('a', 'a@1'), ('b', 'b@1'), ('c', 'c@1'), ('d', 'd@1')]:
+            self.assertEqual(graph.get_node(identity).payload, payload)
+
+        # Each package string is fetched once and c@2 is never reached,
+        # as the identity was already visited at the same level
+        self.assertEqual(sorted(source.fetches), ['a@1', 'b@1', 'c@1', 'd@1', 'root'])
+
+    def test_concurrency_limit(self):
+        universe = {'root': ['dep{}'.format(i) for i in range(12)]}
+        universe.update({'dep{}'.format(i): [] for i in range(12)})
+        source = FakeSource(universe, delay=0.02)
+
+        _ = Crawler([source], max_workers=4).crawl('root')
+
+        self.assertEqual(len(source.fetches), 13)
+        self.assertGreater(source.max_in_flight, 1)
+        self.assertLessEqual(source.max_in_flight, 4)
+
+    def test_fetch_memoised(self):
+        source = FakeSource({'a': ['b'], 'b': []})
+        crawler = Crawler([source])
+
+        self.assertEqual(crawler.fetch(['a', 'b']), {'a': ['b'], 'b': []})
+        self.assertEqual(crawler.fetch(['a']), {'a': ['b']})
+        self.assertEqual(len(source.fetches), 2)
+
+    def test_markers(self):
+        source = FakeSource({
+            'a': ['b ; python_version >= "3"', 'c; python_version < "3"', 'd ; os_name == "nt" and os_name != "nt"', 'e ; not a marker'],
+            'b': []
+        })
+        crawler = Crawler([source])
+
+        # Requirements whose markers don't hold are pruned, unfetched
+        self.assertEqual(crawler.fetch(['a']), {'a': ['b', 'e ; not a marker']})
+        self.assertEqual(source.fetches, ['a'])
+
+    def test_no_source(self):
+        crawler = Crawler([FakeSource({'a': ['unknown']})])
+
+        with self.assertRaises(NoSuitableSource):
+            _ = crawler.crawl('a')
+
+
+if __name__ == '__main__':
+    unittest.main()
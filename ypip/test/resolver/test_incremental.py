@@ -0,0 +1,106 @@
+import unittest
+
+from ypip.resolver.crawler import Crawler
+from ypip.resolver.incremental import changed_identities, resolve_incremental
+from ypip.resolver.lockfile import Lockfile, LockfileError
+from ypip.resolver.resolver import Resolver
+from ypip.sources.requirements_txt import RequirementsTxt
+from ypip.test.resolver.fixtures import UNIVERSE, RecordingSource, RequirementsTestCase
+
+
+class TestResolveIncremental(RequirementsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.path = self.requirements()
+
+    def crawler(self, universe=UNIVERSE):
+        self.source = RecordingSource(universe)
+        return Crawler([RequirementsTxt(), self.source], max_workers=1)
+
+    def lock(self, *lines:str) -> Lockfile:
+        self.requirements(*lines)
+        crawler = self.crawler()
+        return Lockfile.from_graph(Resolver(crawler).resolve(self.path).freeze(), [self.path], crawler)
+
+    def pins(self, graph):
+        return {node.identity: node.payload for node in graph if node.identity != self.path}
+
+    def test_unchanged(self):
+        lock = self.lock('a<2', 'b<2')
+        crawler = self.crawler()
+
+        self.assertEqual(changed_identities(lock, crawler), set())
+
+        graph = resolve_incremental(lock, crawler)
+        self.assertEqual(self.pins(graph), {'a': 'a==1.0', 'b': 'b==1.0', 'shared': 'shared==2.0', 'leaf': 'leaf==2.0'})
+        self.assertEqual(self.source.fetched, [])
+
+    def test_changed(self):
+        lock = self.lock('a<2', 'b<2')
+
+        # Only a and what it requires are decided again; b is kept, even
+        # though a newer version is available
+        self.requirements('a', 'b')
+        crawler = self.crawler()
+
+        self.assertEqual(changed_identities(lock, crawler), {'a', 'b'})
+
+        self.requirements('a', 'b<2')
+        crawler = self.crawler()
+
+        self.assertEqual(changed_identities(lock, crawler), {'a'})
+
+        graph = resolve_incremental(lock, crawler)
+        self.assertEqual(self.pins(graph), {'a': 'a==2.0', 'b': 'b==1.0', 'shared': 'shared==2.0', 'leaf': 'leaf==2.0'})
+        self.assertNotIn('b==1.0', self.source.fetched)
+
+    def test_added(self):
+        lock = self.lock('b<2')
+
+        # The added requirement needs an older version of kept leaf, which
+        # is decided again, without deciding b again
+        self.requirements('b<2', 'c<2')
+        graph = resolve_incremental(lock, self.crawler())
+
+        self.assertEqual(self.pins(graph), {'b': 'b==1.0', 'c': 'c==1.0', 'leaf': 'leaf==1.0'})
+        self.assertNotIn('b==1.0', self.source.fetched)
+
+    def test_removed(self):
+        lock = self.lock('a<2', 'b<2')
+
+        self.requirements('b<2')
+        graph = resolve_incremental(lock, self.crawler())
+
+        self.assertEqual(self.pins(graph), {'b': 'b==1.0', 'leaf': 'leaf==2.0'})
+
+    def test_restart(self):
+        universe = dict(UNIVERSE, d={'1.0': ['shared<2']})
+        lock = self.lock('a', 'b')
+
+        # Kept a needs shared>=2, so has to be backtracked to reconcile d
+        self.requirements('a', 'b', 'd')
+        graph = resolve_incremental(lock, self.crawler(universe))
+
+        self.assertEqual(self.pins(graph)['a'], 'a==1.0')
+        self.assertEqual(self.pins(graph)['shared'], 'shared==1.0')
+
+    def test_constraints(self):
+        lock = self.lock('a<2', 'b<2')
+
+        self.requirements('leaf<2', name='constraints.txt')
+        self.requirements('a<2', 'b<2', '-c constraints.txt')
+        crawler = self.crawler()
+
+        self.assertEqual(changed_identities(lock, crawler), {'leaf'})
+        self.assertEqual(self.pins(resolve_incremental(lock, crawler))['leaf'], 'leaf==1.0')
+
+    def test_unrecorded(self):
+        lock = self.lock('a')
+        del lock.packages[self.path]['requires']
+
+        with self.assertRaises(LockfileError):
+            _ = resolve_incremental(lock, self.crawler())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import os.path
+import subprocess
+import unittest
+from tempfile import TemporaryDirectory
+
+from ypip.benchmark.universe import UniverseSource
+from ypip.install.plan import InstallPlan
+from ypip.resolver.crawler import Crawler
+from ypip.resolver.lockfile import Lockfile, LockfileError, digest
+from ypip.resolver.resolver import Resolver
+from ypip.sources.git_mirror import GitMirror
+from ypip.sources.requirements_txt import RequirementsTxt
+
+
+class TestLockfile(unittest.TestCase):
+    universe = {
+        'a': {'1': ['b', 'c'], '2': ['b<2', 'c']},
+        'b': {'1': ['c'], '2': []},
+        'c': {'1': []}
+    }
+
+    def setUp(self):
+        self._tmp = TemporaryDirectory()
+        self.requirements = os.path.join(self._tmp.name, 'requirements.txt')
+        self.lock_path = os.path.join(self._tmp.name, 'requirements.txt.lock')
+
+        with open(self.requirements, 'w') as handle:
+            handle.write('a\n')
+
+        crawler = Crawler([UniverseSource(self.universe)])
+        self.graph = Resolver(crawler).resolve('a')
+        self.lock = Lockfile.from_graph(self.graph, [self.requirements], crawler)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_round_trip(self):
+        self.lock.dump(self.lock_path)
+        loaded = Lockfile.load(self.lock_path)
+
+        self.assertEqual(loaded.roots, [self.requirements])
+        self.assertEqual(loaded.packages, self.lock.packages)
+        self.assertEqual(loaded.packages['a'], {'requirement': 'a==2', 'requires': ['b<2', 'c'], 'dependencies': ['b', 'c']})
+
+        graph = loaded.graph()
+        for node in self.graph:
+            self.assertEqual(graph.get_node(node.identity).payload, node.payload)
+            self.assertEqual(graph.get_node(node.identity).links, node.links)
+
+    def test_deterministic(self):
+        self.lock.dump(self.lock_path)
+        with open(self.lock_path) as handle:
+            first = handle.read()
+
+        Lockfile.load(self.lock_path).dump(self.lock_path)
+        with open(self.lock_path) as handle:
+            self.assertEqual(handle.read(), first)
+
+    def test_is_current(self):
+        self.assertTrue(self.lock.is_current())
+
+        with open(self.requirements, 'a') as handle:
+            handle.write('b\n')
+
+        self.assertFalse(self.lock.is_current())
+        self.assertNotEqual(digest([self.requirements]), self.lock.digest)
+
+    def test_includes(self):
+        with open(self.requirements, 'a') as handle:
+            handle.write('-r base.txt\n')
+
+        base = os.path.join(self._tmp.name, 'base.txt')
+        with open(base, 'w') as handle:
+            handle.write('b\n')
+
+        lock = Lockfile.from_graph(self.graph, [self.requirements], Crawler([UniverseSource(self.universe)]))
+        self.assertTrue(lock.is_current())
+
+        with open(base, 'a') as handle:
+            handle.write('c\n')
+
+        self.assertFalse(lock.is_current())
+
+        os.unlink(base)
+        self.assertFalse(lock.is_current())
+
+    def test_pinned(self):
+        upstream = os.path.join(self._tmp.name, 'upstream')
+
+        def git(*args:str) -> str:
+            command = ['git', '-C', upstream, '-c', 'user.name=ypip', '-c', 'user.email=ypip@example.com'] + list(args)
+            return subprocess.check_output(command).decode().strip()
+
+        subprocess.check_call(['git', 'init', '--quiet', upstream])
+        git('commit', '--quiet', '--allow-empty', '-m', 'First')
+        first, branch = git('rev-parse', 'HEAD'), git('rev-parse', '--abbrev-ref', 'HEAD')
+
+        pkg = '-e git+file://{}@{}#egg=up'.format(upstream, branch)
+        with open(self.requirements, 'w') as handle:
+            handle.write(pkg + '\n')
+
+        crawler = Crawler([RequirementsTxt(), GitMirror(os.path.join(self._tmp.name, 'mirrors'))])
+        graph = Resolver(crawler).resolve(self.requirements)
+        Lockfile.from_graph(graph, [self.requirements], crawler).dump(self.lock_path)
+
+        # The branch moves on, but what's installed from the lock doesn't
+        git('commit', '--quiet', '--allow-empty', '-m', 'Second')
+        lock = Lockfile.load(self.lock_path)
+        identity = crawler.identify(pkg)
+        pinned = '-e git+file://{}@{}#egg=up'.format(upstream, first)
+
+        self.assertTrue(lock.is_current())
+        self.assertEqual(lock.packages[identity]['requirement'], pkg)
+        self.assertEqual(lock.graph().get_node(identity).payload, pinned)
+        self.assertEqual(InstallPlan.from_graph(lock.graph(), exclude=[self.requirements]).commands()[0][-2:],
+                         ['-e', pinned[2:].strip()])
+
+    def test_bad(self):
+        with open(self.lock_path, 'w') as handle:
+            handle.write('{"version": 0}')
+
+        with self.assertRaises(LockfileError):
+            _ = Lockfile.load(self.lock_path)
+
+        with self.assertRaises(LockfileError):
+            _ = Lockfile([], '', {'a': {'requirement': 'a', 'dependencies': ['z']}}).graph()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+import os.path
+import unittest
+from tempfile import TemporaryDirectory
+
+from ypip import instrumentation
+from ypip.benchmark.universe import UniverseSource
+from ypip.resolver.crawler import Crawler
+from ypip.resolver.resolver import Resolver, ResolutionImpossible
+from ypip.sources.requirements_txt import RequirementsTxt
+
+
+class TestResolver(unittest.TestCase):
+    def resolve(self, universe, *roots):
+        resolver = Resolver(Crawler([UniverseSource(universe)], max_workers=1))
+        graph = resolver.resolve(*roots)
+        return resolver, {identity: graph.get_node(identity).payload for identity in universe if identity in graph}
+
+    def test_latest(self):
+        universe = {
+            'a': {'1': [], '2': ['b>=1']},
+            'b': {'1': [], '1.5': [], '3': []}
+        }
+
+        _, pins = self.resolve(universe, 'a')
+        self.assertEqual(pins, {'a': 'a==2', 'b': 'b==3'})
+
+        _, pins = self.resolve(universe, 'a', 'b<2')
+        self.assertEqual(pins, {'a': 'a==2', 'b': 'b==1.5'})
+
+    def test_backtrack(self):
+        universe = {
+            'a': {'1': [], '2': ['c<2']},
+            'b': {'1': ['c>=2']},
+            'c': {'1': [], '2': []}
+        }
+
+        _, pins = self.resolve(universe, 'a', 'b')
+        self.assertEqual(pins, {'a': 'a==1', 'b': 'b==1', 'c': 'c==2'})
+
+    def test_repin(self):
+        universe = {
+            'a': {'1': ['c'], '2': ['c', 'b']},
+            'b': {'1': ['c<2']},
+            'c': {'1': [], '2': []}
+        }
+
+        _, pins = self.resolve(universe, 'a')
+        self.assertEqual(pins, {'a': 'a==2', 'b': 'b==1', 'c': 'c==1'})
+
+    def test_backjump(self):
+        # c's conflicts have nothing to do with a or b, so the resolver
+        # shouldn't revisit any of their 81 combinations
+        universe = {
+            'a': {str(v): [] for v in range(1, 10)},
+            'b': {str(v): [] for v in range(1, 10)},
+            'c': {'1': [], '2': ['d==2'], '3': ['d==2']},
+            'd': {'1': []}
+        }
+
+        resolver, pins = self.resolve(universe, 'a', 'b', 'c')
+        self.assertEqual(pins, {'a': 'a==9', 'b': 'b==9', 'c': 'c==1'})
+        self.assertLessEqual(resolver.backtracks, 2)
+
+    def test_impossible(self):
+        universe = {
+            'a': {'1': ['c<2'], '2': ['c<2']},
+            'c': {'1': [], '2': []}
+        }
+
+        with self.assertRaises(ResolutionImpossible):
+            _ = self.resolve(universe, 'a', 'c>=2')
+
+        with self.assertRaises(ResolutionImpossible):
+            _ = self.resolve(universe, 'a>=3')
+
+    def test_cycle(self):
+        universe = {
+            'a': {'1': ['b']},
+            'b': {'1': ['a']}
+        }
+
+        _, pins = self.resolve(universe, 'a')
+        self.assertEqual(pins, {'a': 'a==1', 'b': 'b==1'})
+
+    def test_invalidated_pins(self):
+        # Requirements that rule out existing pins have them re-pinned,
+        # without cycling between the same pins forever
+        universe = {
+            'a': {'1': ['b!=3'], '2': ['b<1'], '3': ['b>=1']},
+            'b': {'1': [], '2': ['a>=2'], '3': ['a!=3']}
+        }
+
+        _, pins = self.resolve(universe, 'a')
+        self.assertEqual(pins, {'a': 'a==3', 'b': 'b==2'})
+
+        universe = {
+            'a': {'1': ['b==2', 'c!=1'], '2': ['c<3'], '3': ['b!=1']},
+            'b': {'1': ['a>=1'], '2': ['a!=3']},
+            'c': {'1': ['a>=3']}
+        }
+
+        resolver = Resolver(Crawler([UniverseSource(universe)], max_workers=1), max_rounds=1000)
+        with self.assertRaises(ResolutionImpossible):
+            _ = resolver.resolve('a')
+
+    def test_rounds(self):
+        # One round per identity, with nothing to backtrack
+        universe = {'p{}'.format(i): {'1': [], '2': []} for i in range(200)}
+        universe['root'] = {'1': sorted(universe)}
+
+        resolver = Resolver(Crawler([UniverseSource(universe)], max_workers=1))
+
+        instrumentation.enable()
+        try:
+            _ = resolver.resolve('root')
+            rounds = instrumentation.summary()['counters']['resolver.rounds']
+        finally:
+            instrumentation.disable()
+
+        self.assertEqual(rounds, len(universe) + 1)
+
+    def test_kept_pins(self):
+        universe = {
+            'a': {'1': ['c'], '2': ['c']},
+            'b': {'1': ['c<2']},
+            'c': {'1': [], '2': []}
+        }
+
+        resolver = Resolver(Crawler([UniverseSource(universe)], max_workers=1))
+
+        # Kept pins stand where they satisfy their requirements
+        graph = resolver.resolve('a', pins={'a': 'a==1', 'c': 'c==2'})
+        self.assertEqual(graph.get_node('a').payload, 'a==1')
+        self.assertEqual(graph.get_node('c').payload, 'c==2')
+
+        graph = resolver.resolve('a', 'b', pins={'a': 'a==1', 'c': 'c==2'})
+        self.assertEqual(graph.get_node('c').payload, 'c==1')
+
+    def test_constraints(self):
+        universe = {
+            'a': {'1': [], '2': ['b']},
+            'b': {'1': [], '2': []},
+            'c': {'1': []}
+        }
+
+        with TemporaryDirectory() as root:
+            requirements = os.path.join(root, 'requirements.txt')
+            with open(requirements, 'w') as handle:
+                handle.write('a\n-c constraints.txt\n')
+
+            with open(os.path.join(root, 'constraints.txt'), 'w') as handle:
+                handle.write('b<2\nc>=1\n')
+
+            resolver = Resolver(Crawler([RequirementsTxt(), UniverseSource(universe)], max_workers=1))
+            graph = resolver.resolve(requirements)
+
+        # Constraints restrict what is required, without requiring it
+        self.assertEqual(graph.get_node('b').payload, 'b==1')
+        self.assertNotIn('c', graph)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -108,6 +108,103 @@ class TestSpecifier(unittest.TestCase):
         self.assertTrue(s(Version('1.9.9.9.9')))
         self.assertFalse(s(Version('2.0')))
 
+    def test_compatible_patch(self):
+        s = Specifier('~= 1.4.5')
+
+        self.assertTrue(s(Version('1.4.5')))
+        self.assertTrue(s(Version('1.4.9')))
+        self.assertFalse(s(Version('1.5')))
+        self.assertFalse(s(Version('1.4.4')))
+
+        with self.assertRaises(ParseError):
+            _ = Specifier('~= 1')
+
+    def test_exclusive_pre_post(self):
+        lt = Specifier('< 1.2')
+        gt = Specifier('> 1.2')
+
+        self.assertTrue(lt(Version('1.1.post1')))
+        self.assertFalse(lt(Version('1.2a1')))
+        self.assertFalse(lt(Version('1.2.dev1')))
+        self.assertTrue(Specifier('< 1.2b1')(Version('1.2a1')))
+
+        # Only the postrelease's own prereleases are excluded
+        lt_post = Specifier('< 1.0.post1')
+        self.assertTrue(lt_post(Version('1.0a1')))
+        self.assertTrue(lt_post(Version('1.0rc1')))
+        self.assertTrue(lt_post(Version('1.0.dev1')))
+        self.assertFalse(lt_post(Version('1.0.post1.dev1')))
+
+        self.assertFalse(gt(Version('1.2.post1')))
+        self.assertFalse(gt(Version('1.2+foo')))
+        self.assertTrue(gt(Version('1.2.1')))
+        self.assertTrue(Specifier('> 1.2.post1')(Version('1.2.post2')))
+
+    def test_local(self):
+        self.assertTrue(Specifier('== 1.2')(Version('1.2+foo')))
+        self.assertTrue(Specifier('== 1.2+foo')(Version('1.2+foo')))
+        self.assertFalse(Specifier('== 1.2+foo')(Version('1.2')))
+        self.assertFalse(Specifier('== 1.2+foo')(Version('1.2+bar')))
+
+
+class TestSpecifierFilter(unittest.TestCase):
+    versions = list(map(Version, [
+        '0.9', '1.0.dev1', '1.0a1', '1.0rc1', '1.0', '1.0.post1.dev1', '1.0.post1', '1.0+local', '1.1',
+        '1.2', '1.2.1', '1.2.5rc1', '1.3', '1.9.9.9', '2.0', '2.1', '1!0.1'
+    ]))
+
+    def test_filter(self):
+        s = Specifier('>= 1.0, < 2.0, != 1.2.*')
+        self.assertEqual(list(map(str, s.filter(reversed(self.versions)))),
+                         ['1.0', '1.0+local', '1.0.post1.dev1', '1.0.post1', '1.1', '1.3', '1.9.9.9'])
+
+    def test_filter_matches_predicate(self):
+        specs = ['== 1.0', '== 1.*', '!= 1.0', '!= 1.2.*', '=== 1.0', '< 1.2', '<= 1.2',
+                 '> 1.0', '>= 1.0', '~= 1.0', '~= 1.2.1', '> 0.9, < 1!0', '== 3.*', '< 1.0.post1']
+
+        for spec in specs:
+            s = Specifier(spec)
+            expected = sorted(v for v in self.versions if s(v))
+            self.assertEqual(s.filter(self.versions), expected, spec)
+
+    def test_best(self):
+        self.assertEqual(Specifier('< 2').best(self.versions), Version('1.9.9.9'))
+        self.assertEqual(Specifier('!= 1!0.1').best(self.versions), Version('2.1'))
+        self.assertEqual(Specifier('== 1.2.*').best(self.versions), Version('1.2.5rc1'))
+        self.assertIsNone(Specifier('> 5, < 1!0').best(self.versions))
+        self.assertIsNone(Specifier('> 5').best([]))
+
+
+class TestSpecifierAlgebra(unittest.TestCase):
+    def test_normalised(self):
+        # Redundant clauses collapse into a single interval
+        self.assertEqual(len(Specifier('>= 1.0, >= 1.1, < 3, < 2').intervals), 1)
+        self.assertEqual(len(Specifier('!= 1.2.*').intervals), 2)
+        self.assertEqual(len(Specifier('>= 1.0, < 2.0, != 1.2.*, != 1.3').intervals), 3)
+
+    def test_intersection(self):
+        s = Specifier('>= 1.0') & Specifier('< 2.0, != 1.5')
+
+        self.assertEqual(str(s), '>=1.0, <2.0, !=1.5')
+        self.assertTrue(s(Version('1.4')))
+        self.assertFalse(s(Version('1.5')))
+        self.assertFalse(s(Version('2.0')))
+        self.assertFalse(s.is_empty())
+
+    def test_empty(self):
+        empty = ['>= 2.0, < 1.0', '== 1.2, != 1.2', '> 1.2, < 1.2.post1', '== 1.*, == 2.*', '~= 1.2, < 1.2']
+        for spec in empty:
+            self.assertTrue(Specifier(spec).is_empty(), spec)
+
+        nonempty = ['>= 1.0, <= 1.0', '== 1.2, != 1.2+foo', '> 1.2, < 1.2.1', '~= 1.2, == 1.9.*']
+        for spec in nonempty:
+            self.assertFalse(Specifier(spec).is_empty(), spec)
+
+    def test_isdisjoint(self):
+        self.assertTrue(Specifier('< 1.0').isdisjoint(Specifier('>= 1.0')))
+        self.assertFalse(Specifier('<= 1.0').isdisjoint(Specifier('>= 1.0')))
+        self.assertTrue(Specifier('== 1.2.*').isdisjoint(Specifier('~= 1.3')))
+
 
 if __name__ == '__main__':
     unittest.main()
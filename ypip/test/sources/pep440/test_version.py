@@ -1,3 +1,4 @@
+import pickle
 import unittest
 from ypip.sources.pep440.version import Version
 from ypip.sources.pep440.exceptions import ParseError
@@ -173,6 +174,47 @@ class TestVersionOrdering(unittest.TestCase):
         self.assertTrue(Version('1+foo.1') > Version('1+foo') > Version('1'))
         self.assertTrue(Version('1') < Version('1+foo') < Version('1+foo.1'))
 
+    def test_trailing_zeros(self):
+        self.assertTrue(Version('1.2') == Version('1.2.0') == Version('1.2.0.0'))
+        self.assertTrue(Version('1.2') < Version('1.2.0.1'))
+
+    def test_dev_before_pre(self):
+        self.assertTrue(Version('1.dev0') < Version('1a0') < Version('1a0.post1') < Version('1a1'))
+        self.assertTrue(Version('1.post1.dev1') < Version('1.post1'))
+
+    def test_local_segments(self):
+        # Numeric segments sort after alphanumeric ones
+        self.assertTrue(Version('1+foo') < Version('1+1'))
+        self.assertTrue(Version('1+FOO') == Version('1+foo'))
+
+    def test_sorted(self):
+        ordered = ['1!0', '1.0.dev0', '1.0a1', '1.0b1', '1.0rc1', '1.0', '1.0+foo', '1.0.post1', '1.1', '2!0']
+        shuffled = ordered[::2] + ordered[1::2]
+        self.assertEqual([str(v) for v in sorted(map(Version, shuffled))], ['1.0.dev0', '1.0a1', '1.0b1', '1.0rc1', '1.0', '1.0+foo', '1.0.post1', '1.1', '1!0', '2!0'])
+
+
+class TestVersionObject(unittest.TestCase):
+    def test_hash(self):
+        self.assertEqual(hash(Version('1.2')), hash(Version('1.2.0')))
+        self.assertEqual(len({Version('1.2'), Version('1.2.0'), Version('v1.2'), Version('1.3')}), 2)
+
+    def test_interned(self):
+        self.assertIs(Version('1.2.3'), Version('1.2.3'))
+
+    def test_slots(self):
+        with self.assertRaises(AttributeError):
+            Version('1.2.3').foo = 'bar'
+
+    def test_pickle(self):
+        v = Version('1!2.3rc4.post5.dev6+foo.7')
+        self.assertEqual(pickle.loads(pickle.dumps(v)), v)
+
+    def test_foreign_comparison(self):
+        self.assertNotEqual(Version('1.2'), '1.2')
+
+        with self.assertRaises(TypeError):
+            _ = Version('1.2') < '1.3'
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+from ypip.sources.pep508.markers import Marker, applies, default_environment, split_marker
+from ypip.sources.pep508.exceptions import ParseError
+
+
+class TestMarker(unittest.TestCase):
+    environment = {'python_version': '3.5', 'python_full_version': '3.5.2', 'sys_platform': 'linux', 'os_name': 'posix'}
+
+    def evaluate(self, marker:str, **extra) -> bool:
+        return Marker(marker).evaluate(dict(self.environment, **extra))
+
+    def test_bad_parse(self):
+        bad = ['', 'python_version', 'python_version >= ', 'foo == "1"', '"a" = "a"',
+               'python_version >= "3" and', '(os_name == "nt"', 'os_name == "nt")', 'os_name not "nt"']
+
+        for x in bad:
+            with self.assertRaises(ParseError):
+                _ = Marker(x)
+
+    def test_versions(self):
+        self.assertTrue(self.evaluate('python_version >= "3"'))
+        self.assertTrue(self.evaluate('python_version < "3.10"'))
+        self.assertFalse(self.evaluate('python_version < "3.5"'))
+        self.assertTrue(self.evaluate('python_full_version == "3.5.*"'))
+        self.assertTrue(self.evaluate('python_version ~= "3.4"'))
+        self.assertTrue(self.evaluate('"3.6" > python_version'))
+
+    def test_strings(self):
+        self.assertTrue(self.evaluate('sys_platform == "linux"'))
+        self.assertTrue(self.evaluate("sys_platform != 'win32'"))
+        self.assertTrue(self.evaluate('"lin" in sys_platform'))
+        self.assertTrue(self.evaluate('sys_platform not in "win32 cygwin"'))
+        self.assertTrue(self.evaluate('os.name == "posix"'))
+        self.assertTrue(self.evaluate('sys_platform === "linux"'))
+
+        # Non-versions can't be ordered
+        self.assertFalse(self.evaluate('sys_platform > "a"'))
+
+    def test_boolean(self):
+        self.assertTrue(self.evaluate('os_name == "nt" or sys_platform == "linux"'))
+        self.assertFalse(self.evaluate('os_name == "nt" and sys_platform == "linux"'))
+
+        # and binds tighter than or, unless parenthesised
+        self.assertTrue(self.evaluate('sys_platform == "linux" or os_name == "nt" and python_version < "3"'))
+        self.assertFalse(self.evaluate('(sys_platform == "linux" or os_name == "nt") and python_version < "3"'))
+
+    def test_extras(self):
+        marker = Marker('extra == "test" or extra == "docs"')
+
+        self.assertFalse(marker.evaluate(self.environment))
+        self.assertTrue(marker.evaluate(self.environment, extras=['docs']))
+        self.assertFalse(marker.evaluate(self.environment, extras=['other']))
+
+    def test_environment(self):
+        environment = default_environment()
+        self.assertEqual(environment['extra'], '')
+        self.assertEqual(environment['python_version'].count('.'), 1)
+
+        # The default environment is shared, so is handed out as a copy
+        environment['os_name'] = 'changed'
+        self.assertNotEqual(default_environment()['os_name'], 'changed')
+
+        self.assertTrue(applies(None))
+        self.assertTrue(applies('python_version >= "3"'))
+        self.assertFalse(applies('python_version < "3"'))
+        self.assertTrue(Marker('python_version >= "3"').evaluate())
+
+    def test_split(self):
+        self.assertEqual(split_marker('foo'), ('foo', None))
+        self.assertEqual(split_marker('foo>=1;python_version<"3"'), ('foo>=1', 'python_version<"3"'))
+        self.assertEqual(split_marker('foo @ https://example.com/a;b.whl ; os_name == "nt"'),
+                         ('foo @ https://example.com/a;b.whl', 'os_name == "nt"'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+from ypip.sources.pep508.requirement import Requirement, normalise, parse
+from ypip.sources.pep508.exceptions import ParseError
+
+
+class TestRequirement(unittest.TestCase):
+    def test_bad_parse(self):
+        bad = ['', '-foo', 'foo[', 'foo[bar', 'foo[-bar]', 'foo >=', 'foo bar', 'foo @', 'git+https://example.com/foo.git', 'foo ; bogus']
+
+        for x in bad:
+            with self.assertRaises(ParseError):
+                _ = Requirement(x)
+
+            self.assertIsNone(parse(x))
+
+    def test_name(self):
+        r = Requirement('Foo_Bar.baz')
+
+        self.assertEqual(r.name, 'Foo_Bar.baz')
+        self.assertEqual(r.key, 'foo-bar-baz')
+        self.assertEqual(r.extras, ())
+        self.assertEqual(r.specifier, '')
+        self.assertIsNone(r.url)
+        self.assertIsNone(r.marker)
+
+    def test_full(self):
+        r = Requirement('foo [ quux,bar ] >= 1.0 , < 2 ; python_version >= "3"')
+
+        self.assertEqual(r.extras, ('bar', 'quux'))
+        self.assertEqual(r.specifier, '>=1.0,<2')
+        self.assertEqual(str(r.marker), 'python_version >= "3"')
+        self.assertEqual(str(r), 'foo[bar,quux]>=1.0,<2; python_version >= "3"')
+        self.assertEqual(Requirement(str(r)), r)
+
+    def test_parenthesised(self):
+        self.assertEqual(Requirement('foo (>=1.0)').specifier, '>=1.0')
+        self.assertEqual(Requirement('foo==legacy-1').specifier, '==legacy-1')
+
+    def test_url(self):
+        r = Requirement('foo @ https://example.com/foo.whl ; os_name == "nt"')
+
+        self.assertEqual(r.url, 'https://example.com/foo.whl')
+        self.assertEqual(r.specifier, '')
+        self.assertEqual(str(r), 'foo @ https://example.com/foo.whl ; os_name == "nt"')
+
+    def test_memoised(self):
+        self.assertIs(parse('foo>=1'), parse('foo>=1'))
+
+    def test_normalise(self):
+        self.assertEqual(normalise('Foo.-_Bar'), 'foo-bar')
+
+
+if __name__ == '__main__':
+    unittest.main()
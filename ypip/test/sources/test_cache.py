@@ -0,0 +1,91 @@
+import os.path
+import subprocess
+import unittest
+from tempfile import TemporaryDirectory
+
+from ypip.sources.cache import CacheMiss, RequirementsCache
+from ypip.sources.git_github import GitOnGitHub
+
+_SHA = '0123456789abcdef0123456789abcdef01234567'
+
+
+class TestRequirementsCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = TemporaryDirectory()
+        self.root = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_round_trip(self):
+        cache = RequirementsCache(self.root)
+        self.assertIsNone(cache.get('github', 'foo', 'bar', 'master'))
+
+        cache.put('github', 'foo', 'bar', 'feature/xyzzy', b'quux==1.0\n', '"abc"')
+        entry = RequirementsCache(self.root).get('github', 'foo', 'bar', 'feature/xyzzy')
+
+        self.assertEqual(entry.content, b'quux==1.0\n')
+        self.assertEqual(entry.etag, '"abc"')
+        self.assertIsNone(cache.get('github', 'foo', 'bar', 'feature'))
+
+    def test_is_immutable(self):
+        self.assertTrue(RequirementsCache.is_immutable(_SHA))
+        self.assertTrue(RequirementsCache.is_immutable(_SHA.upper()))
+        self.assertFalse(RequirementsCache.is_immutable('master'))
+        self.assertFalse(RequirementsCache.is_immutable(_SHA[:7]))
+
+    def test_freshness(self):
+        cache = RequirementsCache(self.root, ttl=60)
+        entry = cache.put('github', 'foo', 'bar', 'master', b'')
+        stale = entry._replace(fetched=entry.fetched - 120)
+
+        self.assertTrue(cache.is_fresh(entry, 'master'))
+        self.assertFalse(cache.is_fresh(stale, 'master'))
+        self.assertTrue(cache.is_fresh(stale, _SHA))
+
+        offline = RequirementsCache(self.root, ttl=60, offline=True)
+        self.assertTrue(offline.is_fresh(stale, 'master'))
+
+    def test_github_offline(self):
+        cache = RequirementsCache(self.root, offline=True)
+        cache.put('github', 'foo', 'bar', _SHA, b'quux==1.0\nxyzzy\n')
+        source = GitOnGitHub(cache=cache)
+
+        pkg = 'git+https://github.com/foo/bar.git@{}#egg=bar'.format(_SHA)
+        self.assertEqual(source.get_requirements(pkg), [pkg, 'quux==1.0', 'xyzzy'])
+
+        with self.assertRaises(CacheMiss):
+            _ = source.get_requirements('git+https://github.com/foo/bar.git@master#egg=bar')
+
+    def test_github_grammar(self):
+        cache = RequirementsCache(self.root, offline=True)
+        cache.put('github', 'foo', 'bar', _SHA, b'quux==1.0  # compat\nxyzzy --hash=sha256:abc\n-c constraints.txt\nplugh \\\n  ; python_version >= "3"\n')
+
+        pkg = 'git+https://github.com/foo/bar.git@{}#egg=bar'.format(_SHA)
+        with self.assertWarns(Warning):
+            self.assertEqual(GitOnGitHub(cache=cache).get_requirements(pkg), [pkg, 'quux==1.0', 'xyzzy', 'plugh ; python_version >= "3"'])
+
+    def test_github_lock_metadata(self):
+        repo = os.path.join(self.root, 'upstream', 'foo', 'bar.git')
+        subprocess.check_call(['git', 'init', '--quiet', repo])
+        subprocess.check_call(['git', '-C', repo, '-c', 'user.name=ypip', '-c', 'user.email=ypip@example.com',
+                               'commit', '--quiet', '--allow-empty', '-m', 'Commit'])
+        subprocess.check_call(['git', '-C', repo, 'tag', 'v1'])
+        commit = subprocess.check_output(['git', '-C', repo, 'rev-parse', 'HEAD']).decode().strip()
+
+        repo_url = 'file://{}'.format(os.path.join(self.root, 'upstream'))
+        url = '{}/foo/bar.git'.format(repo_url)
+        source = GitOnGitHub(cache=RequirementsCache(self.root), repo_url=repo_url)
+
+        # Refs are locked to the commit they point to
+        self.assertEqual(source.lock_metadata('git+https://github.com/foo/bar.git@v1#egg=bar'), {'url': url, 'ref': 'v1', 'commit': commit})
+        self.assertEqual(source.lock_metadata('git+https://github.com/foo/bar.git@nope#egg=bar'), {'url': url, 'ref': 'nope'})
+
+        # Offline, only commits can be locked
+        source = GitOnGitHub(cache=RequirementsCache(self.root, offline=True), repo_url=repo_url)
+        self.assertEqual(source.lock_metadata('git+https://github.com/foo/bar.git@v1#egg=bar'), {'url': url, 'ref': 'v1'})
+        self.assertEqual(source.lock_metadata('git+https://github.com/foo/bar.git@{}#egg=bar'.format(_SHA)), {'url': url, 'ref': _SHA, 'commit': _SHA})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+from typing import List, Optional
+
+from ypip.sources._source import Source
+from ypip.sources.dispatch import Dispatcher
+
+
+class CountingSource(Source):
+    def __init__(self, pattern:str, prefixes:Optional[tuple] = None):
+        self.pattern = pattern
+        self.prefixes = prefixes
+        self.checked = []
+
+    def is_package_from_source(self, pkg:str) -> bool:
+        self.checked.append(pkg)
+        return self.pattern in pkg
+
+    def get_requirements(self, pkg:str) -> List[str]:
+        return [pkg]
+
+    def identify(self, pkg:str) -> Optional[str]:
+        return pkg
+
+    def version_conflict(self, pkg1:str, pkg2:str) -> Optional[bool]:
+        return None
+
+
+class TestDispatcher(unittest.TestCase):
+    def test_priority(self):
+        git = CountingSource('github', prefixes=('git+', '-e'))
+        anything = CountingSource('')
+        dispatch = Dispatcher([git, anything])
+
+        self.assertIs(dispatch('git+https://github.com/foo/bar.git@master#egg=bar'), git)
+        self.assertIs(dispatch('git+https://example.com/foo/bar.git@master#egg=bar'), anything)
+        self.assertIs(dispatch('foo==1.0'), anything)
+
+        # Sources are never asked about strings without their prefixes
+        self.assertNotIn('foo==1.0', git.checked)
+
+    def test_memoised(self):
+        source = CountingSource('foo')
+        dispatch = Dispatcher([source])
+
+        for _ in range(3):
+            self.assertIs(dispatch('foo==1.0'), source)
+            self.assertIsNone(dispatch('bar==1.0'))
+
+        self.assertEqual(source.checked, ['foo==1.0', 'bar==1.0'])
+
+
+if __name__ == '__main__':
+    unittest.main()
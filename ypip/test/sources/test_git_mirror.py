@@ -0,0 +1,117 @@
+import os.path
+import subprocess
+import unittest
+from tempfile import TemporaryDirectory
+
+from ypip.sources.cache import CacheMiss
+from ypip.sources.git_mirror import GitError, GitMirror, ls_remote, setup_requires
+
+
+def _git(repo:str, *args:str) -> str:
+    command = ['git', '-C', repo, '-c', 'user.name=ypip', '-c', 'user.email=ypip@example.com'] + list(args)
+    return subprocess.check_output(command, stderr=subprocess.DEVNULL).decode().strip()
+
+
+class TestSetupRequires(unittest.TestCase):
+    def test_literal(self):
+        self.assertEqual(setup_requires('from setuptools import setup\nsetup(name="x", install_requires=["foo>=1", "bar"])'), ['foo>=1', 'bar'])
+
+    def test_name(self):
+        self.assertEqual(setup_requires('import setuptools\nREQS = ("foo",)\nsetuptools.setup(install_requires=REQS)'), ['foo'])
+
+    def test_dynamic(self):
+        self.assertEqual(setup_requires('setup(install_requires=open("r").read().split())'), [])
+        self.assertEqual(setup_requires('setup(name="x")'), [])
+        self.assertEqual(setup_requires('this is not python'), [])
+
+
+class TestGitMirror(unittest.TestCase):
+    def setUp(self):
+        self._tmp = TemporaryDirectory()
+        self.repo = os.path.join(self._tmp.name, 'upstream')
+        self.url = 'file://{}'.format(self.repo)
+
+        subprocess.check_call(['git', 'init', '--quiet', self.repo])
+        _git(self.repo, 'config', 'uploadpack.allowFilter', 'true')
+        _git(self.repo, 'config', 'uploadpack.allowAnySHA1InWant', 'true')
+
+        self.first = self._commit({'requirements.txt': 'foo==1.0\n', 'setup.py': 'setup(install_requires=["foo==1.0", "bar"])\n'})
+        _git(self.repo, 'tag', 'v1')
+        _git(self.repo, 'rm', '--quiet', 'setup.py')
+        self.second = self._commit({'requirements.txt': 'foo==2.0\n'})
+
+        self.root = os.path.join(self._tmp.name, 'mirrors')
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _commit(self, files:dict) -> str:
+        for name, content in files.items():
+            with open(os.path.join(self.repo, name), 'w') as handle:
+                handle.write(content)
+
+        _git(self.repo, 'add', '--all')
+        _git(self.repo, 'commit', '--quiet', '-m', 'Commit')
+        return _git(self.repo, 'rev-parse', 'HEAD')
+
+    def _pkg(self, ref:str) -> str:
+        return 'git+{}@{}#egg=baz'.format(self.url, ref)
+
+    def test_ls_remote(self):
+        _git(self.repo, 'tag', '-a', '-m', 'Annotated', 'v1a', self.first)
+        branch = _git(self.repo, 'rev-parse', '--abbrev-ref', 'HEAD')
+
+        self.assertEqual(ls_remote(self.url, branch), self.second)
+        self.assertEqual(ls_remote(self.url, 'v1'), self.first)
+        self.assertEqual(ls_remote(self.url, 'v1a'), self.first)
+        self.assertEqual(ls_remote(self.url, self.first.upper()), self.first)
+        self.assertIsNone(ls_remote(self.url, 'nope'))
+        self.assertIsNone(ls_remote(self.url, self.first[:7]))
+
+        with self.assertRaises(GitError):
+            ls_remote('file:///no/such/repository', 'master')
+
+    def test_identify(self):
+        source = GitMirror(self.root)
+        self.assertTrue(source.is_package_from_source(self._pkg('v1')))
+        self.assertTrue(source.is_package_from_source('-e ' + self._pkg('v1')))
+        self.assertFalse(source.is_package_from_source('baz==1.0'))
+        self.assertEqual(source.identify(self._pkg('v1')), 'baz:git {}'.format(self.url))
+        self.assertEqual(source.identify('git+ssh://git@example.com/baz.git@feature/x#egg=baz'), 'baz:git ssh://git@example.com/baz.git')
+
+        self.assertFalse(source.version_conflict(self._pkg('v1'), self._pkg('v1')))
+        self.assertTrue(source.version_conflict(self._pkg('v1'), self._pkg('master')))
+
+    def test_requirements(self):
+        source = GitMirror(self.root)
+
+        self.assertEqual(source.get_requirements(self._pkg('v1')), [self._pkg('v1'), 'foo==1.0', 'bar'])
+        self.assertEqual(source.get_requirements(self._pkg(self.second)), [self._pkg(self.second), 'foo==2.0'])
+        self.assertEqual(source.lock_metadata(self._pkg('v1')), {'url': self.url, 'ref': 'v1', 'commit': self.first})
+
+        # Both refs are fetched into the one mirror
+        self.assertEqual(len(os.listdir(self.root)), 1)
+
+    def test_offline(self):
+        GitMirror(self.root).get_requirements(self._pkg('v1'))
+
+        offline = GitMirror(self.root, offline=True)
+        self.assertEqual(offline.get_requirements(self._pkg('v1')), [self._pkg('v1'), 'foo==1.0', 'bar'])
+        self.assertEqual(offline.get_requirements(self._pkg(self.first))[1:], ['foo==1.0', 'bar'])
+
+        with self.assertRaises(CacheMiss):
+            _ = offline.get_requirements(self._pkg(self.second))
+
+    def test_grammar(self):
+        commit = self._commit({'requirements.txt': 'foo==1.0  # compat\nbar --hash=sha256:abc\n-r base.txt\nbaz \\\n  ; python_version >= "3"\n'})
+
+        with self.assertWarns(Warning):
+            self.assertEqual(GitMirror(self.root).get_requirements(self._pkg(commit))[1:], ['foo==1.0', 'bar', 'baz ; python_version >= "3"'])
+
+    def test_missing_ref(self):
+        with self.assertRaises(GitError):
+            _ = GitMirror(self.root).get_requirements(self._pkg('no-such-branch'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import gzip
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from tempfile import TemporaryDirectory
+
+from ypip.sources.cache import RequirementsCache
+from ypip.sources.git_github import GitOnGitHub
+from ypip.sources.http import HTTPClient, HTTPError
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status:int, body:bytes = b'', headers:dict = None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, self.client_address[1]))
+
+        if self.path == '/flaky':
+            server.failures -= 1
+            if server.failures >= 0:
+                return self._send(503)
+            return self._send(200, b'recovered')
+
+        if self.path == '/gzip':
+            return self._send(200, gzip.compress(b'deflated'), {'Content-Encoding': 'gzip'})
+
+        if self.path == '/moved':
+            return self._send(302, headers={'Location': '/plain'})
+
+        if self.path == '/foo/bar/master/requirements.txt':
+            if self.headers.get('If-None-Match') == '"v1"':
+                return self._send(304, headers={'ETag': '"v1"'})
+            return self._send(200, b'quux==1.0\n', {'ETag': '"v1"'})
+
+        if self.path == '/plain':
+            return self._send(200, b'plain')
+
+        self._send(404)
+
+
+class TestHTTPClient(unittest.TestCase):
+    def setUp(self):
+        self.server = _Server(('127.0.0.1', 0), _Handler)
+        self.server.requests = []
+        self.server.failures = 0
+        self.base = 'http://127.0.0.1:{}'.format(self.server.server_address[1])
+
+        self._thread = threading.Thread(target=self.server.serve_forever, kwargs={'poll_interval': 0.05})
+        self._thread.daemon = True
+        self._thread.start()
+
+        self.client = HTTPClient(backoff=0)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_keep_alive(self):
+        for _ in range(3):
+            self.assertEqual(self.client.get(self.base + '/plain').body, b'plain')
+
+        ports = {port for _, port in self.server.requests}
+        self.assertEqual(len(ports), 1)
+
+    def test_gzip(self):
+        self.assertEqual(self.client.get(self.base + '/gzip').body, b'deflated')
+
+    def test_redirect(self):
+        response = self.client.get(self.base + '/moved')
+        self.assertEqual(response.url, self.base + '/plain')
+        self.assertEqual(response.body, b'plain')
+
+    def test_retry(self):
+        self.server.failures = 2
+        self.assertEqual(self.client.get(self.base + '/flaky').body, b'recovered')
+        self.assertEqual(len(self.server.requests), 3)
+
+        self.server.failures = 5
+        with self.assertRaises(HTTPError) as context:
+            _ = self.client.get(self.base + '/flaky')
+        self.assertEqual(context.exception.status, 503)
+
+    def test_not_found(self):
+        with self.assertRaises(HTTPError) as context:
+            _ = self.client.get(self.base + '/missing')
+        self.assertEqual(context.exception.status, 404)
+
+    def test_github_revalidation(self):
+        with TemporaryDirectory() as root:
+            cache = RequirementsCache(root, ttl=0)
+            source = GitOnGitHub(cache=cache, client=self.client, base_url=self.base)
+            pkg = 'git+https://github.com/foo/bar.git@master#egg=bar'
+
+            self.assertEqual(source.get_requirements(pkg), [pkg, 'quux==1.0'])
+            self.assertEqual(source.get_requirements(pkg), [pkg, 'quux==1.0'])
+
+            self.assertEqual(len(self.server.requests), 2)
+            self.assertEqual(cache.get('github', 'foo', 'bar', 'master').etag, '"v1"')
+
+            # What's missing isn't cached, so is fetched again
+            missing = 'git+https://github.com/foo/baz.git@{}#egg=baz'.format('0' * 40)
+            for _ in range(2):
+                with self.assertWarns(Warning):
+                    self.assertEqual(source.get_requirements(missing), [missing])
+
+            self.assertIsNone(cache.get('github', 'foo', 'baz', '0' * 40))
+            self.assertEqual(len(self.server.requests), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import subprocess
+import sys
+import unittest
+
+import ypip.sources as sources
+
+
+class TestLazyExports(unittest.TestCase):
+    def test_exports(self):
+        for name in sources.__all__:
+            self.assertIn(name, dir(sources))
+            self.assertEqual(getattr(sources, name).__name__, name)
+
+        from ypip.sources.http import HTTPClient
+        self.assertIs(sources.HTTPClient, HTTPClient)
+
+        with self.assertRaises(AttributeError):
+            sources.NoSuchSource
+
+    def test_deferred(self):
+        # In a fresh interpreter, as this one has imported everything
+        check = '; '.join([
+            'import sys',
+            'import ypip.sources as sources',
+            'assert "ypip.sources.http" not in sys.modules',
+            'sources.RequirementsTxt',
+            'assert "ypip.sources.http" not in sys.modules',
+            'sources.PyPI',
+            'assert "ypip.sources.http" in sys.modules'
+        ])
+
+        self.assertEqual(subprocess.call([sys.executable, '-c', check]), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+from ypip.sources.pip_fallback import PipFallback
+
+
+class TestPipFallback(unittest.TestCase):
+    def setUp(self):
+        self.source = PipFallback()
+
+    def test_version_conflict(self):
+        self.assertTrue(self.source.version_conflict('foo>=1.0, <2.0', 'foo==2.1'))
+        self.assertTrue(self.source.version_conflict('foo~=1.2', 'foo<1.2'))
+        self.assertFalse(self.source.version_conflict('foo>=1.0', 'foo<1.5'))
+        self.assertFalse(self.source.version_conflict('foo==1.*', 'foo!=1.2'))
+
+    def test_unconstrained(self):
+        self.assertFalse(self.source.version_conflict('foo', 'foo==1.0'))
+        self.assertFalse(self.source.version_conflict('foo', 'foo'))
+
+    def test_foreign(self):
+        self.assertIsNone(self.source.version_conflict('foo==1.0', 'git+https://example.com/foo.git'))
+        self.assertIsNone(self.source.version_conflict('foo==1.0', 'foo==bar'))
+
+    def test_pep508(self):
+        for pkg in ['foo[bar, quux]>=1.0', 'foo>=1, <2; python_version >= "3"', 'Foo_Bar (==1.0)']:
+            self.assertTrue(self.source.is_package_from_source(pkg))
+
+        for pkg in ['foo @ https://example.com/foo.whl', 'git+https://example.com/foo.git', 'foo[']:
+            self.assertFalse(self.source.is_package_from_source(pkg))
+
+        self.assertEqual(self.source.identify('Foo_Bar[baz]>=1'), 'foo-bar')
+        self.assertTrue(self.source.version_conflict('foo[bar]>=2', 'foo<2; os_name == "nt"'))
+
+    def test_extras(self):
+        self.assertEqual(self.source.candidates(['foo[bar]>=1', 'foo[baz]<2', 'foo']), ['foo[bar,baz]>=1, <2'])
+        self.assertEqual(self.source.candidates(['foo', 'foo']), ['foo'])
+
+        self.assertTrue(self.source.is_satisfied_by('foo[bar]>=1', 'foo[bar,baz]>=1, <2'))
+        self.assertFalse(self.source.is_satisfied_by('foo[quux]', 'foo[bar,baz]>=1, <2'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import json
+import threading
+import unittest
+from typing import Dict, List
+
+from ypip.resolver.crawler import Crawler
+from ypip.resolver.resolver import Resolver
+from ypip.sources.http import HTTPClient
+from ypip.sources.pep440.version import Version
+from ypip.sources.pypi import PyPI, normalise
+from ypip.test.sources.test_http import _Handler, _Server
+
+
+class _IndexHandler(_Handler):
+    def do_GET(self):
+        self.server.requests.append(self.path)
+
+        body = self.server.index.get(self.path)
+        if body is None:
+            return self._send(404)
+
+        self._send(200, json.dumps(body).encode(), {'Content-Type': 'application/json'})
+
+
+def _index(universe:Dict[str, Dict[str, List[str]]]) -> Dict[str, Dict]:
+    ''' JSON API responses for universe[name][version] = requires_dist '''
+    index = {}
+
+    for name, releases in universe.items():
+        index['/pypi/{}/json'.format(name)] = {
+            'info': {'name': name},
+            'releases': {
+                version: [{'filename': '{}-{}.tar.gz'.format(name, version), 'digests': {'sha256': name + version}}]
+                for version in releases
+            }
+        }
+
+        for version, requires in releases.items():
+            index['/pypi/{}/{}/json'.format(name, version)] = {'info': {'name': name, 'requires_dist': requires}}
+
+    return index
+
+
+class TestPyPI(unittest.TestCase):
+    universe = {
+        'foo': {
+            '1.0': [],
+            '2.0': ['Bar_Baz (>=1.0)', 'quux; python_version < "3"', 'xyzzy[extra] >=1 ; extra == "test"', 'Plugh ; python_version >= "3"'],
+            '3.0a1': []
+        },
+        'bar-baz': {'0.9': [], '1.0': [], '1.1': ['foo>=2']},
+        'pre': {'1.0a1': [], '1.0b1': []},
+        'plugh': {'1.0': []},
+        'xyzzy': {'1.0': ['plugh ; extra == "extra"'], '2.0': []}
+    }
+
+    def setUp(self):
+        self.server = _Server(('127.0.0.1', 0), _IndexHandler)
+        self.server.requests = []
+        self.server.index = _index(self.universe)
+
+        self._thread = threading.Thread(target=self.server.serve_forever, kwargs={'poll_interval': 0.05})
+        self._thread.daemon = True
+        self._thread.start()
+
+        self.client = HTTPClient(backoff=0)
+        self.source = PyPI('http://127.0.0.1:{}/pypi/'.format(self.server.server_address[1]), client=self.client)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_normalise(self):
+        self.assertEqual(normalise('Bar_Baz'), 'bar-baz')
+        self.assertEqual(normalise('foo.-_bar'), 'foo-bar')
+        self.assertEqual(self.source.identify('Bar.Baz>=1'), 'bar-baz')
+
+    def test_candidates(self):
+        self.assertEqual(self.source.candidates(['foo']), ['foo==2.0', 'foo==1.0'])
+        self.assertEqual(self.source.candidates(['foo>=1.5', 'foo<3']), ['foo==2.0'])
+        self.assertEqual(self.source.candidates(['foo>=3.0a1']), ['foo==3.0a1'])
+        self.assertEqual(self.source.candidates(['pre']), ['pre==1.0b1', 'pre==1.0a1'])
+        self.assertEqual(self.source.candidates(['missing']), [])
+
+        self.assertTrue(self.source.is_satisfied_by('foo>=1.5', 'foo==2.0'))
+        self.assertFalse(self.source.is_satisfied_by('foo>=1.5', 'foo==1.0'))
+
+        # Candidates bring along every extra that is required of them
+        self.assertTrue(self.source.is_package_from_source('foo[bar]>=1'))
+        self.assertEqual(self.source.identify('Foo[bar]>=1'), 'foo')
+        self.assertEqual(self.source.candidates(['foo[test]', 'foo[bar]<2']), ['foo[bar,test]==1.0'])
+        self.assertTrue(self.source.is_satisfied_by('foo[test]>=1.5', 'foo[bar,test]==2.0'))
+        self.assertFalse(self.source.is_satisfied_by('foo[test]>=1.5', 'foo==2.0'))
+
+    def test_requirements(self):
+        # Requirements are only those whose markers hold, without extras
+        self.assertEqual(self.source.get_requirements('foo==2.0'), ['foo==2.0', 'bar-baz>=1.0', 'plugh'])
+        self.assertEqual(self.source.get_requirements('foo<2'), ['foo<2'])
+        self.assertEqual(self.source.requires('foo', Version('2.0')), ['bar-baz>=1.0', 'plugh'])
+
+        # Requested extras are evaluated by markers, and kept downstream
+        self.assertEqual(self.source.get_requirements('foo[test]==2.0'), ['foo[test]==2.0', 'bar-baz>=1.0', 'xyzzy[extra]>=1', 'plugh'])
+
+        self.assertEqual(self.source.lock_metadata('foo==2.0'), {'version': '2.0', 'hashes': ['sha256:foo2.0']})
+
+    def test_prefetch(self):
+        self.source.prefetch(['foo', 'Bar_Baz>1', 'pre', 'foo==1.0'])
+        self.assertEqual(sorted(self.server.requests), ['/pypi/bar-baz/json', '/pypi/foo/json', '/pypi/pre/json'])
+
+        _ = self.source.candidates(['foo'])
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_resolve(self):
+        graph = Resolver(Crawler([self.source])).resolve('foo')
+
+        self.assertEqual(graph.get_node('foo').payload, 'foo==2.0')
+        self.assertEqual(graph.get_node('bar-baz').payload, 'bar-baz==1.1')
+        self.assertEqual(graph.get_node('foo').links, {'bar-baz', 'plugh'})
+
+        graph = Resolver(Crawler([self.source])).resolve('foo[test]')
+
+        self.assertEqual(graph.get_node('foo').payload, 'foo[test]==2.0')
+        self.assertEqual(graph.get_node('xyzzy').payload, 'xyzzy[extra]==2.0')
+        self.assertEqual(graph.get_node('foo').links, {'bar-baz', 'plugh', 'xyzzy'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import os
+import os.path
+import unittest
+from tempfile import TemporaryDirectory
+
+from ypip.sources.requirements_txt import RequirementsFileError, RequirementsTxt, files, parse, parse_lines, remote_requirements
+
+
+class TestParseLines(unittest.TestCase):
+    def parse(self, text:str):
+        return [(line.kind, line.value, line.marker, line.line) for line in parse_lines(text.splitlines(True))]
+
+    def test_requirements(self):
+        self.assertEqual(self.parse('\n'.join([
+            '# Comment',
+            'foo==1.0  # Trailing comment',
+            '',
+            'bar >= 2, \\',
+            '    < 3',
+            'baz; python_version < "3"',
+            'quux==1.0 --hash=sha256:abcdef'
+        ])), [
+            ('requirement', 'foo==1.0', None, 2),
+            ('requirement', 'bar >= 2,     < 3', None, 4),
+            ('requirement', 'baz', 'python_version < "3"', 6),
+            ('requirement', 'quux==1.0', None, 7)
+        ])
+
+    def test_urls(self):
+        self.assertEqual(self.parse('\n'.join([
+            '-e git+https://github.com/foo/bar.git@master#egg=bar',
+            '--editable=git+https://github.com/foo/baz.git@master#egg=baz',
+            'git+https://example.com/x.git@v1;python_version<"3"#egg=x ; sys_platform == "linux"'
+        ])), [
+            ('requirement', '-e git+https://github.com/foo/bar.git@master#egg=bar', None, 1),
+            ('requirement', '-e git+https://github.com/foo/baz.git@master#egg=baz', None, 2),
+            ('requirement', 'git+https://example.com/x.git@v1;python_version<"3"#egg=x', 'sys_platform == "linux"', 3)
+        ])
+
+    def test_options(self):
+        self.assertEqual(self.parse('\n'.join([
+            '--index-url https://example.com/simple',
+            '-r base.txt',
+            '--constraint=constraints.txt',
+            '--pre'
+        ])), [
+            ('include', 'base.txt', None, 2),
+            ('constraint', 'constraints.txt', None, 3)
+        ])
+
+
+class TestParse(unittest.TestCase):
+    def setUp(self):
+        self._tmp = TemporaryDirectory()
+        self.root = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write(self, name:str, content:str) -> str:
+        path = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(path, 'w') as handle:
+            handle.write(content)
+
+        return path
+
+    def test_includes(self):
+        requirements = self.write('requirements.txt', 'foo\n-r shared/base.txt\n-c constraints.txt\n')
+        self.write('shared/base.txt', 'bar\n-r ../requirements.txt\n-r common.txt\n')
+        self.write('shared/common.txt', 'baz\n')
+        self.write('constraints.txt', 'quux<2\n-r shared/common.txt\n')
+
+        self.assertEqual([(record.requirement, record.constraint) for record in parse(requirements)], [
+            ('foo', False), ('bar', False), ('baz', False), ('quux<2', True), ('baz', True)
+        ])
+
+        self.assertEqual(files(requirements), [
+            requirements,
+            os.path.join(self.root, 'shared', 'base.txt'),
+            os.path.join(self.root, 'constraints.txt'),
+            os.path.join(self.root, 'shared', 'common.txt')
+        ])
+
+        source = RequirementsTxt()
+        self.assertEqual(source.get_requirements(requirements), ['foo', 'bar', 'baz'])
+        self.assertEqual(source.constraints(requirements), ['quux<2', 'baz'])
+
+    def test_markers(self):
+        requirements = self.write('requirements.txt', '\n'.join([
+            'foo ; python_version >= "3"',
+            'bar ; python_version < "3"',
+            '-c constraints.txt',
+            ''
+        ]))
+        self.write('constraints.txt', 'baz<2 ; python_version < "3"\nquux<2 ; os_name == os_name\n')
+
+        # Requirements whose markers don't hold here are pruned
+        source = RequirementsTxt()
+        self.assertEqual(source.get_requirements(requirements), ['foo'])
+        self.assertEqual(source.constraints(requirements), ['quux<2'])
+
+        invalid = self.write('invalid.txt', 'foo\nbar ; not a marker\n')
+        with self.assertRaises(RequirementsFileError):
+            source.get_requirements(invalid)
+
+    def test_missing(self):
+        requirements = self.write('requirements.txt', '-r missing.txt\n')
+
+        with self.assertRaises(RequirementsFileError):
+            _ = list(parse(requirements))
+
+    def test_memoised(self):
+        requirements = self.write('requirements.txt', 'foo\n')
+        self.assertEqual([record.requirement for record in parse(requirements)], ['foo'])
+
+        # Same size and modification time, so the memoised parse is used
+        status = os.stat(requirements)
+        self.write('requirements.txt', 'bar\n')
+        os.utime(requirements, ns=(status.st_atime_ns, status.st_mtime_ns))
+        self.assertEqual([record.requirement for record in parse(requirements)], ['foo'])
+
+        self.write('requirements.txt', 'bar\nbaz\n')
+        self.assertEqual([record.requirement for record in parse(requirements)], ['bar', 'baz'])
+
+    def test_remote(self):
+        content = 'six==1.16.0  # compat\nfoo==1.0 --hash=sha256:abc\n--extra-index-url https://example.com\n-r base.txt\n' \
+                  'bar \\\n  ; python_version >= "3"\n-e git+https://example.com/x.git@v1#egg=x\n'
+
+        # Same grammar as local files, but includes aren't followed
+        with self.assertWarns(Warning):
+            self.assertEqual(remote_requirements(content, 'example'),
+                             ['six==1.16.0', 'foo==1.0', 'bar ; python_version >= "3"', '-e git+https://example.com/x.git@v1#egg=x'])
+
+
+if __name__ == '__main__':
+    unittest.main()
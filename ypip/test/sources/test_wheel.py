@@ -0,0 +1,136 @@
+import io
+import os
+import re
+import threading
+import unittest
+import zipfile
+
+from ypip.sources.http import HTTPClient
+from ypip.sources.pep440.version import Version
+from ypip.sources.pypi import PyPI
+from ypip.sources.wheel import requires_dist, wheel_metadata
+from ypip.test.sources.test_http import _Handler, _Server
+from ypip.test.sources.test_pypi import _IndexHandler, _index
+
+_METADATA = b'\n'.join([
+    b'Metadata-Version: 2.1',
+    b'Name: foo',
+    b'Version: 1.0',
+    b'Requires-Dist: bar (>=1.0)',
+    b'Requires-Dist: baz ; extra == "test"',
+    b'',
+    b'A long description'
+])
+
+
+def _wheel(padding:int) -> bytes:
+    buffer = io.BytesIO()
+
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as wheel:
+        wheel.writestr('foo-1.0.dist-info/METADATA', _METADATA)
+        wheel.writestr('foo-1.0.dist-info/RECORD', b'')
+        wheel.writestr('foo/__init__.py', b'')
+
+        # Incompressible, so the wheel is as big as the padding, which
+        # puts the METADATA well away from the central directory
+        wheel.writestr('foo/data.bin', os.urandom(padding), zipfile.ZIP_STORED)
+
+    return buffer.getvalue()
+
+
+class _RangeHandler(_IndexHandler):
+    def do_GET(self):
+        body = self.server.files.get(self.path)
+        if body is None:
+            return super().do_GET()
+
+        self.server.requests.append(self.path)
+        match = re.match(r'^bytes=(\d*)-(\d*)$', self.headers.get('Range', ''))
+
+        if not (self.server.ranges and match):
+            self.server.sent += len(body)
+            return self._send(200, body)
+
+        start, end = match.groups()
+        if not start:
+            start, end = max(0, len(body) - int(end)), len(body) - 1
+
+        start, end = int(start), min(int(end or len(body) - 1), len(body) - 1)
+        self.server.sent += end + 1 - start
+        self._send(206, body[start:end + 1], {'Content-Range': 'bytes {}-{}/{}'.format(start, end, len(body))})
+
+
+class TestWheelMetadata(unittest.TestCase):
+    def setUp(self):
+        self.wheel = _wheel(1024 * 1024)
+
+        self.server = _Server(('127.0.0.1', 0), _RangeHandler)
+        self.server.requests = []
+        self.server.files = {'/foo-1.0-py3-none-any.whl': self.wheel}
+        self.server.ranges = True
+        self.server.sent = 0
+        self.base = 'http://127.0.0.1:{}'.format(self.server.server_address[1])
+
+        self._thread = threading.Thread(target=self.server.serve_forever, kwargs={'poll_interval': 0.05})
+        self._thread.daemon = True
+        self._thread.start()
+
+        self.client = HTTPClient(backoff=0)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_requires_dist(self):
+        self.assertEqual(requires_dist(_METADATA), ['bar (>=1.0)', 'baz ; extra == "test"'])
+        self.assertEqual(requires_dist(b'Name: foo\n'), [])
+
+    def test_ranges(self):
+        metadata = wheel_metadata(self.base + '/foo-1.0-py3-none-any.whl', self.client)
+
+        self.assertEqual(metadata, _METADATA)
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertLess(self.server.sent, len(self.wheel) // 10)
+
+    def test_fallback(self):
+        self.server.ranges = False
+        metadata = wheel_metadata(self.base + '/foo-1.0-py3-none-any.whl', self.client)
+
+        self.assertEqual(metadata, _METADATA)
+        self.assertEqual(self.server.requests, ['/foo-1.0-py3-none-any.whl'])
+
+    def test_pypi(self):
+        self.server.index = _index({'foo': {'1.0': None}})
+        self.server.index['/pypi/foo/json']['releases']['1.0'].append({
+            'filename': 'foo-1.0-py3-none-any.whl',
+            'url': self.base + '/foo-1.0-py3-none-any.whl',
+            'digests': {}
+        })
+
+        source = PyPI(self.base + '/pypi', client=self.client)
+        self.assertEqual(source.requires('foo', Version('1.0')), ['bar>=1.0'])
+
+    def test_pypi_unreadable(self):
+        self.server.index = _index({'foo': {'1.0': None, '2.0': None}})
+        for version in ['1.0', '2.0']:
+            self.server.index['/pypi/foo/json']['releases'][version].append({
+                'filename': 'foo-{}-py3-none-any.whl'.format(version),
+                'url': '{}/foo-{}-py3-none-any.whl'.format(self.base, version),
+                'digests': {}
+            })
+
+        # Wheels that aren't, or that are missing, leave requirements to pip
+        self.server.files = {'/foo-1.0-py3-none-any.whl': b'not a wheel'}
+        self.server.ranges = False
+        source = PyPI(self.base + '/pypi', client=self.client)
+
+        with self.assertWarns(Warning):
+            self.assertEqual(source.requires('foo', Version('1.0')), [])
+
+        with self.assertWarns(Warning):
+            self.assertEqual(source.requires('foo', Version('2.0')), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
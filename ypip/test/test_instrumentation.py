@@ -0,0 +1,85 @@
+import json
+import os
+import unittest
+from io import StringIO
+from tempfile import TemporaryDirectory
+
+from ypip import instrumentation
+
+
+class TestInstrumentation(unittest.TestCase):
+    def tearDown(self):
+        instrumentation.disable()
+
+    def test_disabled(self):
+        instrumentation.enable()
+        instrumentation.disable()
+
+        with instrumentation.span('foo'):
+            pass
+        instrumentation.count('bar')
+
+        self.assertFalse(instrumentation.is_enabled())
+        self.assertEqual(instrumentation.summary(), {'spans': {}, 'counters': {}})
+
+    def test_summary(self):
+        instrumentation.enable()
+
+        for _ in range(3):
+            with instrumentation.span('foo', n=1):
+                pass
+        with instrumentation.span('bar'):
+            pass
+
+        instrumentation.count('baz')
+        instrumentation.count('baz', 10)
+
+        summary = instrumentation.summary()
+        self.assertEqual(summary['spans']['foo']['count'], 3)
+        self.assertEqual(summary['spans']['bar']['count'], 1)
+        self.assertLessEqual(summary['spans']['foo']['max_seconds'], summary['spans']['foo']['seconds'])
+        self.assertEqual(summary['counters'], {'baz': 11})
+
+        # Enabling again starts afresh
+        instrumentation.enable()
+        self.assertEqual(instrumentation.summary(), {'spans': {}, 'counters': {}})
+
+    def test_exception(self):
+        instrumentation.enable()
+
+        with self.assertRaises(ValueError):
+            with instrumentation.span('foo'):
+                raise ValueError()
+
+        self.assertEqual(instrumentation.summary()['spans']['foo']['count'], 1)
+
+    def test_output(self):
+        instrumentation.enable()
+
+        with instrumentation.span('http.request', url='http://example.com'):
+            pass
+        instrumentation.count('http.bytes', 123)
+
+        stream = StringIO()
+        instrumentation.report(stream)
+        self.assertIn('http.request', stream.getvalue())
+        self.assertIn('http.bytes', stream.getvalue())
+
+        with TemporaryDirectory() as directory:
+            instrumentation.write_json(os.path.join(directory, 'profile.json'))
+            instrumentation.write_trace(os.path.join(directory, 'trace.json'))
+
+            with open(os.path.join(directory, 'profile.json')) as handle:
+                self.assertEqual(json.load(handle)['counters'], {'http.bytes': 123})
+
+            with open(os.path.join(directory, 'trace.json')) as handle:
+                events = json.load(handle)['traceEvents']
+
+        self.assertEqual([event['ph'] for event in events], ['X', 'C'])
+        self.assertEqual(events[0]['cat'], 'http')
+        self.assertEqual(events[0]['args'], {'url': 'http://example.com'})
+        self.assertEqual(events[1]['args'], {'value': 123})
+
+
+if __name__ == '__main__':
+    unittest.main()